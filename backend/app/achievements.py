@@ -0,0 +1,216 @@
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .database import AsyncSessionLocal
+from .events import LESSON_COMPLETED, REVIEWS_RECORDED, event_hub
+
+logger = logging.getLogger(__name__)
+
+# Achievements are awarded from committed events rather than by scanning
+# history. Each rule names the event types that can change its outcome, and
+# the engine keeps an index from event type to rules, so a batch of events
+# only evaluates the rules it can affect, only for the users in the batch.
+# The statistics a rule compares against its threshold are loaded with one
+# grouped query per source for all of those users, and new badges are written
+# with a single INSERT per evaluation.
+
+MAX_EVALUATION_ATTEMPTS = 3
+
+@dataclass(frozen=True)
+class AchievementRule:
+    name: str
+    description: str
+    events: Tuple[str, ...]
+    stat: str
+    threshold: int
+    badge_image_url: Optional[str] = None
+
+RULES = [
+    AchievementRule("First Steps", "Complete your first lesson", (LESSON_COMPLETED,), "lessons_completed", 1),
+    AchievementRule("Dedicated Learner", "Complete 10 lessons", (LESSON_COMPLETED,), "lessons_completed", 10),
+    AchievementRule("Perfectionist", "Score 100 on a lesson", (LESSON_COMPLETED,), "best_score", 100),
+    AchievementRule("On Fire", "Learn 3 days in a row", (LESSON_COMPLETED,), "streak_days", 3),
+    AchievementRule("Unstoppable", "Learn 7 days in a row", (LESSON_COMPLETED,), "streak_days", 7),
+    AchievementRule("Point Collector", "Earn 1000 points", (LESSON_COMPLETED,), "points", 1000),
+    AchievementRule("First Review", "Review your first word", (REVIEWS_RECORDED,), "reviews", 1),
+    AchievementRule("Word Master", "Master 10 words", (REVIEWS_RECORDED,), "mastered_words", 10),
+]
+
+Stats = Dict[str, Dict[int, int]]  # stat -> user_id -> value
+StatLoader = Callable[[AsyncSession, Set[int], Dict[str, list]], Awaitable[Stats]]
+
+async def load_batch_stats(db: AsyncSession, user_ids: Set[int], events: Dict[str, list]) -> Stats:
+    """Statistics that only depend on the events themselves"""
+    best_score: Dict[int, int] = defaultdict(int)
+    for event in events.get(LESSON_COMPLETED, ()):
+        best_score[event.user_id] = max(best_score[event.user_id], event.score or 0)
+    reviews: Dict[int, int] = defaultdict(int)
+    for event in events.get(REVIEWS_RECORDED, ()):
+        reviews[event.user_id] += 1
+    return {"best_score": best_score, "reviews": reviews}
+
+async def load_profile_stats(db: AsyncSession, user_ids: Set[int], events: Dict[str, list]) -> Stats:
+    profiles = models.UserProfile
+    result = await db.execute(
+        select(profiles.user_id, profiles.points, profiles.streak_days).where(profiles.user_id.in_(user_ids))
+    )
+    stats: Stats = {"points": {}, "streak_days": {}}
+    for user_id, points, streak_days in result:
+        stats["points"][user_id] = points or 0
+        stats["streak_days"][user_id] = streak_days or 0
+    return stats
+
+async def load_lesson_stats(db: AsyncSession, user_ids: Set[int], events: Dict[str, list]) -> Stats:
+    progress = models.Progress
+    result = await db.execute(
+        select(progress.user_id, func.count(func.distinct(progress.lesson_id)))
+        .where(progress.user_id.in_(user_ids), progress.completed.is_(True))
+        .group_by(progress.user_id)
+    )
+    return {"lessons_completed": dict(result.all())}
+
+async def load_vocabulary_stats(db: AsyncSession, user_ids: Set[int], events: Dict[str, list]) -> Stats:
+    items = models.VocabularyItem
+    result = await db.execute(
+        select(items.user_id, func.count())
+        .where(items.user_id.in_(user_ids), items.mastery_level >= 5)
+        .group_by(items.user_id)
+    )
+    return {"mastered_words": dict(result.all())}
+
+STAT_LOADERS: Dict[str, StatLoader] = {
+    "best_score": load_batch_stats,
+    "reviews": load_batch_stats,
+    "points": load_profile_stats,
+    "streak_days": load_profile_stats,
+    "lessons_completed": load_lesson_stats,
+    "mastered_words": load_vocabulary_stats,
+}
+
+def insert_ignoring_duplicates(db: AsyncSession):
+    """INSERT into achievements that skips badges another worker awarded first"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(models.Achievement).on_conflict_do_nothing(index_elements=["user_id", "name"])
+    if dialect == "sqlite":
+        return sqlite.insert(models.Achievement).on_conflict_do_nothing(index_elements=["user_id", "name"])
+    return insert(models.Achievement)
+
+class AchievementEngine:
+    """Collects published events and evaluates the affected rules in batches"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], rules: Sequence[AchievementRule]):
+        self._session_factory = session_factory
+        self.rules = list(rules)
+        self._rules_by_event: Dict[str, List[AchievementRule]] = defaultdict(list)
+        for rule in self.rules:
+            if rule.stat not in STAT_LOADERS:
+                raise ValueError(f"Achievement '{rule.name}' uses unknown stat '{rule.stat}'")
+            for event_type in rule.events:
+                self._rules_by_event[event_type].append(rule)
+        self._pending: List[Tuple[str, Sequence]] = []
+        self._failures = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, hub):
+        for event_type in self._rules_by_event:
+            hub.subscribe(event_type, self.handle)
+
+    def handle(self, event_type: str, events: Sequence):
+        self._pending.append((event_type, events))
+
+    async def evaluate(self) -> int:
+        """Evaluate everything received since the last call; returns the number of badges awarded"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                awarded = await self._evaluate(batch)
+            except Exception:
+                self._failures += 1
+                if self._failures >= MAX_EVALUATION_ATTEMPTS:
+                    logger.exception("Dropping %d achievement event batches after %d failures", len(batch), self._failures)
+                    self._failures = 0
+                else:
+                    logger.exception("Achievement evaluation failed, retrying later")
+                    self._pending[:0] = batch
+                return 0
+            self._failures = 0
+            return awarded
+
+    async def _evaluate(self, batch: List[Tuple[str, Sequence]]) -> int:
+        events: Dict[str, list] = defaultdict(list)
+        candidates: Dict[AchievementRule, Set[int]] = defaultdict(set)
+        for event_type, batch_events in batch:
+            events[event_type].extend(batch_events)
+            user_ids = {event.user_id for event in batch_events}
+            for rule in self._rules_by_event.get(event_type, ()):
+                candidates[rule] |= user_ids
+
+        async with self._session_factory() as db:
+            user_ids = set().union(*candidates.values())
+            earned = set((await db.execute(
+                select(models.Achievement.user_id, models.Achievement.name).where(
+                    models.Achievement.user_id.in_(user_ids),
+                    models.Achievement.name.in_({rule.name for rule in candidates})
+                )
+            )).all())
+            for rule, users in candidates.items():
+                users.difference_update(user for user in list(users) if (user, rule.name) in earned)
+
+            stats: Stats = {}
+            for loader in {STAT_LOADERS[rule.stat] for rule, users in candidates.items() if users}:
+                stats.update(await loader(db, user_ids, events))
+
+            now = datetime.utcnow()
+            awards = [
+                {
+                    "user_id": user_id,
+                    "name": rule.name,
+                    "description": rule.description,
+                    "badge_image_url": rule.badge_image_url,
+                    "earned_at": now
+                }
+                for rule, users in candidates.items()
+                for user_id in sorted(users)
+                if stats[rule.stat].get(user_id, 0) >= rule.threshold
+            ]
+            if awards:
+                await db.execute(insert_ignoring_duplicates(db), awards)
+                await db.commit()
+        logger.debug("Evaluated %d event batches, awarded %d achievements", len(batch), len(awards))
+        return len(awards)
+
+    async def start(self, interval: float):
+        self._lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop the background task and evaluate whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.evaluate()
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.evaluate()
+
+achievement_engine = AchievementEngine(AsyncSessionLocal, RULES)
+achievement_engine.subscribe(event_hub)
@@ -0,0 +1,451 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tarfile
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from . import models
+from .config import settings
+from .content import content
+from .lesson_content import normalize_lesson_content
+
+try:
+    import zstandard
+except ImportError:  # optional; bundles are gzip-compressed without it
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Offline bundles: everything a client needs to study a language without a
+# connection (lessons, phrases, alphabet and mnemonics) as one compressed tar
+# archive per language, named after a hash of its content. Archives live in a
+# disk cache shared by all workers and are reused for as long as the catalog
+# fingerprint (row counts, last id and last update of lessons and phrases) is
+# unchanged. Archives are written deterministically, so rebuilding unchanged
+# content reproduces the same version.
+#
+# Lessons and phrases are stored as NDJSON sorted by id, which makes a delta
+# between two cached versions a merge of the two archives: changed and added
+# records, plus {"id": ..., "deleted": true} for removed ones. Alphabet and
+# mnemonics are small JSON documents and are sent whole when they change.
+
+BUNDLE_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+STATE_FILE = "latest.json"
+KEYED_SECTIONS = ("lessons", "phrases")
+DOCUMENT_SECTIONS = ("alphabet", "mnemonics")
+# compression -> (archive extension, media type)
+COMPRESSIONS = {"gzip": (".tar.gz", "application/gzip"), "zstd": (".tar.zst", "application/zstd")}
+DEFAULT_BUNDLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bundles")
+VERSION_LENGTH = 16
+VERSION_PATTERN = re.compile("[0-9a-f]{%d}" % VERSION_LENGTH)
+
+LESSON_COLUMNS = ("id", "title", "description", "level", "category", "lesson_type")
+PHRASE_COLUMNS = ("id", "lesson_id", "text", "transliteration", "translation", "level", "category", "audio_url", "extra_data")
+
+class BundleNotFound(LookupError):
+    """The requested bundle version is not (or no longer) in the cache"""
+
+@dataclass(frozen=True)
+class Bundle:
+    path: str
+    manifest: dict
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def media_type(self) -> str:
+        return COMPRESSIONS[self.manifest["archive"]["compression"]][1]
+
+def canonical_json(value) -> bytes:
+    """Deterministic serialization, so equal records always hash and compare equal"""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def ndjson_line(record: dict) -> bytes:
+    return canonical_json(record) + b"\n"
+
+def language_record(language: models.Language) -> dict:
+    return {
+        "code": language.code, "name": language.name, "native_name": language.native_name,
+        "flag": language.flag, "rtl": language.rtl
+    }
+
+def lesson_lines(db: Session, language_id: int, batch_size: int) -> Iterator[bytes]:
+    lessons = models.Lesson
+    rows = db.execute(
+        select(*(getattr(lessons, column) for column in LESSON_COLUMNS), lessons.compiled_content, lessons.content)
+        .where(lessons.language_id == language_id)
+        .order_by(lessons.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in rows:
+        record = {column: getattr(row, column) for column in LESSON_COLUMNS}
+        compiled = row.compiled_content
+        if compiled is None:
+            compiled = normalize_lesson_content(row.content, row.lesson_type)
+        record["content"] = compiled
+        yield ndjson_line(record)
+
+def phrase_lines(db: Session, language_id: int, batch_size: int) -> Iterator[bytes]:
+    phrases = models.Phrase
+    rows = db.execute(
+        select(*(getattr(phrases, column) for column in PHRASE_COLUMNS))
+        .where(phrases.language_id == language_id)
+        .order_by(phrases.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in rows:
+        yield ndjson_line(row._asdict())
+
+def document_sections(code: str) -> Dict[str, Tuple[int, bytes]]:
+    """section -> (records, body) for the content pack documents"""
+    alphabet = [letter.as_dict() for letter in content.alphabet(code)]
+    mnemonics = {word: entry.as_dict() for word, entry in content.mnemonics(code).items()}
+    return {"alphabet": (len(alphabet), canonical_json(alphabet)), "mnemonics": (len(mnemonics), canonical_json(mnemonics))}
+
+def catalog_fingerprint(db: Session, language: models.Language) -> str:
+    """Cheap summary of everything a bundle is built from; changes whenever the catalog does"""
+    parts = [BUNDLE_FORMAT, language_record(language)]
+    for model in (models.Lesson, models.Phrase):
+        parts.extend(db.execute(
+            select(func.count(model.id), func.max(model.id), func.max(model.updated_at))
+            .where(model.language_id == language.id)
+        ).one())
+    parts.extend(body for _, body in document_sections(language.code).values())
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def write_section(directory: str, filename: str, chunks: Iterable[bytes], records: Optional[int] = None) -> dict:
+    """Write chunks (one per record unless `records` is given) and describe the file"""
+    digest = hashlib.sha256()
+    size = count = 0
+    with open(os.path.join(directory, filename), "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+            count += 1
+    return {"file": filename, "sha256": digest.hexdigest(), "size": size, "records": count if records is None else records}
+
+def delta_lines(old: Iterable[bytes], new: Iterable[bytes]) -> Iterator[bytes]:
+    """Merge two id-sorted NDJSON sections into the lines that turn `old` into `new`"""
+    def keyed(lines):
+        for line in lines:
+            yield json.loads(line)["id"], line
+
+    old_records, new_records = keyed(old), keyed(new)
+    old_id, old_line = next(old_records, (None, None))
+    new_id, new_line = next(new_records, (None, None))
+    while old_line is not None or new_line is not None:
+        if new_line is None or (old_line is not None and old_id < new_id):
+            yield ndjson_line({"id": old_id, "deleted": True})
+            old_id, old_line = next(old_records, (None, None))
+        elif old_line is None or new_id < old_id:
+            yield new_line
+            new_id, new_line = next(new_records, (None, None))
+        else:
+            if old_line != new_line:
+                yield new_line
+            old_id, old_line = next(old_records, (None, None))
+            new_id, new_line = next(new_records, (None, None))
+
+class _HashingWriter:
+    """File wrapper that hashes and counts the compressed bytes as they are written"""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.f.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        self.f.flush()
+
+def _compressor(fileobj, compression: str, level: Optional[int]):
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level or 10).stream_writer(fileobj, closefd=False)
+    # No file name or timestamp in the header, so identical content gives identical archives
+    return gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, compresslevel=level or 9, mtime=0)
+
+def write_archive(path: str, directory: str, filenames: List[str], compression: str, level: Optional[int]) -> dict:
+    """Tar the files in order into a compressed archive at `path` (atomically) and describe it"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".archive-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            writer = _HashingWriter(f)
+            compressed = _compressor(writer, compression, level)
+            with tarfile.open(fileobj=compressed, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                for filename in filenames:
+                    file_path = os.path.join(directory, filename)
+                    info = tarfile.TarInfo(filename)
+                    info.size = os.path.getsize(file_path)
+                    info.mode = 0o644
+                    with open(file_path, "rb") as member:
+                        tar.addfile(info, member)
+            compressed.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return {"file": os.path.basename(path), "compression": compression, "size": writer.size, "sha256": writer.digest.hexdigest()}
+
+def iter_archive(path: str, compression: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """(name, file) for each member in order; each file is only readable until the next is yielded"""
+    with open(path, "rb") as f:
+        if compression == "zstd":
+            stream = zstandard.ZstdDecompressor().stream_reader(f)
+        else:
+            stream = gzip.GzipFile(fileobj=f, mode="rb")
+        with stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+            for member in tar:
+                yield member.name, tar.extractfile(member)
+
+def _write_json(path: str, value: dict):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".json-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(canonical_json(value))
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+class BundleStore:
+    """Builds offline bundles and deltas into a disk cache and serves them from it.
+
+    Each language has a directory holding `<version>.tar.gz` archives, their
+    metadata (`<version>.json`, the manifest plus archive size and hash), the
+    deltas to the current version, and `latest.json` with the current version,
+    the fingerprint it was built from and the versions kept for deltas.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str], compression: str = "gzip", level: Optional[int] = None,
+        keep_versions: int = 5, batch_size: int = 1000
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown bundle compression '{compression}'")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, offline bundles fall back to gzip")
+            compression, level = "gzip", None
+        self.cache_dir = cache_dir or DEFAULT_BUNDLE_DIR
+        self.compression = compression
+        self.level = level
+        self.keep_versions = max(1, keep_versions)
+        self.batch_size = batch_size
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, code: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(code, threading.Lock())
+
+    def _path(self, code: str, filename: str) -> str:
+        return os.path.join(self.cache_dir, code, filename)
+
+    def _load(self, code: str, name: str) -> Optional[Bundle]:
+        manifest = _read_json(self._path(code, name + ".json"))
+        if manifest is None:
+            return None
+        path = self._path(code, manifest["archive"]["file"])
+        return Bundle(path, manifest) if os.path.exists(path) else None
+
+    def get(self, code: str, version: str) -> Optional[Bundle]:
+        """A cached full bundle by version"""
+        if not VERSION_PATTERN.fullmatch(version):
+            return None
+        return self._load(code, version)
+
+    def _language(self, db: Session, code: str) -> models.Language:
+        language = db.execute(select(models.Language).where(models.Language.code == code)).scalar_one_or_none()
+        if language is None:
+            raise KeyError(code)
+        return language
+
+    def _current(self, code: str, fingerprint: str) -> Optional[Bundle]:
+        state = _read_json(self._path(code, STATE_FILE)) or {}
+        if state.get("fingerprint") != fingerprint:
+            return None
+        return self.get(code, state["version"])
+
+    def latest(self, db: Session, code: str) -> Bundle:
+        """The current bundle, built only if the catalog changed since the cached one"""
+        language = self._language(db, code)
+        fingerprint = catalog_fingerprint(db, language)
+        bundle = self._current(code, fingerprint)
+        if bundle is None:
+            with self._lock(code):
+                bundle = self._current(code, fingerprint) or self._build(db, language, fingerprint)
+        return bundle
+
+    def _build(self, db: Session, language: models.Language, fingerprint: str) -> Bundle:
+        code = language.code
+        os.makedirs(self._path(code, ""), exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self._path(code, ""), prefix=".build-") as tmp:
+            sections = {
+                "lessons": write_section(tmp, "lessons.ndjson", lesson_lines(db, language.id, self.batch_size)),
+                "phrases": write_section(tmp, "phrases.ndjson", phrase_lines(db, language.id, self.batch_size)),
+            }
+            for name, (records, body) in document_sections(code).items():
+                sections[name] = write_section(tmp, name + ".json", [body], records)
+            manifest = {"format": BUNDLE_FORMAT, "type": "full", "language": language_record(language), "sections": sections}
+            version = hashlib.sha256(canonical_json(manifest)).hexdigest()[:VERSION_LENGTH]
+            manifest["version"] = version
+
+            bundle = self.get(code, version)
+            if bundle is None:
+                write_section(tmp, MANIFEST_FILE, [canonical_json(manifest)])
+                archive = write_archive(
+                    self._path(code, version + COMPRESSIONS[self.compression][0]), tmp,
+                    [MANIFEST_FILE] + [sections[name]["file"] for name in KEYED_SECTIONS + DOCUMENT_SECTIONS],
+                    self.compression, self.level
+                )
+                manifest["archive"] = archive
+                _write_json(self._path(code, version + ".json"), manifest)
+                bundle = Bundle(self._path(code, archive["file"]), manifest)
+                logger.info("Built %s offline bundle %s (%d bytes)", code, version, archive["size"])
+        self._set_current(code, version, fingerprint)
+        return bundle
+
+    def _set_current(self, code: str, version: str, fingerprint: str):
+        state = _read_json(self._path(code, STATE_FILE)) or {}
+        history = [version] + [kept for kept in state.get("history", []) if kept != version]
+        _write_json(self._path(code, STATE_FILE), {
+            "version": version, "fingerprint": fingerprint, "history": history[:self.keep_versions]
+        })
+        if state.get("version") != version:
+            self._prune(code, history[self.keep_versions:])
+
+    def _prune(self, code: str, dropped: List[str]):
+        """Remove dropped versions and every delta, since deltas always lead to the current version"""
+        for filename in os.listdir(self._path(code, "")):
+            name = filename.split(".", 1)[0]
+            if filename.startswith("delta-") or name in dropped:
+                try:
+                    os.unlink(self._path(code, filename))
+                except FileNotFoundError:
+                    pass
+
+    def invalidate(self, code: Optional[str] = None):
+        """Make the next request re-check the catalog, even if its fingerprint did not change"""
+        codes = [code] if code else (os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else [])
+        for code in codes:
+            # No build lock: this runs on request paths and must not wait for a build
+            state = _read_json(self._path(code, STATE_FILE))
+            if state and state.pop("fingerprint", None):
+                _write_json(self._path(code, STATE_FILE), state)
+
+    def delta(self, db: Session, code: str, from_version: str) -> Optional[Bundle]:
+        """The changes from a cached version to the current one; None if it is current"""
+        current = self.latest(db, code)
+        if from_version == current.version:
+            return None
+        old = self.get(code, from_version)
+        if old is None or old.manifest["format"] != BUNDLE_FORMAT:
+            raise BundleNotFound(from_version)
+        name = "delta-%s-%s" % (from_version, current.version)
+        bundle = self._load(code, name)
+        if bundle is None:
+            with self._lock(code):
+                bundle = self._load(code, name) or self._build_delta(code, name, old, current)
+        return bundle
+
+    def _build_delta(self, code: str, name: str, old: Bundle, new: Bundle) -> Bundle:
+        old_sections, new_sections = old.manifest["sections"], new.manifest["sections"]
+        changed = {
+            section for section in KEYED_SECTIONS + DOCUMENT_SECTIONS
+            if old_sections[section]["sha256"] != new_sections[section]["sha256"]
+        }
+        sections = {}
+        with tempfile.TemporaryDirectory(dir=self._path(code, ""), prefix=".build-") as tmp:
+            # Both archives hold their members in the same order, so they are read side by side
+            old_members = iter_archive(old.path, old.manifest["archive"]["compression"])
+            new_members = iter_archive(new.path, new.manifest["archive"]["compression"])
+            try:
+                for (_, old_file), (filename, new_file) in zip(old_members, new_members):
+                    section = filename.split(".", 1)[0]
+                    if section not in changed:
+                        continue
+                    if section in KEYED_SECTIONS:
+                        sections[section] = write_section(tmp, filename, delta_lines(old_file, new_file))
+                    else:
+                        sections[section] = write_section(tmp, filename, [new_file.read()], new_sections[section]["records"])
+            finally:
+                old_members.close()
+                new_members.close()
+
+            manifest = {
+                "format": BUNDLE_FORMAT, "type": "delta", "language": new.manifest["language"],
+                "from": old.version, "version": new.version, "sections": sections
+            }
+            write_section(tmp, MANIFEST_FILE, [canonical_json(manifest)])
+            archive = write_archive(
+                self._path(code, name + COMPRESSIONS[self.compression][0]), tmp,
+                [MANIFEST_FILE] + [sections[section]["file"] for section in KEYED_SECTIONS + DOCUMENT_SECTIONS if section in sections],
+                self.compression, self.level
+            )
+        manifest["archive"] = archive
+        _write_json(self._path(code, name + ".json"), manifest)
+        logger.info("Built %s offline bundle delta %s -> %s (%d bytes)", code, old.version, new.version, archive["size"])
+        return Bundle(self._path(code, archive["file"]), manifest)
+
+offline_bundles = BundleStore(
+    settings.offline_bundle_dir,
+    compression=settings.offline_bundle_compression,
+    level=settings.offline_bundle_compression_level,
+    keep_versions=settings.offline_bundle_versions,
+    batch_size=settings.catalog_transfer_batch_size
+)
+
+def main():
+    from .database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Build offline bundles into the bundle cache")
+    parser.add_argument("codes", nargs="*", help="language codes (default: every language in the database)")
+    parser.add_argument("--since", metavar="VERSION", help="also build the delta from this cached version")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the catalog looks unchanged")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=settings.log_format)
+    db = SessionLocal()
+    try:
+        codes = args.codes or db.execute(select(models.Language.code).order_by(models.Language.code)).scalars().all()
+        for code in codes:
+            if args.force:
+                offline_bundles.invalidate(code)
+            bundle = offline_bundles.latest(db, code)
+            logger.info("%s: version %s, %s (%d bytes)", code, bundle.version, bundle.path, bundle.manifest["archive"]["size"])
+            if args.since:
+                delta = offline_bundles.delta(db, code, args.since)
+                if delta is None:
+                    logger.info("%s: %s is the current version", code, args.since)
+                else:
+                    logger.info("%s: delta from %s, %s (%d bytes)", code, args.since, delta.path, delta.manifest["archive"]["size"])
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
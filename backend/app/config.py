@@ -0,0 +1,124 @@
+from functools import lru_cache
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+load_dotenv()
+
+
+class Settings(BaseSettings):
+    """Application settings, read from the environment and the backend `.env` file."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    database_url: str = "sqlite:///./language_learning.db"
+    # Apply pending Alembic migrations at startup; when disabled, run
+    # `alembic upgrade head` before starting. Migrations are the only schema path.
+    auto_create_schema: bool = True
+    seed_on_startup: bool = True
+
+    # Connection pool (PostgreSQL and other server databases)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_echo: bool = False
+
+    # SQLite connection pragmas
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kb: Optional[int] = 16384
+
+    # Directory holding one content pack per language (default: app/data/packs)
+    content_packs_dir: Optional[str] = None
+    # Rows per INSERT when streaming a content pack's phrases and vocabulary
+    content_pack_batch_size: int = 1000
+
+    # NDJSON lesson export/import: rows per fetch and per upsert batch, and the
+    # longest line an import accepts
+    catalog_transfer_batch_size: int = 1000
+    catalog_import_max_line_bytes: int = 4 * 1024 * 1024
+
+    # Offline bundles: cache directory (default: backend/bundles), archive
+    # compression ("gzip", or "zstd" with the zstandard package installed) and
+    # level, and how many versions per language are kept to serve deltas from
+    offline_bundle_dir: Optional[str] = None
+    offline_bundle_compression: str = "gzip"
+    offline_bundle_compression_level: Optional[int] = None
+    offline_bundle_versions: int = 5
+
+    # In-process lesson catalog cache, one entry per language and page/filter combination
+    lesson_cache_max_pages: int = 1024
+    lesson_cache_ttl_seconds: float = 300.0
+    # Cache-Control sent with lesson responses; clients revalidate with If-None-Match
+    lesson_cache_control: str = "public, no-cache"
+    # Lesson list pagination: default and largest page size
+    lesson_page_size: int = 100
+    lesson_page_size_max: int = 500
+
+    # Lesson start/complete events are buffered in memory and written in batches
+    # every interval, or as soon as this many are pending
+    progress_flush_interval_seconds: float = 2.0
+    progress_flush_batch_size: int = 500
+    # Leaderboards are rebuilt from the database this often (0 = only at startup)
+    leaderboard_refresh_seconds: float = 300.0
+    # The in-memory search index is rebuilt from the database this often (0 = only at startup)
+    search_refresh_seconds: float = 300.0
+    # Achievement rules are evaluated against the events collected in this interval
+    achievement_interval_seconds: float = 5.0
+
+    # Password hashing: bcrypt cost factor, hashing processes (default: up to 4,
+    # one per CPU) and in-flight jobs accepted before requests get a 503
+    bcrypt_rounds: int = 12
+    password_hash_workers: Optional[int] = None
+    password_hash_max_pending: int = 64
+
+    # Authentication caches (per process)
+    auth_token_cache_size: int = 10000
+    auth_user_cache_size: int = 10000
+    auth_user_cache_ttl_seconds: float = 30.0
+
+    # Rate limiting (token buckets, per process)
+    rate_limit_enabled: bool = True
+    rate_limit_ip_per_minute: float = 600
+    rate_limit_ip_burst: float = 100
+    rate_limit_user_per_minute: float = 300
+    rate_limit_user_burst: float = 60
+    # Per address on /token, /auth/login and /auth/register, and per (username, address) on failed logins
+    rate_limit_auth_per_minute: float = 10
+    rate_limit_auth_burst: float = 10
+    rate_limit_shards: int = 16
+    rate_limit_max_keys_per_shard: int = 10000
+    # Take the client address from X-Forwarded-For (only behind a trusted proxy)
+    rate_limit_trust_forwarded: bool = False
+
+    # Responses: JSON renderer ("orjson" when installed, or "json"), and
+    # compression of bodies of at least compression_minimum_size bytes, Brotli
+    # (with the brotli package installed) or gzip as the client accepts
+    json_renderer: str = "orjson"
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
+    # Logging
+    log_level: str = "INFO"
+    log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    log_json: bool = False
+    # Full lesson/content dumps at DEBUG level; expensive, enable only when debugging content
+    log_payloads: bool = False
+    # Fraction of requests written to the access log, optionally per path prefix,
+    # e.g. REQUEST_LOG_SAMPLE_RATES='{"/lessons": 0.05}'
+    request_log_sample_rate: float = 1.0
+    request_log_sample_rates: Dict[str, float] = {}
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+settings = get_settings()
@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Static learning content ships as one content pack per language, see
+# app/data/packs/README.md. Small datasets are parsed on first use, converted
+# to __slots__ records (no per-entry __dict__) and kept for the life of the
+# process, with their word -> entry indexes built once alongside them. The
+# .jsonl files are never held in memory as a whole: they are exposed as
+# generators that read one line at a time.
+
+DEFAULT_PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "packs")
+
+class Record:
+    """Read-only record with dict-style access for code that still expects dicts"""
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    def __repr__(self) -> str:
+        return "%s(%s)" % (type(self).__name__, ", ".join("%s=%r" % item for item in self.as_dict().items()))
+
+class WordEntry(Record):
+    __slots__ = ("word", "translation", "transliteration", "context", "category", "mnemonic")
+
+class LetterEntry(Record):
+    __slots__ = ("letter", "name", "transliteration", "pronunciation", "example_word")
+
+def iter_jsonl(path: str) -> Iterator[dict]:
+    """Yield one object per non-empty line"""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from None
+
+class ContentRegistry:
+    """Content packs by language code; every small dataset is parsed at most once per process"""
+
+    def __init__(self, packs_dir: Optional[str] = None):
+        self.packs_dir = packs_dir or DEFAULT_PACKS_DIR
+        self._loaded: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, code: str, filename: str) -> str:
+        return os.path.join(self.packs_dir, code, filename)
+
+    def _get(self, code: str, key: str, load: Callable[[], Any]) -> Any:
+        value = self._loaded.get((code, key))
+        if value is None:
+            with self._lock:
+                value = self._loaded.get((code, key))
+                if value is None:
+                    value = self._loaded[(code, key)] = load()
+                    logger.debug("Loaded %s content dataset %s", code, key)
+        return value
+
+    def _load_json(self, code: str, filename: str, default: Any) -> Any:
+        path = self._path(code, filename)
+        if not os.path.exists(path):
+            return default
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _iter(self, code: str, filename: str) -> Iterator[dict]:
+        path = self._path(code, filename)
+        if os.path.exists(path):
+            yield from iter_jsonl(path)
+
+    def codes(self) -> List[str]:
+        """Language codes of the available packs"""
+        if not os.path.isdir(self.packs_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.packs_dir)
+            if os.path.isfile(self._path(name, "language.json"))
+        )
+
+    def language(self, code: str) -> dict:
+        """The pack's language.json; raises KeyError for unknown codes"""
+        language = self._get(code, "language", lambda: self._load_json(code, "language.json", {}))
+        if not language:
+            raise KeyError(code)
+        return language
+
+    def iter_lessons(self, code: str) -> Iterator[dict]:
+        return self._iter(code, "lessons.jsonl")
+
+    def iter_phrases(self, code: str) -> Iterator[dict]:
+        return self._iter(code, "phrases.jsonl")
+
+    def iter_vocabulary(self, code: str) -> Iterator[dict]:
+        """Vocabulary entries in frequency order, read a line at a time"""
+        return self._iter(code, "vocabulary.jsonl")
+
+    def alphabet(self, code: str) -> Tuple[LetterEntry, ...]:
+        return self._get(code, "alphabet", lambda: tuple(
+            LetterEntry(**entry) for entry in self._load_json(code, "alphabet.json", [])
+        ))
+
+    def mnemonics(self, code: str) -> Dict[str, WordEntry]:
+        """Mnemonic entries indexed by word"""
+        return self._get(code, "mnemonics", lambda: {
+            entry["word"]: WordEntry(**entry) for entry in self._load_json(code, "mnemonics.json", [])
+        })
+
+content = ContentRegistry(settings.content_packs_dir)
@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
+from . import models
+
+# Async read queries shared by the routers and the auth dependency. Relationships
+# are never lazy-loaded on an AsyncSession, so anything a caller serializes must
+# be loaded here; everything else is raiseload'ed so an accidental access fails
+# loudly instead of fanning out into one query per row.
+
+async def get_language_by_code(db: AsyncSession, code: str) -> Optional[models.Language]:
+    result = await db.execute(
+        select(models.Language).where(models.Language.code == code).options(raiseload("*"))
+    )
+    return result.scalars().first()
+
+async def list_languages(db: AsyncSession) -> List[models.Language]:
+    result = await db.execute(select(models.Language).options(raiseload("*")))
+    return list(result.scalars())
+
+LESSON_SUMMARY_COLUMNS = (
+    models.Lesson.id, models.Lesson.title, models.Lesson.description, models.Lesson.level,
+    models.Lesson.category, models.Lesson.lesson_type, models.Lesson.language_id,
+    models.Lesson.created_at, models.Lesson.updated_at
+)
+
+async def list_lesson_summaries(
+    db: AsyncSession,
+    language_id: int,
+    limit: int,
+    after: Optional[int] = None,
+    level: Optional[str] = None,
+    category: Optional[str] = None,
+    lesson_type: Optional[str] = None
+) -> List[Row]:
+    """One page of lessons ordered by id, without the content columns.
+
+    Keyset pagination: the page starts after lesson id `after`, which is a
+    range scan on ix_lessons_language_id_id however deep the page is.
+    """
+    query = select(*LESSON_SUMMARY_COLUMNS).where(models.Lesson.language_id == language_id)
+    if after is not None:
+        query = query.where(models.Lesson.id > after)
+    if level is not None:
+        query = query.where(models.Lesson.level == level)
+    if category is not None:
+        query = query.where(models.Lesson.category == category)
+    if lesson_type is not None:
+        query = query.where(models.Lesson.lesson_type == lesson_type)
+    result = await db.execute(query.order_by(models.Lesson.id).limit(limit))
+    return list(result)
+
+async def get_lesson(db: AsyncSession, language_id: int, lesson_id: int) -> Optional[models.Lesson]:
+    """Fetch a lesson with its phrases in a single joined query"""
+    result = await db.execute(
+        select(models.Lesson)
+        .where(models.Lesson.language_id == language_id, models.Lesson.id == lesson_id)
+        .options(joinedload(models.Lesson.phrases), raiseload("*"))
+    )
+    return result.unique().scalars().first()
+
+async def get_lesson_version(db: AsyncSession, language_code: str, lesson_id: int) -> Optional[Row]:
+    """The lesson's language_id and version, which changes with every write to the
+    lesson or its phrases, without loading either"""
+    result = await db.execute(
+        select(models.Lesson.language_id, models.Lesson.version)
+        .join(models.Language, models.Language.id == models.Lesson.language_id)
+        .where(models.Language.code == language_code, models.Lesson.id == lesson_id)
+    )
+    return result.first()
+
+async def get_lesson_by_id(db: AsyncSession, lesson_id: int) -> Optional[models.Lesson]:
+    result = await db.execute(
+        select(models.Lesson).where(models.Lesson.id == lesson_id).options(raiseload("*"))
+    )
+    return result.scalars().first()
+
+async def has_completed_lesson(db: AsyncSession, user_id: int, lesson_id: int) -> bool:
+    """Whether a completion of the lesson by the user has already been written"""
+    result = await db.execute(
+        select(models.Progress.id)
+        .where(
+            models.Progress.user_id == user_id,
+            models.Progress.lesson_id == lesson_id,
+            models.Progress.completed.is_(True)
+        )
+        .limit(1)
+    )
+    return result.first() is not None
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[models.User]:
+    result = await db.execute(
+        select(models.User).where(models.User.username == username).options(raiseload("*"))
+    )
+    return result.scalars().first()
+
+async def get_usernames(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, str]:
+    result = await db.execute(
+        select(models.User.id, models.User.username).where(models.User.id.in_(set(user_ids)))
+    )
+    return dict(result.all())
+
+async def get_user_achievements(db: AsyncSession, user_id: int) -> List[models.Achievement]:
+    result = await db.execute(
+        select(models.Achievement)
+        .where(models.Achievement.user_id == user_id)
+        .order_by(models.Achievement.earned_at)
+        .options(raiseload("*"))
+    )
+    return list(result.scalars())
+
+async def get_due_items(
+    db: AsyncSession, user_id: int, language_id: int, now: datetime, limit: int
+) -> List[models.VocabularyItem]:
+    """Next `limit` cards due for review: a range scan on (user_id, language_id, due_at)"""
+    result = await db.execute(
+        select(models.VocabularyItem)
+        .where(
+            models.VocabularyItem.user_id == user_id,
+            models.VocabularyItem.language_id == language_id,
+            models.VocabularyItem.due_at <= now
+        )
+        .order_by(models.VocabularyItem.due_at)
+        .limit(limit)
+        .options(raiseload("*"))
+    )
+    return list(result.scalars())
@@ -1,170 +0,0 @@
-greek_alphabet = [
-    {
-        "letter": "Α α",
-        "name": "alpha",
-        "transliteration": "a",
-        "pronunciation": "ah",
-        "example_word": "αγάπη (agapi) - love"
-    },
-    {
-        "letter": "Β β",
-        "name": "beta",
-        "transliteration": "v",
-        "pronunciation": "v",
-        "example_word": "βιβλίο (vivlio) - book"
-    },
-    {
-        "letter": "Γ γ",
-        "name": "gamma",
-        "transliteration": "g",
-        "pronunciation": "gh",
-        "example_word": "γάτα (gata) - cat"
-    },
-    {
-        "letter": "Δ δ",
-        "name": "delta",
-        "transliteration": "d",
-        "pronunciation": "th",
-        "example_word": "δρόμος (dromos) - road"
-    },
-    {
-        "letter": "Ε ε",
-        "name": "epsilon",
-        "transliteration": "e",
-        "pronunciation": "eh",
-        "example_word": "εγώ (ego) - I"
-    },
-    {
-        "letter": "Ζ ζ",
-        "name": "zeta",
-        "transliteration": "z",
-        "pronunciation": "z",
-        "example_word": "ζωή (zoi) - life"
-    },
-    {
-        "letter": "Η η",
-        "name": "eta",
-        "transliteration": "i",
-        "pronunciation": "ee",
-        "example_word": "ήλιος (ilios) - sun"
-    },
-    {
-        "letter": "Θ θ",
-        "name": "theta",
-        "transliteration": "th",
-        "pronunciation": "th",
-        "example_word": "θάλασσα (thalassa) - sea"
-    },
-    {
-        "letter": "Ι ι",
-        "name": "iota",
-        "transliteration": "i",
-        "pronunciation": "ee",
-        "example_word": "ιδέα (idea) - idea"
-    },
-    {
-        "letter": "Κ κ",
-        "name": "kappa",
-        "transliteration": "k",
-        "pronunciation": "k",
-        "example_word": "καλός (kalos) - good"
-    },
-    {
-        "letter": "Λ λ",
-        "name": "lambda",
-        "transliteration": "l",
-        "pronunciation": "l",
-        "example_word": "λόγος (logos) - word"
-    },
-    {
-        "letter": "Μ μ",
-        "name": "mu",
-        "transliteration": "m",
-        "pronunciation": "m",
-        "example_word": "μητέρα (mitera) - mother"
-    },
-    {
-        "letter": "Ν ν",
-        "name": "nu",
-        "transliteration": "n",
-        "pronunciation": "n",
-        "example_word": "νερό (nero) - water"
-    },
-    {
-        "letter": "Ξ ξ",
-        "name": "xi",
-        "transliteration": "x",
-        "pronunciation": "ks",
-        "example_word": "ξύλο (ksulo) - wood"
-    },
-    {
-        "letter": "Ο ο",
-        "name": "omicron",
-        "transliteration": "o",
-        "pronunciation": "oh",
-        "example_word": "όνομα (onoma) - name"
-    },
-    {
-        "letter": "Π π",
-        "name": "pi",
-        "transliteration": "p",
-        "pronunciation": "p",
-        "example_word": "πατέρας (pateras) - father"
-    },
-    {
-        "letter": "Ρ ρ",
-        "name": "rho",
-        "transliteration": "r",
-        "pronunciation": "r",
-        "example_word": "ρολόι (roloi) - clock"
-    },
-    {
-        "letter": "Σ σ ς",
-        "name": "sigma",
-        "transliteration": "s",
-        "pronunciation": "s",
-        "example_word": "σπίτι (spiti) - house"
-    },
-    {
-        "letter": "Τ τ",
-        "name": "tau",
-        "transliteration": "t",
-        "pronunciation": "t",
-        "example_word": "τραπέζι (trapezi) - table"
-    },
-    {
-        "letter": "Υ υ",
-        "name": "upsilon",
-        "transliteration": "y",
-        "pronunciation": "ee",
-        "example_word": "ύπνος (ipnos) - sleep"
-    },
-    {
-        "letter": "Φ φ",
-        "name": "phi",
-        "transliteration": "f",
-        "pronunciation": "f",
-        "example_word": "φίλος (filos) - friend"
-    },
-    {
-        "letter": "Χ χ",
-        "name": "chi",
-        "transliteration": "ch",
-        "pronunciation": "h",
-        "example_word": "χέρι (heri) - hand"
-    },
-    {
-        "letter": "Ψ ψ",
-        "name": "psi",
-        "transliteration": "ps",
-        "pronunciation": "ps",
-        "example_word": "ψωμί (psomi) - bread"
-    },
-    {
-        "letter": "Ω ω",
-        "name": "omega",
-        "transliteration": "o",
-        "pronunciation": "oh",
-        "example_word": "ώρα (ora) - hour"
-    }
-]
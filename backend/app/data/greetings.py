@@ -1,72 +0,0 @@
-greek_greetings = [
-    {
-        "word": "γεια σας",
-        "translation": "hello (formal)",
-        "transliteration": "ya sas",
-        "context": "Use when greeting someone formally, like a teacher or elderly person",
-        "category": "formal greeting"
-    },
-    {
-        "word": "γεια σου",
-        "translation": "hello (informal)",
-        "transliteration": "ya soo",
-        "context": "Use when greeting friends or people you know well",
-        "category": "informal greeting"
-    },
-    {
-        "word": "καλημέρα σας",
-        "translation": "good morning (formal)",
-        "transliteration": "kalimera sas",
-        "context": "Formal morning greeting, used until around noon",
-        "category": "formal greeting"
-    },
-    {
-        "word": "καλημέρα",
-        "translation": "good morning (informal)",
-        "transliteration": "kalimera",
-        "context": "Informal morning greeting, used until around noon",
-        "category": "informal greeting"
-    },
-    {
-        "word": "αντίο σας",
-        "translation": "goodbye (formal)",
-        "transliteration": "adio sas",
-        "context": "Formal way to say goodbye",
-        "category": "formal farewell"
-    },
-    {
-        "word": "αντίο",
-        "translation": "goodbye (informal)",
-        "transliteration": "adio",
-        "context": "Informal way to say goodbye",
-        "category": "informal farewell"
-    },
-    {
-        "word": "τα λέμε",
-        "translation": "see you (informal)",
-        "transliteration": "ta leme",
-        "context": "Casual way to say goodbye, literally means 'we'll talk'",
-        "category": "slang farewell"
-    },
-    {
-        "word": "έλα",
-        "translation": "hey (very informal)",
-        "transliteration": "ela",
-        "context": "Very casual greeting among close friends",
-        "category": "slang greeting"
-    },
-    {
-        "word": "γειά μας",
-        "translation": "cheers/hi everyone (informal)",
-        "transliteration": "ya mas",
-        "context": "Casual group greeting or toast",
-        "category": "slang greeting"
-    },
-    {
-        "word": "καλό βράδυ",
-        "translation": "good evening",
-        "transliteration": "kalo vradi",
-        "context": "Evening farewell, can be both formal and informal",
-        "category": "neutral farewell"
-    }
-]
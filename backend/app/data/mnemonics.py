@@ -1,62 +0,0 @@
-mnemonics_data = [
-    {
-        "word": "καλά",
-        "translation": "good/well",
-        "transliteration": "kala",
-        "mnemonic": "Think of a CALm person saying 'Ah!' - they're feeling good (kala)"
-    },
-    {
-        "word": "τώρα",
-        "translation": "now",
-        "transliteration": "tora",
-        "mnemonic": "Think of a TORnado - it's happening right NOW (tora)"
-    },
-    {
-        "word": "εδώ",
-        "translation": "here",
-        "transliteration": "edo",
-        "mnemonic": "Imagine EDdie saying 'Oh!' - he's right HERE (edo)"
-    },
-    {
-        "word": "μόνο",
-        "translation": "only",
-        "transliteration": "mono",
-        "mnemonic": "Think of MONO sound - there's ONLY one channel (mono)"
-    },
-    {
-        "word": "κάθε",
-        "translation": "every",
-        "transliteration": "kathe",
-        "mnemonic": "Imagine a CAT saying 'Hey!' to EVERY other cat (kathe)"
-    },
-    {
-        "word": "μέρα",
-        "translation": "day",
-        "transliteration": "mera",
-        "mnemonic": "Think of a MERRY morning - it's a new DAY (mera)"
-    },
-    {
-        "word": "ξέρω",
-        "translation": "know",
-        "transliteration": "ksero",
-        "mnemonic": "Like a XEROX copy - you KNOW exactly what's on it (ksero)"
-    },
-    {
-        "word": "πάλι",
-        "translation": "again",
-        "transliteration": "pali",
-        "mnemonic": "Think of your PAL coming AGAIN (pali)"
-    },
-    {
-        "word": "μετά",
-        "translation": "after",
-        "transliteration": "meta",
-        "mnemonic": "Think META data comes AFTER the main data (meta)"
-    },
-    {
-        "word": "πριν",
-        "translation": "before",
-        "transliteration": "prin",
-        "mnemonic": "Think of a PRINCE who always comes BEFORE others (prin)"
-    }
-]
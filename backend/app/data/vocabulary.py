@@ -1,106 +0,0 @@
-popularGreekWords = [
-    # First 25 words (for spaced repetition)
-    {"word": "και", "translation": "and", "transliteration": "kai"},
-    {"word": "είναι", "translation": "is/are", "transliteration": "einai"},
-    {"word": "να", "translation": "to", "transliteration": "na"},
-    {"word": "το", "translation": "the", "transliteration": "to"},
-    {"word": "δεν", "translation": "not/don't", "transliteration": "den"},
-    {"word": "η", "translation": "the (feminine)", "transliteration": "i"},
-    {"word": "που", "translation": "that/which", "transliteration": "pou"},
-    {"word": "θα", "translation": "will", "transliteration": "tha"},
-    {"word": "τη", "translation": "the", "transliteration": "ti"},
-    {"word": "με", "translation": "with/me", "transliteration": "me"},
-    {"word": "σε", "translation": "in/at/to", "transliteration": "se"},
-    {"word": "από", "translation": "from", "transliteration": "apo"},
-    {"word": "για", "translation": "for", "transliteration": "gia"},
-    {"word": "μου", "translation": "my/mine", "transliteration": "mou"},
-    {"word": "τι", "translation": "what", "transliteration": "ti"},
-    {"word": "αυτό", "translation": "this", "transliteration": "afto"},
-    {"word": "στο", "translation": "to the", "transliteration": "sto"},
-    {"word": "τον", "translation": "the (masculine)", "transliteration": "ton"},
-    {"word": "έχω", "translation": "I have", "transliteration": "echo"},
-    {"word": "μια", "translation": "a/one (feminine)", "transliteration": "mia"},
-    {"word": "πως", "translation": "how", "transliteration": "pos"},
-    {"word": "όλα", "translation": "all", "transliteration": "ola"},
-    {"word": "έτσι", "translation": "so/like this", "transliteration": "etsi"},
-    {"word": "κάτι", "translation": "something", "transliteration": "kati"},
-    {"word": "πολύ", "translation": "very/much", "transliteration": "poli"},
-
-    # Next 25 words (for mnemonics)
-    {"word": "καλά", "translation": "good/well", "transliteration": "kala"},
-    {"word": "τώρα", "translation": "now", "transliteration": "tora"},
-    {"word": "εδώ", "translation": "here", "transliteration": "edo"},
-    {"word": "μόνο", "translation": "only", "transliteration": "mono"},
-    {"word": "κάθε", "translation": "every", "transliteration": "kathe"},
-    {"word": "μέρα", "translation": "day", "transliteration": "mera"},
-    {"word": "ξέρω", "translation": "know", "transliteration": "ksero"},
-    {"word": "πάλι", "translation": "again", "transliteration": "pali"},
-    {"word": "μετά", "translation": "after", "transliteration": "meta"},
-    {"word": "πριν", "translation": "before", "transliteration": "prin"},
-    {"word": "πάνω", "translation": "up/above", "transliteration": "pano"},
-    {"word": "κάτω", "translation": "down/below", "transliteration": "kato"},
-    {"word": "μαζί", "translation": "together", "transliteration": "mazi"},
-    {"word": "χωρίς", "translation": "without", "transliteration": "horis"},
-    {"word": "ναι", "translation": "yes", "transliteration": "ne"},
-    {"word": "όχι", "translation": "no", "transliteration": "ohi"},
-    {"word": "ευχαριστώ", "translation": "thank you", "transliteration": "efharisto"},
-    {"word": "παρακαλώ", "translation": "please/you're welcome", "transliteration": "parakalo"},
-    {"word": "γεια", "translation": "hello", "transliteration": "ya"},
-    {"word": "καλημέρα", "translation": "good morning", "transliteration": "kalimera"},
-    {"word": "καληνύχτα", "translation": "good night", "transliteration": "kalinihta"},
-    {"word": "συγγνώμη", "translation": "sorry", "transliteration": "signomi"},
-    {"word": "άνθρωπος", "translation": "human/person", "transliteration": "anthropos"},
-    {"word": "φίλος", "translation": "friend", "transliteration": "filos"},
-    {"word": "σπίτι", "translation": "house", "transliteration": "spiti"},
-
-    # Next 25 words (for contextual learning)
-    {"word": "νερό", "translation": "water", "transliteration": "nero", "context": "Used when asking for water at a restaurant: 'Ένα νερό παρακαλώ' (Ena nero parakalo - One water please)"},
-    {"word": "ψωμί", "translation": "bread", "transliteration": "psomi", "context": "Common at meals: 'Το ψωμί είναι φρέσκο' (To psomi einai fresko - The bread is fresh)"},
-    {"word": "φαγητό", "translation": "food", "transliteration": "fayito", "context": "General term for food: 'Το φαγητό είναι έτοιμο' (To fayito einai etimo - The food is ready)"},
-    {"word": "γάλα", "translation": "milk", "transliteration": "gala", "context": "Used in daily life: 'Θέλω γάλα για τον καφέ' (Thelo gala gia ton kafe - I want milk for the coffee)"},
-    {"word": "κρασί", "translation": "wine", "transliteration": "krasi", "context": "Common in restaurants: 'Ένα ποτήρι κρασί' (Ena potiri krasi - A glass of wine)"},
-    {"word": "καφές", "translation": "coffee", "transliteration": "kafes", "context": "Essential morning phrase: 'Πίνω καφέ κάθε πρωί' (Pino kafe kathe proi - I drink coffee every morning)"},
-    {"word": "τραπέζι", "translation": "table", "transliteration": "trapezi", "context": "Used in home and restaurants: 'Το τραπέζι είναι έτοιμο' (To trapezi einai etimo - The table is ready)"},
-    {"word": "καρέκλα", "translation": "chair", "transliteration": "karekla", "context": "Basic furniture term: 'Κάθομαι στην καρέκλα' (Kathome stin karekla - I'm sitting on the chair)"},
-    {"word": "κρεβάτι", "translation": "bed", "transliteration": "krevati", "context": "Used in home context: 'Πάω στο κρεβάτι' (Pao sto krevati - I'm going to bed)"},
-    {"word": "πόρτα", "translation": "door", "transliteration": "porta", "context": "Common direction: 'Η πόρτα είναι ανοιχτή' (I porta einai anihti - The door is open)"},
-    {"word": "παράθυρο", "translation": "window", "transliteration": "parathiro", "context": "Used in daily life: 'Άνοιξε το παράθυρο' (Anikse to parathiro - Open the window)"},
-    {"word": "δωμάτιο", "translation": "room", "transliteration": "domatio", "context": "Used in home or hotel: 'Το δωμάτιο είναι μεγάλο' (To domatio einai megalo - The room is big)"},
-    {"word": "κουζίνα", "translation": "kitchen", "transliteration": "kouzina", "context": "Common house term: 'Μαγειρεύω στην κουζίνα' (Magirevo stin kouzina - I'm cooking in the kitchen)"},
-    {"word": "μπάνιο", "translation": "bathroom", "transliteration": "banio", "context": "Essential phrase: 'Πού είναι το μπάνιο;' (Pou einai to banio? - Where is the bathroom?)"},
-    {"word": "δρόμος", "translation": "street/road", "transliteration": "dromos", "context": "Used for directions: 'Σε ποιο δρόμο είσαι;' (Se poio dromo eisai? - Which street are you on?)"},
-    {"word": "αυτοκίνητο", "translation": "car", "transliteration": "aftokinito", "context": "Daily transportation: 'Έχω ένα καινούργιο αυτοκίνητο' (Echo ena kainourgio aftokinito - I have a new car)"},
-    {"word": "λεωφορείο", "translation": "bus", "transliteration": "leoforeio", "context": "Public transport: 'Περιμένω το λεωφορείο' (Perimeno to leoforeio - I'm waiting for the bus)"},
-    {"word": "τρένο", "translation": "train", "transliteration": "treno", "context": "Travel context: 'Το τρένο φεύγει στις 3' (To treno fevgei stis 3 - The train leaves at 3)"},
-    {"word": "αεροπλάνο", "translation": "airplane", "transliteration": "aeroplano", "context": "Travel term: 'Το αεροπλάνο καθυστερεί' (To aeroplano kathysterei - The airplane is delayed)"},
-    {"word": "ποδήλατο", "translation": "bicycle", "transliteration": "podilato", "context": "Transportation: 'Κάνω ποδήλατο κάθε μέρα' (Kano podilato kathe mera - I ride a bicycle every day)"},
-    {"word": "τηλέφωνο", "translation": "telephone", "transliteration": "tilefono", "context": "Communication: 'Μιλάω στο τηλέφωνο' (Milao sto tilefono - I'm talking on the phone)"},
-    {"word": "υπολογιστής", "translation": "computer", "transliteration": "ipologistis", "context": "Technology: 'Δουλεύω στον υπολογιστή' (Doulevo ston ipologisti - I'm working on the computer)"},
-    {"word": "βιβλίο", "translation": "book", "transliteration": "vivlio", "context": "Education/leisure: 'Διαβάζω ένα βιβλίο' (Diavazo ena vivlio - I'm reading a book)"},
-    {"word": "τηλεόραση", "translation": "television", "transliteration": "tileorasi", "context": "Entertainment: 'Βλέπω τηλεόραση' (Vlepo tileorasi - I'm watching television)"},
-    {"word": "ήλιος", "translation": "sun", "transliteration": "ilios", "context": "Weather: 'Ο ήλιος λάμπει' (O ilios labei - The sun is shining)"},
-    {"word": "φεγγάρι", "translation": "moon", "transliteration": "fengari"},
-    {"word": "αστέρι", "translation": "star", "transliteration": "asteri"},
-    {"word": "ουρανός", "translation": "sky", "transliteration": "ouranos"},
-    {"word": "θάλασσα", "translation": "sea", "transliteration": "thalassa"},
-    {"word": "βουνό", "translation": "mountain", "transliteration": "vouno"},
-    {"word": "δέντρο", "translation": "tree", "transliteration": "dentro"},
-    {"word": "λουλούδι", "translation": "flower", "transliteration": "louloudi"},
-    {"word": "ζώο", "translation": "animal", "transliteration": "zoo"},
-    {"word": "σκύλος", "translation": "dog", "transliteration": "skilos"},
-    {"word": "γάτα", "translation": "cat", "transliteration": "gata"},
-    {"word": "πουλί", "translation": "bird", "transliteration": "pouli"},
-    {"word": "ψάρι", "translation": "fish", "transliteration": "psari"},
-    {"word": "χρώμα", "translation": "color", "transliteration": "hroma"},
-    {"word": "κόκκινο", "translation": "red", "transliteration": "kokkino"},
-    {"word": "μπλε", "translation": "blue", "transliteration": "ble"},
-    {"word": "πράσινο", "translation": "green", "transliteration": "prasino"},
-    {"word": "κίτρινο", "translation": "yellow", "transliteration": "kitrino"},
-    {"word": "άσπρο", "translation": "white", "transliteration": "aspro"},
-    {"word": "μαύρο", "translation": "black", "transliteration": "mavro"},
-    {"word": "γκρι", "translation": "gray", "transliteration": "gri"},
-    {"word": "καφέ", "translation": "brown", "transliteration": "kafe"},
-    {"word": "ροζ", "translation": "pink", "transliteration": "roz"},
-    {"word": "μωβ", "translation": "purple", "transliteration": "mov"},
-    {"word": "πορτοκαλί", "translation": "orange", "transliteration": "portokali"}
-]
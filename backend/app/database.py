@@ -1,23 +1,114 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from dotenv import load_dotenv
-import os
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from .config import Settings, settings
 from .models import Lesson, Phrase
-from .data.vocabulary import popularGreekWords
+from .lesson_content import compile_lesson
 
-load_dotenv()
+SQLALCHEMY_DATABASE_URL = settings.database_url
 
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./language_learning.db")
+def set_sqlite_pragmas(dbapi_connection, settings: Settings):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        if settings.sqlite_cache_size_kb:
+            # Negative cache_size is in KiB rather than pages
+            cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+    finally:
+        cursor.close()
+
+def create_db_engine(settings: Settings, url: str = None) -> Engine:
+    """Build the engine for `url` (default: settings.database_url) with per-dialect tuning.
+
+    Server databases get a sized QueuePool with pre-ping and recycling; SQLite
+    gets WAL, relaxed fsync, a busy timeout and memory-mapped reads.
+    """
+    url = make_url(url or settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        engine = create_engine(
+            url,
+            echo=settings.db_echo,
+            connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000}
+        )
+        event.listen(engine, "connect", lambda dbapi_connection, _: set_sqlite_pragmas(dbapi_connection, settings))
+        return engine
+
+    return create_engine(
+        url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=True  # lets idle connections beyond the steady state time out
+    )
+
+# Async drivers used for each sync URL scheme
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url) -> URL:
+    """Map a sync database URL onto the matching asyncio driver"""
+    url = make_url(url)
+    async_driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if async_driver is None or url.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    return url.set(drivername=async_driver)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
-)
+def create_async_db_engine(settings: Settings, url: str = None) -> AsyncEngine:
+    """Async counterpart of create_db_engine with the same pool/pragma tuning"""
+    url = async_database_url(url or settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        engine = create_async_engine(
+            url,
+            echo=settings.db_echo,
+            poolclass=AsyncAdaptedQueuePool,  # aiosqlite defaults to NullPool, reconnecting per checkout
+            connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000}
+        )
+        event.listen(
+            engine.sync_engine, "connect",
+            lambda dbapi_connection, _: set_sqlite_pragmas(dbapi_connection, settings)
+        )
+        return engine
+
+    return create_async_engine(
+        url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=True
+    )
+
+def pool_status(engine: Engine) -> dict:
+    """Connection pool counters for the health endpoint"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__, "dialect": engine.dialect.name}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            status[name] = counter()
+    return status
+
+engine = create_db_engine(settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+async_engine = create_async_db_engine(settings)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -25,6 +116,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def add_memory_technique_lessons(db: Session, language_id: int):
     words_with_mnemonics = [
         {
@@ -108,6 +203,7 @@ def add_memory_technique_lessons(db: Session, language_id: int):
         },
         language_id=language_id
     )
+    compile_lesson(lesson)
     
     db.add(lesson)
     db.commit()
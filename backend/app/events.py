@@ -0,0 +1,34 @@
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Batches of committed domain events, fanned out to in-process subscribers
+# (leaderboards, achievements). Publishers call publish() only after their
+# transaction has committed; handlers must be quick and must not block, since
+# they run inline on the publisher's task.
+
+LESSON_STARTED = "lesson_started"
+LESSON_COMPLETED = "lesson_completed"
+REVIEWS_RECORDED = "reviews_recorded"
+
+Handler = Callable[[str, Sequence], None]
+
+class EventHub:
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, event_type: str, handler: Handler):
+        self._handlers[event_type].append(handler)
+
+    def publish(self, event_type: str, events: Sequence):
+        if not events:
+            return
+        for handler in self._handlers.get(event_type, ()):
+            try:
+                handler(event_type, events)
+            except Exception:
+                logger.exception("Handler %r failed for %d %s events", handler, len(events), event_type)
+
+event_hub = EventHub()
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sortedcontainers import SortedList
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .database import AsyncSessionLocal
+from .events import LESSON_COMPLETED, event_hub
+from .progress import ProgressEvent
+
+logger = logging.getLogger(__name__)
+
+# In-memory leaderboards, kept in step with the progress flush instead of
+# sorting all profiles per request. Every board is a SortedList ordered by
+# (-points, user_id), so rank lookups, top-K and the window around a user are
+# O(log n) plus the number of entries returned. Boards are rebuilt from the
+# database at startup and every LEADERBOARD_REFRESH_SECONDS, which also picks
+# up points flushed by other worker processes.
+#
+# Boards are keyed by (language_id, weekly): language_id None is the global
+# board, weekly boards only count points earned since Monday 00:00 UTC.
+
+BoardKey = Tuple[Optional[int], bool]
+Standing = Tuple[int, int, int]  # (rank, user_id, points), rank starting at 1
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+class Leaderboard:
+    """Users ordered by points, highest first; ties go to the lower user id"""
+
+    def __init__(self, scores: Iterable[Tuple[int, int]] = ()):
+        self._points: Dict[int, int] = dict(scores)
+        self._order = SortedList((-points, user_id) for user_id, points in self._points.items())
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def points(self, user_id: int) -> Optional[int]:
+        return self._points.get(user_id)
+
+    def add(self, user_id: int, delta: int):
+        current = self._points.get(user_id)
+        if current is not None:
+            self._order.remove((-current, user_id))
+        points = (current or 0) + delta
+        self._points[user_id] = points
+        self._order.add((-points, user_id))
+
+    def rank(self, user_id: int) -> Optional[int]:
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._order.bisect_left((-points, user_id)) + 1
+
+    def _slice(self, start: int, stop: int) -> List[Standing]:
+        return [
+            (start + offset + 1, user_id, -negated)
+            for offset, (negated, user_id) in enumerate(self._order.islice(start, stop))
+        ]
+
+    def top(self, k: int) -> List[Standing]:
+        return self._slice(0, min(k, len(self._order)))
+
+    def around(self, user_id: int, radius: int) -> List[Standing]:
+        """The user's standing with up to `radius` users above and below"""
+        rank = self.rank(user_id)
+        if rank is None:
+            return []
+        return self._slice(max(rank - 1 - radius, 0), min(rank + radius, len(self._order)))
+
+async def load_boards(db: AsyncSession, week: date) -> Dict[BoardKey, Leaderboard]:
+    """Build every board from user_profiles (global total) and the points ledger"""
+    profiles = await db.execute(
+        select(models.UserProfile.user_id, models.UserProfile.points)
+        .where(models.UserProfile.points > 0)
+    )
+    boards = {(None, False): Leaderboard((row.user_id, row.points) for row in profiles)}
+
+    entries = models.PointsEntry
+    by_language: Dict[BoardKey, Dict[int, int]] = defaultdict(dict)
+    all_time = await db.execute(
+        select(entries.user_id, entries.language_id, func.sum(entries.points))
+        .group_by(entries.language_id, entries.user_id)
+    )
+    for user_id, language_id, points in all_time:
+        by_language[(language_id, False)][user_id] = points
+    this_week = await db.execute(
+        select(entries.user_id, entries.language_id, func.sum(entries.points))
+        .where(entries.earned_at >= datetime.combine(week, datetime.min.time()))
+        .group_by(entries.language_id, entries.user_id)
+    )
+    weekly_total: Dict[int, int] = defaultdict(int)
+    for user_id, language_id, points in this_week:
+        by_language[(language_id, True)][user_id] = points
+        weekly_total[user_id] += points
+
+    boards[(None, True)] = Leaderboard(weekly_total.items())
+    for key, scores in by_language.items():
+        boards[key] = Leaderboard(scores.items())
+    return boards
+
+class LeaderboardService:
+    """Holds the boards, applies flushed progress to them and rebuilds them periodically"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self._session_factory = session_factory
+        self._boards: Dict[BoardKey, Leaderboard] = {}
+        self._week = week_start(datetime.utcnow().date())
+        # Points flushed while a rebuild is reading the database, replayed onto the new boards
+        self._pending: Optional[List[Tuple[int, int, date, int]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def board(self, language_id: Optional[int] = None, weekly: bool = False) -> Leaderboard:
+        self._roll_week()
+        return self._boards.get((language_id, weekly)) or Leaderboard()
+
+    def _roll_week(self):
+        week = week_start(datetime.utcnow().date())
+        if week != self._week:
+            self._boards = {key: board for key, board in self._boards.items() if not key[1]}
+            self._week = week
+
+    def record_progress(self, event_type: str, events: List[ProgressEvent]):
+        """Event handler: add the points of a committed batch of completions"""
+        earned = [
+            (event.user_id, event.language_id, event.at.date(), event.points_awarded)
+            for event in events if event.points_awarded
+        ]
+        self._apply(earned)
+        if self._pending is not None:
+            self._pending.extend(earned)
+
+    def _apply(self, earned: Iterable[Tuple[int, int, date, int]]):
+        self._roll_week()
+        for user_id, language_id, day, points in earned:
+            keys = [(None, False), (language_id, False)]
+            if week_start(day) == self._week:
+                keys += [(None, True), (language_id, True)]
+            for key in keys:
+                board = self._boards.get(key)
+                if board is None:
+                    board = self._boards[key] = Leaderboard()
+                board.add(user_id, points)
+
+    async def rebuild(self):
+        week = week_start(datetime.utcnow().date())
+        self._pending = []
+        try:
+            async with self._session_factory() as db:
+                boards = await load_boards(db, week)
+        finally:
+            pending, self._pending = self._pending, None
+        self._boards, self._week = boards, week
+        self._apply(pending)
+        logger.info("Rebuilt %d leaderboards (%d ranked users)", len(boards), len(boards[(None, False)]))
+
+    async def start(self, refresh_seconds: float):
+        await self.rebuild()
+        if refresh_seconds > 0:
+            self._task = asyncio.create_task(self._refresh(refresh_seconds))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Leaderboard rebuild failed, keeping the current boards")
+
+leaderboards = LeaderboardService(AsyncSessionLocal)
+event_hub.subscribe(LESSON_COMPLETED, leaderboards.record_progress)
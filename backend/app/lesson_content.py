@@ -0,0 +1,120 @@
+import json
+import logging
+from itertools import chain
+from typing import Iterable, Optional
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Update
+from . import models
+
+logger = logging.getLogger(__name__)
+
+def empty_content() -> dict:
+    return {
+        "introduction": "",
+        "description": "",
+        "activities": [],
+        "words": [],
+        "example_situations": []
+    }
+
+def normalize_word(word) -> dict:
+    """Project a stored word onto the fields the lesson detail view renders"""
+    if not isinstance(word, dict):
+        return {"word": str(word), "translation": "", "transliteration": ""}
+    processed_word = {
+        "word": word.get("word", ""),
+        "translation": word.get("translation", ""),
+        "transliteration": word.get("transliteration", ""),
+    }
+    if "mnemonic" in word:
+        processed_word["mnemonic"] = word["mnemonic"]
+    if "context" in word:
+        processed_word["context"] = word["context"]
+    return processed_word
+
+def normalize_lesson_content(content, lesson_type: Optional[str], phrases: Iterable[models.Phrase] = ()) -> dict:
+    """Build the canonical detail document for a lesson's stored content.
+
+    This is the normalization `GET /lessons/{language_code}/{lesson_id}` used to do on
+    every request; it now runs once when a lesson is written.
+    """
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except json.JSONDecodeError:
+            logger.error("Failed to parse lesson content as JSON")
+            content = empty_content()
+    content = dict(content or {})
+
+    # Ensure activities is a list
+    if not isinstance(content.get("activities"), list):
+        content["activities"] = []
+
+    # For mnemonics lessons the practice words come from the phrases table
+    if lesson_type == "mnemonics":
+        content["practice_words"] = [
+            {
+                "word": phrase.text,
+                "translation": phrase.translation,
+                "transliteration": phrase.transliteration,
+                "mnemonic": phrase.extra_data.get("mnemonic", "") if phrase.extra_data else ""
+            }
+            for phrase in phrases
+        ]
+        return content
+
+    # Convert practice_words to words if needed
+    if "practice_words" in content and not content.get("words"):
+        content["words"] = content["practice_words"]
+
+    words = content.get("words")
+    if isinstance(words, list):
+        content["words"] = [normalize_word(word) for word in words]
+    elif isinstance(words, str) and words:
+        content["words"] = [
+            {"word": w.split(":")[0], "explanation": w.split(":")[1] if ":" in w else ""}
+            for w in words.split(";")
+            if w.strip()
+        ]
+    else:
+        content["words"] = []
+    return content
+
+def compile_lesson(lesson: models.Lesson, phrases: Optional[Iterable[models.Phrase]] = None) -> models.Lesson:
+    """Store the precompiled detail document on the lesson; call whenever content or phrases change"""
+    if phrases is None:
+        phrases = lesson.phrases
+    lesson.compiled_content = normalize_lesson_content(lesson.content, lesson.lesson_type, phrases)
+    return lesson
+
+def bump_lesson_versions(lesson_ids: Iterable[int]) -> Update:
+    """UPDATE marking the lessons' detail documents as changed; execute it after bulk writes to them or their phrases"""
+    return (
+        update(models.Lesson)
+        .where(models.Lesson.id.in_(set(lesson_ids)))
+        .values(version=models.Lesson.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+@event.listens_for(Session, "before_flush")
+def bump_changed_lesson_versions(session: Session, flush_context, instances):
+    """Bump the version of every lesson changed in this flush, directly or through its phrases"""
+    lesson_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, models.Phrase):
+            # A phrase moved between lessons changes both
+            history = inspect(obj).attrs.lesson_id.history
+            lesson_ids.update(lesson_id for lesson_id in (obj.lesson_id, *history.deleted) if lesson_id)
+        elif isinstance(obj, models.Lesson) and obj in session.dirty and session.is_modified(obj):
+            lesson_ids.update(inspect(obj).identity)
+    if not lesson_ids:
+        return
+    # Lessons in this session are updated by their own flush, the rest with one statement
+    present = set()
+    for (cls, identity, _), obj in session.identity_map.items():
+        if cls is models.Lesson and identity[0] in lesson_ids and obj not in session.deleted:
+            obj.version = models.Lesson.version + 1
+            present.add(identity[0])
+    if lesson_ids - present:
+        session.connection().execute(bump_lesson_versions(lesson_ids - present))
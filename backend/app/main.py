@@ -1,48 +1,54 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from . import models
-from .database import engine, SessionLocal
-from .routers import lessons, languages
+from .achievements import achievement_engine
+from .config import settings
+from .database import async_engine, engine, SessionLocal, pool_status
+from .leaderboard import leaderboards
+from .logging_config import RequestLoggingMiddleware, configure_logging
+from .progress import progress_writer
+from .rate_limit import Limit, RateLimitMiddleware, rate_limit_store
+from .responses import CompressionMiddleware, json_response_class
+from .search import content_search
+from .routers import achievements, auth, bundles, leaderboard, lessons, languages, progress, reviews, search, vocabulary
+from .security import decode_token, password_hasher
+from .startup import initialize_database
 import logging
-import sys
 
 # Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    stream=sys.stdout
-)
+configure_logging(settings)
 
 logger = logging.getLogger(__name__)
 
-# Drop and recreate all tables
-models.Base.metadata.drop_all(bind=engine)
-models.Base.metadata.create_all(bind=engine)
-
-# Initialize Greek language
-from sqlalchemy.orm import Session
-db = SessionLocal()
-try:
-    # Create Greek language if it doesn't exist
-    greek = models.Language(
-        code="el",
-        name="Greek",
-        native_name="Ελληνικά",
-        flag="🇬🇷",
-        rtl=False
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema and seed checks run once per worker at startup, never on import
+    await run_in_threadpool(
+        initialize_database,
+        engine,
+        SessionLocal,
+        migrate=settings.auto_create_schema,
+        seed=settings.seed_on_startup
     )
-    db.add(greek)
-    db.commit()
-    db.refresh(greek)
-    logger.info("Created Greek language entry")
-except Exception as e:
-    logger.error(f"Error creating Greek language: {str(e)}")
-    db.rollback()
-finally:
-    db.close()
+    # Starts the hashing processes and hashes the unknown-user dummy at BCRYPT_ROUNDS
+    await password_hasher.start()
+    await progress_writer.start()
+    await leaderboards.start(settings.leaderboard_refresh_seconds)
+    await achievement_engine.start(settings.achievement_interval_seconds)
+    await content_search.start(settings.search_refresh_seconds)
+    yield
+    await content_search.stop()
+    await leaderboards.stop()
+    # Write buffered progress events before the pool goes away, then award
+    # the achievements they unlock
+    await progress_writer.stop()
+    await achievement_engine.stop()
+    await run_in_threadpool(password_hasher.shutdown)
+    await async_engine.dispose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=json_response_class(settings.json_renderer))
 
 # Configure CORS
 origins = [
@@ -53,6 +59,29 @@ origins = [
     "*"  # Allow all origins for development
 ]
 
+# Compression is innermost, so every response body passes through it once
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality
+    )
+
+# Rate limiting sits inside CORS so 429 responses still carry CORS headers
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=rate_limit_store,
+        ip_limit=Limit.per_minute(settings.rate_limit_ip_per_minute, settings.rate_limit_ip_burst),
+        user_limit=Limit.per_minute(settings.rate_limit_user_per_minute, settings.rate_limit_user_burst),
+        auth_limit=Limit.per_minute(settings.rate_limit_auth_per_minute, settings.rate_limit_auth_burst),
+        auth_paths=("/token", "/auth/login", "/auth/register"),
+        exempt_paths=("/health",),
+        trust_forwarded=settings.rate_limit_trust_forwarded,
+        token_subject=lambda token: decode_token(token).get("sub")
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -61,10 +90,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    RequestLoggingMiddleware,
+    default_rate=settings.request_log_sample_rate,
+    sample_rates=settings.request_log_sample_rates
+)
+
 # Add exception handler for logging
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global error handler caught: {str(exc)}", exc_info=True)
+    logger.error("Global error handler caught: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"detail": str(exc)}
@@ -73,6 +108,14 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(lessons.router)
 app.include_router(languages.router)
+app.include_router(vocabulary.router)
+app.include_router(reviews.router)
+app.include_router(progress.router)
+app.include_router(leaderboard.router)
+app.include_router(achievements.router)
+app.include_router(auth.router)
+app.include_router(search.router)
+app.include_router(bundles.router)
 
 @app.get("/")
 async def root():
@@ -81,3 +124,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db")
+async def database_pool_health():
+    """Connection pool usage, for tuning DB_POOL_SIZE / DB_MAX_OVERFLOW"""
+    return {"sync": pool_status(engine), "async": pool_status(async_engine.sync_engine)}
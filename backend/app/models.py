@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, JSON, Table, Text
+from sqlalchemy import Boolean, Column, Date, ForeignKey, Float, Index, Integer, String, DateTime, JSON, Table, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -31,13 +31,15 @@ class UserProfile(Base):
     __tablename__ = "user_profiles"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     native_language = Column(String)
     learning_goals = Column(JSON)
     daily_goal_minutes = Column(Integer, default=30)
     level = Column(Integer, default=1)
     points = Column(Integer, default=0)
     streak_days = Column(Integer, default=0)
+    # Last day (UTC) with a completed lesson, drives streak_days
+    last_active_date = Column(Date, nullable=True)
     user = relationship("User", back_populates="profile")
 
 class Language(Base):
@@ -57,14 +59,23 @@ class Language(Base):
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Lesson lists/detail filter by (language_id[, id]); seeding looks up (language_id, title)
+        Index("ix_lessons_language_id_id", "language_id", "id"),
+        Index("ix_lessons_language_id_title", "language_id", "title"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(200), index=True)
-    description = Column(String(500), index=True)
+    title = Column(String(200))
+    description = Column(String(500))
     level = Column(String(2), index=True)  # A1, A2, B1, B2, C1, C2
     category = Column(String(50), index=True)
     lesson_type = Column(String(50), index=True)
     content = Column(JSON)
+    compiled_content = Column(JSON, nullable=True)  # Normalized detail document, built at write time
+    # Bumped on every write to the lesson or its phrases; the detail ETag is built from it.
+    # ORM flushes bump it automatically, bulk statements use lesson_content.bump_lesson_versions
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     language_id = Column(Integer, ForeignKey("languages.id"))
     language = relationship("Language", back_populates="lessons")
     phrases = relationship("Phrase", back_populates="lesson", cascade="all, delete-orphan")
@@ -101,7 +112,7 @@ class Phrase(Base):
     level = Column(String(2))
     category = Column(String(50))
     language_id = Column(Integer, ForeignKey("languages.id"))
-    lesson_id = Column(Integer, ForeignKey("lessons.id"))
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), index=True)
     lesson = relationship("Lesson", back_populates="phrases")
     audio_url = Column(String(200), nullable=True)
     extra_data = Column(JSON, nullable=True)  # Add extra_data column for mnemonics
@@ -110,6 +121,10 @@ class Phrase(Base):
 
 class Progress(Base):
     __tablename__ = "progress"
+    __table_args__ = (
+        # Progress is upserted per (user, lesson) when buffered events are flushed
+        Index("ix_progress_user_id_lesson_id", "user_id", "lesson_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -119,8 +134,27 @@ class Progress(Base):
     completed_at = Column(DateTime)
     user = relationship("User", back_populates="progress")
 
+class PointsEntry(Base):
+    """Points earned by a user in one language, appended by the progress flush"""
+    __tablename__ = "points_entries"
+    __table_args__ = (
+        # Leaderboard rebuilds: all-time sums per language and sums since the start of the week
+        Index("ix_points_entries_language_id_user_id", "language_id", "user_id"),
+        Index("ix_points_entries_earned_at", "earned_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    language_id = Column(Integer, ForeignKey("languages.id"), nullable=False)
+    points = Column(Integer, nullable=False)
+    earned_at = Column(DateTime, nullable=False)
+
 class Achievement(Base):
     __tablename__ = "achievements"
+    __table_args__ = (
+        # One badge per user and achievement, see achievements.insert_ignoring_duplicates
+        Index("ix_achievements_user_id_name", "user_id", "name", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -132,6 +166,10 @@ class Achievement(Base):
 
 class VocabularyItem(Base):
     __tablename__ = "vocabulary_items"
+    __table_args__ = (
+        # "Next N due cards" is a range scan on this index, see crud.get_due_items
+        Index("ix_vocabulary_items_user_language_due", "user_id", "language_id", "due_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -142,3 +180,9 @@ class VocabularyItem(Base):
     category = Column(String)
     mastery_level = Column(Integer, default=0)
     last_reviewed = Column(DateTime)
+    # Spaced-repetition scheduling state (SM-2), see app/srs.py
+    ease_factor = Column(Float, default=2.5, nullable=False)
+    interval_days = Column(Float, default=0.0, nullable=False)
+    repetitions = Column(Integer, default=0, nullable=False)
+    lapses = Column(Integer, default=0, nullable=False)
+    due_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# bcrypt is deliberately slow (~250ms at cost 12), so it never runs on the
+# event loop or the request threadpool. Hashes are computed in a small process
+# pool, and callers beyond `max_pending` in-flight jobs are turned away
+# immediately with PasswordHasherBusy instead of queueing behind a login storm.
+# This module is imported by the spawned workers, so it only depends on passlib.
+
+_contexts = {}
+
+def _context(rounds: int) -> CryptContext:
+    context = _contexts.get(rounds)
+    if context is None:
+        context = _contexts[rounds] = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    return context
+
+def hash_password_sync(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+def verify_password_sync(password: str, hashed_password: str) -> bool:
+    # The cost is read from the hash itself, so hashes made at any cost verify
+    return bcrypt.verify(password, hashed_password)
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing jobs are already queued"""
+
+class PasswordHasher:
+    def __init__(self, rounds: int, workers: Optional[int], max_pending: int):
+        self.rounds = rounds
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dummy_hash: Optional[str] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def dummy_hash(self) -> Optional[str]:
+        return self._dummy_hash
+
+    async def start(self):
+        """Start the workers and hash a random password to verify against for unknown users"""
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(secrets.token_urlsafe(16))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the server process has logging and driver threads running
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _submit(self, fn, *args):
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusy(f"{self._pending} password hashing jobs pending")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool for the next caller
+                logger.error("Password hashing pool broke, replacing it")
+                if self._executor is executor:
+                    self._executor = None
+                    executor.shutdown(wait=False)
+                raise
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password_sync, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password_sync, password, hashed_password)
+
+    async def verify_dummy(self, password: str) -> bool:
+        """Spend one verification at the configured cost; always False"""
+        await self.start()
+        await self.verify(password, self._dummy_hash)
+        return False
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
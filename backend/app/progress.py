@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import Date, Integer, bindparam, case, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .config import settings
+from .database import AsyncSessionLocal
+from .events import LESSON_COMPLETED, LESSON_STARTED, event_hub
+
+logger = logging.getLogger(__name__)
+
+# Lesson start/complete events are appended to an in-memory buffer and written
+# by a background task in batches. One flush turns any number of events into a
+# fixed handful of statements, and points/streaks are applied as relative
+# UPDATEs (points = points + :delta), so concurrent completions never read,
+# modify and write back the same profile row. Events still in the buffer are
+# lost if the process dies, which bounds the loss to one flush interval.
+#
+# Points are awarded once per (user, lesson): for the first completion only.
+# Repeat completions still count towards the streak.
+
+POINTS_PER_LESSON = 10
+# An event that fails to be written this many times is dropped instead of retried forever
+MAX_FLUSH_ATTEMPTS = 3
+
+@dataclass
+class ProgressEvent:
+    user_id: int
+    lesson_id: int
+    language_id: int
+    completed: bool
+    score: Optional[int]
+    at: datetime
+    # Set when the event is written: points_for(event) for a first completion, else 0
+    points_awarded: int = field(default=0, compare=False)
+    failed_flushes: int = field(default=0, compare=False)
+
+def points_for(event: ProgressEvent) -> int:
+    """Points a completion earns if it is the user's first of the lesson"""
+    if not event.completed:
+        return 0
+    return POINTS_PER_LESSON + (event.score or 0) // 10
+
+class ProgressBuffer:
+    """Append-only event buffer; writers append, the flusher drains everything at once"""
+
+    def __init__(self):
+        self._events: List[ProgressEvent] = []
+        self._lock = threading.Lock()
+
+    def append(self, event: ProgressEvent) -> int:
+        with self._lock:
+            self._events.append(event)
+            return len(self._events)
+
+    def drain(self) -> List[ProgressEvent]:
+        with self._lock:
+            events, self._events = self._events, []
+            return events
+
+    def requeue(self, events: List[ProgressEvent]):
+        """Put a failed batch back in front of anything appended since it was drained"""
+        with self._lock:
+            self._events[:0] = events
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+async def apply_progress_events(db: AsyncSession, events: List[ProgressEvent]):
+    """Write a batch of events: upsert Progress per (user, lesson), then bump profiles.
+
+    Sets points_awarded on every event. The caller commits.
+    """
+    # Collapse the batch to one Progress change per (user, lesson)
+    changes: Dict[Tuple[int, int], dict] = {}
+    for event in events:
+        change = changes.setdefault(
+            (event.user_id, event.lesson_id),
+            {"completed": False, "score": None, "completed_at": None}
+        )
+        if event.completed:
+            change["completed"] = True
+            if event.score is not None:
+                change["score"] = max(event.score, change["score"] or 0)
+            change["completed_at"] = max(event.at, change["completed_at"] or event.at)
+
+    Progress = models.Progress
+    existing = {}
+    already_completed = set()
+    result = await db.execute(
+        select(Progress.id, Progress.user_id, Progress.lesson_id, Progress.score, Progress.completed)
+        .where(tuple_(Progress.user_id, Progress.lesson_id).in_(list(changes)))
+        .order_by(Progress.id)
+    )
+    for row in result:
+        existing.setdefault((row.user_id, row.lesson_id), row)
+        if row.completed:
+            already_completed.add((row.user_id, row.lesson_id))
+
+    # Only the earliest completion of a lesson not completed before earns points
+    first_completions: Dict[Tuple[int, int], ProgressEvent] = {}
+    for event in events:
+        event.points_awarded = 0
+        key = (event.user_id, event.lesson_id)
+        if event.completed and key not in already_completed:
+            first = first_completions.get(key)
+            if first is None or event.at < first.at:
+                first_completions[key] = event
+    for event in first_completions.values():
+        event.points_awarded = points_for(event)
+
+    updates, inserts = [], []
+    for (user_id, lesson_id), change in changes.items():
+        row = existing.get((user_id, lesson_id))
+        if row is None:
+            inserts.append({"user_id": user_id, "lesson_id": lesson_id, **change})
+        elif change["completed"]:
+            scores = [s for s in (row.score, change["score"]) if s is not None]
+            updates.append({
+                "id": row.id,
+                "completed": True,
+                "score": max(scores) if scores else None,
+                "completed_at": change["completed_at"]
+            })
+    if updates:
+        await db.execute(update(Progress), updates)
+    if inserts:
+        await db.execute(insert(Progress), inserts)
+
+    # Points ledger, one row per (user, language, day); leaderboard windows are rebuilt from it
+    earned: Dict[Tuple[int, int, date], dict] = {}
+    for event in first_completions.values():
+        entry = earned.setdefault(
+            (event.user_id, event.language_id, event.at.date()),
+            {"user_id": event.user_id, "language_id": event.language_id, "points": 0, "earned_at": event.at}
+        )
+        entry["points"] += event.points_awarded
+        entry["earned_at"] = max(entry["earned_at"], event.at)
+    if earned:
+        await db.execute(insert(models.PointsEntry), list(earned.values()))
+
+    # Points and streaks: one row per (user, day with completions), applied in day order
+    points: Dict[Tuple[int, date], int] = defaultdict(int)
+    for event in events:
+        if event.completed:
+            points[(event.user_id, event.at.date())] += event.points_awarded
+    if not points:
+        return
+
+    profiles = models.UserProfile.__table__
+    user_ids = {user_id for user_id, _ in points}
+    with_profile = set((await db.execute(
+        select(profiles.c.user_id).where(profiles.c.user_id.in_(user_ids))
+    )).scalars())
+    missing = sorted(user_ids - with_profile)
+    if missing:
+        await db.execute(insert(profiles), [
+            {"user_id": user_id, "level": 1, "points": 0, "streak_days": 0, "daily_goal_minutes": 30}
+            for user_id in missing
+        ])
+
+    day = bindparam("b_day", type_=Date)
+    await db.execute(
+        update(profiles)
+        .where(profiles.c.user_id == bindparam("b_user_id"))
+        .values(
+            points=func.coalesce(profiles.c.points, 0) + bindparam("b_points", type_=Integer),
+            streak_days=case(
+                (profiles.c.last_active_date >= day, func.coalesce(profiles.c.streak_days, 1)),
+                (profiles.c.last_active_date == bindparam("b_previous_day", type_=Date),
+                 func.coalesce(profiles.c.streak_days, 0) + 1),
+                else_=1
+            ),
+            last_active_date=case(
+                (profiles.c.last_active_date > day, profiles.c.last_active_date),
+                else_=day
+            )
+        ),
+        [
+            {"b_user_id": user_id, "b_points": delta, "b_day": day_, "b_previous_day": day_ - timedelta(days=1)}
+            for (user_id, day_), delta in sorted(points.items(), key=lambda item: item[0][1])
+        ]
+    )
+
+class ProgressWriter:
+    """Owns the buffer and the background task that flushes it.
+
+    Every committed batch is published to the event hub as lesson_started and
+    lesson_completed events.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], interval: float, batch_size: int):
+        self.buffer = ProgressBuffer()
+        self._session_factory = session_factory
+        self._interval = interval
+        self._batch_size = batch_size
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, event: ProgressEvent):
+        pending = self.buffer.append(event)
+        if pending >= self._batch_size and self._wake is not None:
+            self._wake.set()
+
+    async def start(self):
+        # Created here so they belong to the server's event loop
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered events in one transaction; returns how many were written"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            events = self.buffer.drain()
+            if not events:
+                return 0
+            if await self._write(events):
+                written, failed = events, []
+            elif len(events) == 1:
+                written, failed = [], events
+            else:
+                # Write the events one at a time, so a bad event only holds back itself
+                written, failed = [], []
+                for event in events:
+                    (written if await self._write([event]) else failed).append(event)
+
+            retry = []
+            for event in failed:
+                event.failed_flushes += 1
+                if event.failed_flushes >= MAX_FLUSH_ATTEMPTS:
+                    logger.error("Dropping progress event after %d failed flushes: %r", event.failed_flushes, event)
+                else:
+                    retry.append(event)
+            if retry:
+                self.buffer.requeue(retry)
+
+            if written:
+                logger.debug("Flushed %d progress events", len(written))
+                event_hub.publish(LESSON_STARTED, [event for event in written if not event.completed])
+                event_hub.publish(LESSON_COMPLETED, [event for event in written if event.completed])
+            return len(written)
+
+    async def _write(self, events: List[ProgressEvent]) -> bool:
+        """Write events in one transaction; False (and logged) if it failed"""
+        try:
+            async with self._session_factory() as db:
+                await apply_progress_events(db, events)
+                await db.commit()
+        except Exception:
+            logger.exception("Writing %d progress events failed", len(events))
+            return False
+        return True
+
+progress_writer = ProgressWriter(
+    AsyncSessionLocal,
+    interval=settings.progress_flush_interval_seconds,
+    batch_size=settings.progress_flush_batch_size
+)
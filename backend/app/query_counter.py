@@ -0,0 +1,41 @@
+import threading
+from typing import List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class QueryCounter:
+    """Record the SQL statements executed on one or more engines.
+
+    Pass async engines via `.sync_engine`. Used by tests/test_query_counts.py
+    to pin the number of statements each endpoint issues:
+
+        with QueryCounter(engine, async_engine.sync_engine) as counter:
+            client.get("/lessons/el")
+        assert counter.count == 2, counter.statements
+    """
+
+    def __init__(self, *engines: Engine):
+        self.engines = engines
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self):
+        with self._lock:
+            self.statements.clear()
+
+    def __enter__(self) -> "QueryCounter":
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
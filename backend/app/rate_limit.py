@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+from jose import JWTError
+from starlette.responses import JSONResponse
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Token-bucket rate limiting. Buckets live behind RateLimitStore so the
+# in-process store below can be swapped for a shared one (e.g. Redis running a
+# Lua script) without touching the middleware. A limited request is answered
+# with 429 and Retry-After straight away; nothing here ever sleeps.
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float      # tokens added per second
+    capacity: float  # bucket size, i.e. the allowed burst
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: Optional[float] = None) -> "Limit":
+        return cls(rate=requests / 60.0, capacity=burst or requests)
+
+Bucket = Tuple[str, Limit]
+
+class RateLimitStore(ABC):
+    @abstractmethod
+    async def consume_many(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Tuple[bool, float]:
+        """Take `cost` tokens from every bucket if all of them have enough, else from none.
+
+        Returns (allowed, seconds until allowed).
+        """
+
+    @abstractmethod
+    async def check(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        """Whether the bucket `key` has `cost` tokens, without taking them"""
+
+    async def consume(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take `cost` tokens from the bucket `key`; returns (allowed, seconds until allowed)"""
+        return await self.consume_many([(key, limit)], cost)
+
+class ShardedTokenBucketStore(RateLimitStore):
+    """In-process buckets spread over independently locked shards.
+
+    Each shard is an LRU bounded to `max_keys_per_shard`, so a flood of new
+    client addresses evicts idle buckets instead of growing without limit.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000, timer: Callable[[], float] = time.monotonic):
+        self._shards = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._max_keys = max_keys_per_shard
+        self._timer = timer
+
+    def _shard(self, key: str) -> int:
+        return zlib.crc32(key.encode()) % len(self._shards)
+
+    def consume_many_sync(self, buckets: Sequence[Bucket], cost: float = 1.0, take: bool = True) -> Tuple[bool, float]:
+        # Shard locks are always taken in index order, so concurrent callers cannot deadlock
+        indexes = sorted({self._shard(key) for key, _ in buckets})
+        for index in indexes:
+            self._locks[index].acquire()
+        try:
+            now = self._timer()
+            refilled = []
+            retry_after = 0.0
+            for key, limit in buckets:
+                tokens, updated_at = self._shards[self._shard(key)].get(key, (limit.capacity, now))
+                tokens = min(limit.capacity, tokens + (now - updated_at) * limit.rate)
+                if tokens < cost:
+                    retry_after = max(retry_after, (cost - tokens) / limit.rate)
+                refilled.append(tokens)
+            allowed = all(tokens >= cost for tokens in refilled)
+            for (key, _), tokens in zip(buckets, refilled):
+                shard = self._shards[self._shard(key)]
+                shard[key] = (tokens - cost if allowed and take else tokens, now)
+                shard.move_to_end(key)
+                if len(shard) > self._max_keys:
+                    shard.popitem(last=False)
+        finally:
+            for index in reversed(indexes):
+                self._locks[index].release()
+        return allowed, retry_after
+
+    def consume_sync(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        return self.consume_many_sync([(key, limit)], cost)
+
+    async def consume_many(self, buckets: Sequence[Bucket], cost: float = 1.0) -> Tuple[bool, float]:
+        return self.consume_many_sync(buckets, cost)
+
+    async def check(self, key: str, limit: Limit, cost: float = 1.0) -> Tuple[bool, float]:
+        return self.consume_many_sync([(key, limit)], cost, take=False)
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets in self._shards)
+
+def too_many_requests(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Rate limit exceeded, try again later"},
+        headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+    )
+
+def client_address(scope, trust_forwarded: bool = False) -> str:
+    """The request's client address, from X-Forwarded-For only behind a trusted proxy"""
+    if trust_forwarded:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-IP and per-user token buckets.
+
+    Every request spends a token from its client address's bucket; requests
+    carrying a valid bearer token also spend one from the user's bucket. A
+    request is only charged if every bucket it needs has a token.
+    Requests to exactly one of `auth_paths` use the stricter `auth_limit` per
+    address, since each attempt there costs a bcrypt round. `exempt_paths`
+    are prefixes that are never limited.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: RateLimitStore,
+        ip_limit: Limit,
+        user_limit: Limit,
+        auth_limit: Limit,
+        auth_paths: Sequence[str] = (),
+        exempt_paths: Sequence[str] = (),
+        trust_forwarded: bool = False,
+        token_subject: Optional[Callable[[str], Optional[str]]] = None
+    ):
+        self.app = app
+        self.store = store
+        self.ip_limit = ip_limit
+        self.user_limit = user_limit
+        self.auth_limit = auth_limit
+        self.auth_paths = frozenset(auth_paths)
+        self.exempt_paths = tuple(exempt_paths)
+        self.trust_forwarded = trust_forwarded
+        self.token_subject = token_subject
+
+    def bearer_subject(self, scope) -> Optional[str]:
+        if self.token_subject is None:
+            return None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return None
+                try:
+                    return self.token_subject(token)
+                except JWTError:
+                    # Invalid tokens are rejected by the endpoint; the IP bucket still applies
+                    return None
+        return None
+
+    def buckets(self, scope) -> List[Bucket]:
+        path = scope["path"]
+        address = client_address(scope, self.trust_forwarded)
+        if path in self.auth_paths:
+            buckets = [("auth-ip:" + address, self.auth_limit)]
+        else:
+            buckets = [("ip:" + address, self.ip_limit)]
+        subject = self.bearer_subject(scope)
+        if subject:
+            buckets.append(("user:" + subject, self.user_limit))
+        return buckets
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith(self.exempt_paths)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        buckets = self.buckets(scope)
+        allowed, retry_after = await self.store.consume_many(buckets)
+        if not allowed:
+            logger.debug("Rate limited %s on %s", [key for key, _ in buckets], scope["path"])
+            await too_many_requests(retry_after)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+rate_limit_store = ShardedTokenBucketStore(
+    shards=settings.rate_limit_shards,
+    max_keys_per_shard=settings.rate_limit_max_keys_per_shard
+)
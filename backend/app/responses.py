@@ -0,0 +1,171 @@
+import logging
+import zlib
+from typing import Callable, Optional, Sequence, Type
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import orjson
+except ImportError:  # optional; JSON is rendered with the standard library without it
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip is offered without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Response rendering and compression. Routers return plain data that FastAPI
+# renders with the app's default response class (orjson when installed), and
+# CompressionMiddleware compresses large bodies for clients that accept it.
+# Endpoints that build their own bodies (the cached lesson pages, lesson
+# detail) still go through the middleware.
+
+# Media types that are already compressed and pass through untouched
+INCOMPRESSIBLE_TYPES = ("application/gzip", "application/zstd", "application/zip", "image/", "audio/", "video/")
+
+def json_response_class(renderer: str = "orjson") -> Type[JSONResponse]:
+    """The response class the routers render JSON with"""
+    if renderer == "orjson":
+        if orjson is not None:
+            return ORJSONResponse
+        logger.warning("orjson is not installed, rendering JSON with the standard library")
+    elif renderer != "json":
+        raise ValueError(f"Unknown JSON renderer '{renderer}'")
+    return JSONResponse
+
+def accepted_encoding(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """The first of `encodings` (in order of preference) that an Accept-Encoding header allows"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in encodings:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class CompressionMiddleware:
+    """ASGI middleware compressing response bodies of at least `minimum_size` bytes.
+
+    Brotli is preferred when the brotli package is installed and the client
+    accepts it, gzip otherwise. Small bodies, where the framing costs more
+    than it saves, and responses that are already encoded pass through.
+    Streaming responses are compressed as they are sent. Strong ETags are
+    weakened, since the bytes now differ per encoding; If-None-Match uses
+    weak comparison, so revalidation keeps working.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressors = {"gzip": lambda: GzipCompressor(gzip_level)}
+        self.encodings = ("gzip",)
+        if brotli is not None:
+            self.compressors["br"] = lambda: BrotliCompressor(brotli_quality)
+            self.encodings = ("br", "gzip")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = accepted_encoding(value.decode("latin-1"), self.encodings)
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        sender = CompressingSender(send, encoding, self.compressors[encoding], self.minimum_size)
+        await self.app(scope, receive, sender)
+
+class CompressingSender:
+    """Wraps `send` for one response; the decision to compress waits for the first body chunk"""
+
+    def __init__(self, send, encoding: str, compressor: Callable, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.compressor_factory = compressor
+        self.minimum_size = minimum_size
+        self.start = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if "content-encoding" in headers or headers.get("content-type", "").startswith(INCOMPRESSIBLE_TYPES):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = self.compressor_factory()
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            data = self.compressor.compress(body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                data += self.compressor.finish()
+                headers["Content-Length"] = str(len(data))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
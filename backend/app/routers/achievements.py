@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from .. import crud, models, schemas
+from ..achievements import achievement_engine
+from ..database import get_async_db
+from ..security import get_current_active_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/achievements",
+    tags=["achievements"]
+)
+
+@router.get("/", response_model=List[schemas.AchievementInfo])
+async def list_achievements():
+    """All achievements that can be earned"""
+    return [
+        schemas.AchievementInfo(name=rule.name, description=rule.description, badge_image_url=rule.badge_image_url)
+        for rule in achievement_engine.rules
+    ]
+
+@router.get("/me", response_model=List[schemas.Achievement])
+async def get_my_achievements(
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Achievements the current user has earned"""
+    return await crud.get_user_achievements(db, current_user.id)
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import BaseModel
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from .. import crud, models, schemas
+from ..config import settings
+from ..database import get_async_db
+from ..rate_limit import Limit, client_address, rate_limit_store
+from ..security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    check_password,
+    check_unknown_user_password,
+    create_access_token,
+    get_current_active_user,
+    hash_password,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["auth"])
+
+login_limit = Limit.per_minute(settings.rate_limit_auth_per_minute, settings.rate_limit_auth_burst)
+
+class LoginRequest(BaseModel):
+    username: str
+    password: str
+
+async def authenticate_user(db: AsyncSession, username: str, password: str, address: str) -> Optional[models.User]:
+    # Failed attempts per (username, address): guessing one account is throttled
+    # without letting other addresses lock its owner out, and successful logins
+    # never spend from the bucket
+    login_key = "login:%s:%s" % (username, address)
+    if settings.rate_limit_enabled:
+        allowed, retry_after = await rate_limit_store.check(login_key, login_limit)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+            )
+    user = await crud.get_user_by_username(db, username)
+    if user is None:
+        await check_unknown_user_password(password)
+    elif await check_password(password, user.hashed_password):
+        return user
+    if settings.rate_limit_enabled:
+        await rate_limit_store.consume(login_key, login_limit)
+    return None
+
+def request_address(request: Request) -> str:
+    return client_address(request.scope, settings.rate_limit_trust_forwarded)
+
+def issue_token(user: models.User) -> schemas.Token:
+    access_token = create_access_token(
+        {"sub": user.username}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return schemas.Token(access_token=access_token, token_type="bearer")
+
+def invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect username or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+@router.post("/token", response_model=schemas.Token)
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """OAuth2 password flow (the tokenUrl of security.oauth2_scheme)"""
+    user = await authenticate_user(db, form_data.username, form_data.password, request_address(request))
+    if user is None:
+        raise invalid_credentials()
+    return issue_token(user)
+
+@router.post("/auth/login", response_model=schemas.Token)
+async def login(credentials: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Same as /token, for JSON clients"""
+    user = await authenticate_user(db, credentials.username, credentials.password, request_address(request))
+    if user is None:
+        raise invalid_credentials()
+    return issue_token(user)
+
+@router.post("/auth/register", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
+async def register(user_in: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create an account"""
+    result = await db.execute(
+        select(models.User.id).where(
+            or_(models.User.username == user_in.username, models.User.email == user_in.email)
+        )
+    )
+    if result.first() is not None:
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+
+    user = models.User(
+        username=user_in.username,
+        email=user_in.email,
+        hashed_password=await hash_password(user_in.password),
+        is_active=True
+    )
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent registration of the same name
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+    logger.info("Registered user %s", user.username)
+    return user
+
+@router.get("/auth/me", response_model=schemas.User)
+async def read_current_user(current_user: models.User = Depends(get_current_active_user)):
+    return current_user
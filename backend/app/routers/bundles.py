@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from .. import schemas
+from ..bundles import Bundle, BundleNotFound, COMPRESSIONS, offline_bundles
+from ..cache import etag_matches
+from ..database import get_db
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/bundles",
+    tags=["bundles"]
+)
+
+# Building a bundle reads the whole catalog and compresses it, so these
+# endpoints are plain functions that run in the threadpool with a sync session.
+# Bundles are immutable per version: the version is the ETag.
+
+def bundle_headers(version: str) -> dict:
+    return {
+        "ETag": '"%s"' % version,
+        "X-Bundle-Version": version,
+        "Access-Control-Expose-Headers": "ETag, X-Bundle-Version",
+    }
+
+def bundle_file(bundle: Bundle, filename: str) -> FileResponse:
+    extension = COMPRESSIONS[bundle.manifest["archive"]["compression"]][0]
+    return FileResponse(
+        bundle.path, media_type=bundle.media_type, filename=filename + extension,
+        headers=bundle_headers(bundle.version)
+    )
+
+def language_not_found(language_code: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
+
+@router.get("/{language_code}/manifest", response_model=schemas.BundleManifest)
+def get_bundle_manifest(language_code: str, db: Session = Depends(get_db)):
+    """Describe the current offline bundle, building it if the catalog changed"""
+    try:
+        return offline_bundles.latest(db, language_code).manifest
+    except KeyError:
+        raise language_not_found(language_code)
+
+@router.get("/{language_code}/delta")
+def get_bundle_delta(
+    language_code: str,
+    from_version: str = Query(..., alias="from"),
+    db: Session = Depends(get_db)
+):
+    """Download the changes since a previous bundle version; 204 if it is still current"""
+    try:
+        delta = offline_bundles.delta(db, language_code, from_version)
+    except KeyError:
+        raise language_not_found(language_code)
+    except BundleNotFound:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Bundle version '{from_version}' is not available, download the full bundle"
+        )
+    if delta is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=bundle_headers(from_version))
+    return bundle_file(delta, "%s-%s-%s" % (language_code, from_version, delta.version))
+
+@router.get("/{language_code}")
+def get_bundle(
+    language_code: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Download the current offline bundle of a language"""
+    try:
+        bundle = offline_bundles.latest(db, language_code)
+    except KeyError:
+        raise language_not_found(language_code)
+    if etag_matches(if_none_match, '"%s"' % bundle.version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=bundle_headers(bundle.version))
+    return bundle_file(bundle, "%s-%s" % (language_code, bundle.version))
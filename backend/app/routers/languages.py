@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from .. import models, schemas
-from ..database import get_db
+from .. import crud, schemas
+from ..database import get_async_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,13 +13,13 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[schemas.Language])
-def get_languages(db: Session = Depends(get_db)):
+async def get_languages(db: AsyncSession = Depends(get_async_db)):
     """Get all available languages"""
     try:
         logger.debug("Fetching all languages")
-        languages = db.query(models.Language).all()
-        logger.debug(f"Found {len(languages)} languages")
+        languages = await crud.list_languages(db)
+        logger.debug("Found %d languages", len(languages))
         return languages
     except Exception as e:
-        logger.error(f"Error fetching languages: {str(e)}")
+        logger.exception("Error fetching languages")
         raise HTTPException(status_code=500, detail=str(e))
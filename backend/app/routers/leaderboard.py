@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from .. import crud, models, schemas
+from ..database import get_async_db
+from ..leaderboard import Leaderboard, Standing, leaderboards
+from ..security import get_current_active_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["leaderboard"]
+)
+
+async def resolve_board(db: AsyncSession, language: Optional[str], window: str) -> Leaderboard:
+    language_id = None
+    if language:
+        found = await crud.get_language_by_code(db, language)
+        if not found:
+            raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+        language_id = found.id
+    return leaderboards.board(language_id, weekly=window == "weekly")
+
+async def to_entries(db: AsyncSession, standings: List[Standing]) -> List[schemas.LeaderboardEntry]:
+    usernames = await crud.get_usernames(db, [user_id for _, user_id, _ in standings]) if standings else {}
+    return [
+        schemas.LeaderboardEntry(rank=rank, user_id=user_id, username=usernames.get(user_id), points=points)
+        for rank, user_id, points in standings
+    ]
+
+@router.get("/", response_model=List[schemas.LeaderboardEntry])
+async def get_leaderboard(
+    language: Optional[str] = Query(None, description="Language code; all languages when omitted"),
+    window: str = Query("all", pattern="^(all|weekly)$"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Top users by points"""
+    board = await resolve_board(db, language, window)
+    return await to_entries(db, board.top(limit))
+
+@router.get("/me", response_model=schemas.LeaderboardStanding)
+async def get_my_standing(
+    language: Optional[str] = Query(None, description="Language code; all languages when omitted"),
+    window: str = Query("all", pattern="^(all|weekly)$"),
+    radius: int = Query(3, ge=0, le=25),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """The current user's rank and the users ranked just above and below"""
+    board = await resolve_board(db, language, window)
+    return schemas.LeaderboardStanding(
+        rank=board.rank(current_user.id),
+        points=board.points(current_user.id) or 0,
+        total=len(board),
+        neighbors=await to_entries(db, board.around(current_user.id, radius))
+    )
@@ -1,470 +1,224 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
-from typing import List
-import time
-from .. import models, schemas
-from ..database import get_db, add_memory_technique_lessons
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+from .. import crud, models, schemas
+from ..bundles import offline_bundles
+from ..cache import LRUCache, compute_etag, etag_matches
+from ..config import settings
+from ..database import AsyncSessionLocal, get_async_db, get_db, add_memory_technique_lessons
+from ..lesson_content import normalize_lesson_content
+from ..search import content_search, lesson_documents
+from ..seeding import language_row, seed_pack_lessons
+from ..transfer import CatalogImporter, ImportFormatError, export_ndjson, ndjson_records
 import logging
-import traceback
-import sys
-from sqlalchemy import text
-from datetime import datetime
-from ..data.vocabulary import popularGreekWords
-from ..data.alphabet import greek_alphabet
-from ..data.greetings import greek_greetings
-from ..data.mnemonics import mnemonics_data
 
-# Configure logging with more detail
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    stream=sys.stdout
-)
 logger = logging.getLogger(__name__)
 
-# Visual hints dictionary at module level
-visual_hints = {
-    "φεγγάρι": "Picture a bright, silvery moon hanging in the night sky, casting a gentle glow",
-    "αστέρι": "Imagine a twinkling star shining brightly against the dark sky",
-    "ουρανός": "Visualize a vast, blue sky stretching endlessly above you",
-    "θάλασσα": "Picture waves of crystal-clear blue water gently lapping at a sandy shore",
-    "βουνό": "Imagine a majestic mountain peak covered in snow, reaching up to the clouds",
-    "δέντρο": "Picture a tall, strong tree with branches swaying in the breeze",
-    "λουλούδι": "Visualize a colorful flower blooming in a sunny garden",
-    "ζώο": "Picture various animals moving and playing in their natural habitats",
-    "σκύλος": "Imagine a friendly dog wagging its tail and playing fetch",
-    "γάτα": "Picture a graceful cat stretching lazily in a patch of sunlight",
-    "πουλί": "Visualize a small bird soaring through the air with outstretched wings",
-    "ψάρι": "Imagine a colorful fish swimming smoothly through clear water",
-    "χρώμα": "Picture an artist's palette filled with vibrant colors",
-    "κόκκινο": "Visualize a bright red rose in full bloom",
-    "μπλε": "Picture the deep blue color of the Mediterranean Sea",
-    "πράσινο": "Imagine the fresh green color of spring leaves",
-    "κίτρινο": "Picture a bright yellow sun shining in a clear sky",
-    "άσπρο": "Visualize pure white snow covering a winter landscape",
-    "μαύρο": "Picture the deep black color of a starless night sky",
-    "γκρι": "Imagine soft grey clouds floating in the sky",
-    "καφέ": "Picture rich brown earth in a garden",
-    "ροζ": "Visualize delicate pink cherry blossoms in spring",
-    "μωβ": "Picture fields of purple lavender swaying in the breeze",
-    "πορτοκαλί": "Imagine a juicy orange fruit or a beautiful sunset"
-}
-
-# Detailed visualization text for each word in the Visual Association Learning lesson
-visual_visualization_text = {
-    "φεγγάρι": "Close your eyes and picture a full moon on a clear night. Notice how its silvery light bathes everything in a soft, ethereal glow. Feel the peaceful atmosphere it creates. This is 'fengari' - the moon that watches over the Greek islands.",
-    
-    "αστέρι": "Imagine looking up at the night sky and seeing one particularly bright star that catches your eye. Watch it twinkle and dance against the dark backdrop. This brilliant point of light is 'asteri' - a star that guides travelers.",
-    
-    "ουρανός": "Stand outside and look up at a vast expanse of brilliant blue sky. Feel its endless depth stretching to the horizon. This infinite canvas above you is 'ouranos' - the sky that holds all of nature's wonders.",
-    
-    "θάλασσα": "Picture yourself standing on a Greek beach, watching crystal-clear turquoise waters gently lap at the shore. Feel the salty breeze and hear the rhythmic waves. This is 'thalassa' - the Mediterranean sea that embraces Greece.",
-    
-    "βουνό": "Visualize a majestic mountain peak rising up through the clouds, its snow-capped summit gleaming in the sunlight. Feel its solid presence and timeless strength. This is 'vouno' - a mountain standing proud against the sky.",
-    
-    "δέντρο": "Imagine an ancient olive tree, its gnarled trunk telling stories of centuries past, its silver-green leaves dancing in the breeze. Feel its deep roots connecting to the earth. This is 'dentro' - a tree that provides shelter and sustenance.",
-    
-    "λουλούδι": "Picture a bright red poppy swaying gently in a spring breeze, its delicate petals catching the sunlight. Smell its subtle fragrance. This is 'louloudi' - a flower bringing color to the Greek landscape.",
-    
-    "ζώο": "Visualize a variety of animals - a playful dolphin leaping through waves, a mountain goat scaling steep cliffs, a soaring eagle. Feel their energy and freedom. These are 'zoo' - the animals that share our world.",
-    
-    "σκύλος": "Imagine a friendly dog bounding toward you, tail wagging with pure joy, eager to play and share affection. Feel its unconditional love. This is 'skilos' - a dog that becomes part of the family.",
-    
-    "γάτα": "Picture a graceful cat stretching lazily in a patch of warm sunlight, its contentment evident in its soft purring. Watch it move with elegant precision. This is 'gata' - a cat enjoying its peaceful moment.",
-    
-    "πουλί": "Visualize a small bird soaring through the air, its wings spread wide as it rides the wind currents. Hear its melodious song echoing through the trees. This is 'pouli' - a bird expressing the freedom of flight.",
-    
-    "ψάρι": "Imagine a colorful fish gliding effortlessly through clear blue waters, its scales shimmering like jewels in the sunlight. Watch its fluid movements. This is 'psari' - a fish in its underwater paradise.",
-    
-    "χρώμα": "Picture an artist's palette filled with vibrant pigments - deep blues, bright yellows, rich reds. See how they blend and dance together. These are 'hroma' - the colors that paint our world.",
-    
-    "κόκκινο": "Visualize the deepest, richest red you've ever seen - like a perfect rose in full bloom or the sun setting over the sea. Feel its warmth and passion. This is 'kokkino' - the color red in all its intensity.",
-    
-    "μπλε": "Imagine the perfect blue of the Mediterranean Sea on a sunny day, where the water meets the sky in an endless azure expanse. Feel its cool, refreshing presence. This is 'ble' - the color blue in its purest form.",
-    
-    "πράσινο": "Picture the fresh green of new spring leaves, bright and full of life, promising growth and renewal. Feel the vitality it represents. This is 'prasino' - the color green in nature's palette.",
-    
-    "κίτρινο": "Visualize a field of sunflowers turning their bright yellow faces to follow the sun across the sky. Feel their warmth and cheerfulness. This is 'kitrino' - the color yellow radiating joy.",
-    
-    "άσπρο": "Imagine freshly fallen snow covering everything in pure, pristine white, creating a peaceful blanket of silence. Feel its clean, crisp presence. This is 'aspro' - the color white in its most perfect form.",
-    
-    "μαύρο": "Picture a starless night sky, deep and mysterious, holding secrets in its velvety darkness. Feel its depth and power. This is 'mavro' - the color black in its most profound state.",
-    
-    "γκρι": "Visualize soft grey clouds drifting across the sky, neither dark nor light but perfectly balanced between the two. Feel their gentle, calming presence. This is 'gri' - the color grey in nature.",
-    
-    "καφέ": "Picture rich, fertile soil in a garden, ready to nurture new life, or the warm brown of coffee beans promising morning energy. This is 'kafe' - the color brown in its most natural state.",
-    
-    "ροζ": "Imagine delicate pink cherry blossoms floating on a spring breeze, their soft color bringing gentle beauty to the world. Feel their sweet, romantic presence. This is 'roz' - the color pink in its most charming form.",
-    
-    "μωβ": "Visualize a field of lavender swaying in the breeze, their purple flowers creating waves of color and releasing their soothing fragrance. This is 'mov' - the color purple in nature's garden.",
-    
-    "πορτοκαλί": "Picture a Mediterranean sunset painting the sky in brilliant orange, or a ripe orange fruit bursting with sweet juice. Feel its vibrant energy. This is 'portokali' - the color orange in its most vivid form."
-}
-
-class RateLimitError(Exception):
-    pass
-
-def handle_rate_limit():
-    """Handle rate limit by implementing exponential backoff"""
-    wait_time = 5  # Start with 5 seconds
-    max_retries = 3
-    
-    for attempt in range(max_retries):
-        try:
-            yield
-            break  # If successful, break out of the loop
-        except Exception as e:
-            if "rate limit exceeded" in str(e).lower():
-                if attempt < max_retries - 1:  # Don't sleep on the last attempt
-                    time.sleep(wait_time)
-                    wait_time *= 2  # Exponential backoff
-                else:
-                    raise RateLimitError("Rate limit exceeded. Please try again in a few minutes.")
-            else:
-                raise e
-
 router = APIRouter(
     prefix="/lessons",
     tags=["lessons"]
 )
 
-def generate_mnemonic_hint(word, translation, transliteration):
-    # Simple example of generating a mnemonic hint
-    # This can be replaced with a more sophisticated algorithm
-    return f"Associate {word} with {translation} by thinking of a {transliteration} sound"
+# Serialized lesson list pages (body, etag, next cursor) keyed by language code and
+# query. Lessons only change through the initialize/cleanup endpoints below, which
+# invalidate the affected language.
+lesson_catalog_cache = LRUCache(
+    maxsize=settings.lesson_cache_max_pages,
+    ttl=settings.lesson_cache_ttl_seconds
+)
+lesson_list_adapter = TypeAdapter(List[schemas.Lesson])
+lesson_summary_adapter = TypeAdapter(List[schemas.LessonSummary])
+
+def invalidate_lesson_catalog(language_code: str = None):
+    """Drop the cached lesson pages (and bundle freshness) for one language, or for all languages"""
+    if language_code is None:
+        lesson_catalog_cache.clear()
+    else:
+        lesson_catalog_cache.evict(lambda key: key[0] == language_code)
+    offline_bundles.invalidate(language_code)
 
-def generate_lesson_content(lesson_type: str, words: List[dict], level: str = "A1") -> dict:
-    """Generate lesson content based on the lesson type"""
-    logger.debug(f"Generating content for lesson type: {lesson_type} with {len(words)} words")
-    
-    content = {
-        "introduction": "",
-        "description": "",
-        "activities": [],
-        "words": [],  # Initialize empty words list
-        "example_situations": []
+def conditional_json_response(
+    body: bytes, etag: str, if_none_match: Optional[str], methods: str, extra_headers: Optional[dict] = None
+) -> Response:
+    """Return the JSON body, or an empty 304 if the client already holds this version"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": settings.lesson_cache_control,
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": methods,
+        "Access-Control-Allow-Headers": "Content-Type, Authorization, Accept",
+        "Access-Control-Expose-Headers": "ETag, Link, X-Next-Cursor",
+        **(extra_headers or {}),
     }
-    
-    if lesson_type == "alphabet":
-        content["introduction"] = "Learn the Greek alphabet and pronunciation"
-        content["description"] = "Master the building blocks of the Greek language by learning the alphabet and its sounds"
-        content["activities"] = [
-            "Listen and repeat each letter sound",
-            "Practice writing the letters",
-            "Match letters with their sounds",
-            "Identify letters in common words"
-        ]
-        content["letters"] = []  # Initialize empty letters list
-        
-        # Add alphabet data
-        for letter in greek_alphabet:
-            content["letters"].append({
-                "letter": letter["letter"],
-                "name": letter["name"],
-                "transliteration": letter["transliteration"],
-                "pronunciation": letter["pronunciation"],
-                "example": letter["example_word"]
-            })
-    
-    elif lesson_type == "greetings":
-        content["introduction"] = "Essential Greek greetings and farewells"
-        content["description"] = "Learn common Greek expressions for greeting people and saying goodbye in various situations"
-        content["activities"] = [
-            "Practice pronunciation of each greeting",
-            "Role-play greeting scenarios",
-            "Match greetings with appropriate situations",
-            "Complete dialogue exercises"
-        ]
-        content["example_situations"] = [
-            "Meeting someone for the first time",
-            "Greeting a friend in the morning",
-            "Saying goodbye after a meeting",
-            "Wishing someone a good night"
-        ]
-        content["words"] = []
-        
-        # Add greetings data
-        for word in greek_greetings:
-            content["words"].append({
-                "word": word["word"],
-                "translation": word["translation"],
-                "transliteration": word["transliteration"],
-                "context": word["context"],
-                "category": word["category"]
-            })
-    
-    elif lesson_type == "mnemonics":
-        content["introduction"] = "Mnemonic devices are memory aids that help you remember words through associations."
-        content["description"] = "Mnemonics are memory aids that help link new information to existing knowledge through vivid imagery, stories, or patterns. Each word below includes a mnemonic device to help you remember its meaning and pronunciation."
-        content["activities"] = [
-            "Create memorable associations",
-            "Practice visualization techniques",
-            "Connect words with similar sounds",
-            "Build memory palaces"
-        ]
-        content["example"] = 'For the Greek word "νερό" (water), you might imagine a "narrow" stream of water to remember the pronunciation.'
-        content["benefits"] = "Makes learning more engaging and can significantly improve recall by creating strong mental connections."
-        
-        # Create a lookup dictionary for mnemonics
-        mnemonics_lookup = {m["word"]: m["mnemonic"] for m in mnemonics_data}
-        
-        # Add words from the passed words list with mnemonics
-        content["words"] = []
-        for word in words:
-            # Use predefined mnemonic if available, otherwise generate a simple one
-            mnemonic = mnemonics_lookup.get(word["word"]) or f'Associate "{word["transliteration"]}" with {word["translation"]}'
-            
-            content["words"].append({
-                "word": word["word"],
-                "translation": word["translation"],
-                "transliteration": word["transliteration"],
-                "mnemonic": mnemonic
-            })
-    
-    elif lesson_type == "contextual":
-        content["introduction"] = "Learn Greek in Context"
-        content["description"] = "Master Greek vocabulary by learning words in their natural context"
-        content["activities"] = [
-            "Study words in context",
-            "Practice with real-life scenarios",
-            "Complete contextual exercises",
-            "Build sentences with new words"
-        ]
-        
-        # Ensure words are added to the content
-        content["words"] = [
-            {
-                "word": word["word"],
-                "translation": word["translation"],
-                "transliteration": word["transliteration"],
-                "context": word.get("context", "No context available")
-            }
-            for word in words
-        ]
-    
-    elif lesson_type == "visual":
-        content["introduction"] = "Visual Learning Techniques"
-        content["description"] = """Master Greek vocabulary through powerful visual associations. Each word is paired with a detailed 
-        visualization to help create strong mental connections. Take a moment to close your eyes and imagine each scene vividly."""
-        content["activities"] = [
-            "Create detailed mental images for each word",
-            "Practice visualization exercises",
-            "Draw simple sketches to reinforce connections",
-            "Build a visual memory palace"
-        ]
-        content["visualization_tips"] = [
-            "Take a few seconds to fully imagine each scene",
-            "Add colors, sounds, and movement to your mental images",
-            "Connect the images to personal experiences",
-            "Practice recalling the images regularly"
-        ]
-        
-        # Process words for visual learning
-        content["words"] = []  # Initialize words list
-        for word in words:
-            word_data = {
-                "word": word["word"],
-                "translation": word["translation"],
-                "transliteration": word["transliteration"],
-                "visual_hint": visual_hints.get(word["word"], ""),
-                "visualization_text": visual_visualization_text.get(word["word"], "")
-            }
-            content["words"].append(word_data)
-    
-    elif lesson_type == "spaced_repetition":
-        content["introduction"] = "Spaced Repetition Practice"
-        content["description"] = "Review and reinforce vocabulary using scientifically-proven spaced repetition techniques"
-        content["activities"] = [
-            "Review previously learned words",
-            "Practice recall with flashcards",
-            "Complete fill-in-the-blank exercises",
-            "Test your memory with timed challenges"
-        ]
-        
-        # Add words from the passed words list
-        content["words"] = []
-        for word in words:
-            content["words"].append({
-                "word": word["word"],
-                "translation": word["translation"],
-                "transliteration": word["transliteration"],
-                "difficulty": 1  # All common words start at difficulty 1
-            })
-        
-    logger.debug(f"Generated content with {len(content['words'])} words")
-    return content
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@router.get("/{language_code}", response_model=List[schemas.Lesson])
-def get_lessons_by_language(response: Response, language_code: str, db: Session = Depends(get_db)):
-    """Get all lessons for a specific language"""
-    try:
-        logger.debug("=== Starting get_lessons_by_language ===")
-        logger.debug(f"Parameters: language_code={language_code}")
-        
-        # Debug: Check if we can execute a simple query
-        try:
-            test_query = db.execute(text("SELECT 1"))
-            logger.debug("Database connection test successful")
-        except Exception as e:
-            logger.error(f"Database connection test failed: {str(e)}")
-            raise HTTPException(status_code=500, detail="Database connection error")
+# Part of every lesson detail ETag; bump it when the detail document's shape
+# changes, so clients holding an ETag from an older build refetch
+LESSON_DETAIL_VERSION = 1
 
-        # Debug: Check if languages table exists and has data
-        try:
-            languages_count = db.execute(text("SELECT COUNT(*) FROM languages")).scalar()
-            logger.debug(f"Number of languages in database: {languages_count}")
-        except Exception as e:
-            logger.error(f"Error checking languages table: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error accessing languages table")
-        
+def lesson_detail_etag(lesson_id: int, version) -> str:
+    """Validator built from crud.get_lesson_version, checked before the lesson is loaded"""
+    return compute_etag(repr((LESSON_DETAIL_VERSION, lesson_id, *version)).encode("utf-8"))
+
+def pagination_headers(request: Request, next_cursor: Optional[int]) -> dict:
+    if next_cursor is None:
+        return {}
+    next_url = request.url.include_query_params(after=next_cursor)
+    return {"Link": f'<{next_url}>; rel="next"', "X-Next-Cursor": str(next_cursor)}
+
+@router.get("/{language_code}", response_model=List[schemas.LessonSummary])
+async def get_lessons_by_language(
+    request: Request,
+    language_code: str,
+    after: Optional[int] = Query(None, ge=0, description="Cursor: id of the last lesson of the previous page"),
+    limit: int = Query(settings.lesson_page_size, ge=1, le=settings.lesson_page_size_max),
+    level: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    lesson_type: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List a language's lessons, one page at a time; fetch a lesson's content from its detail endpoint.
+
+    When there are more lessons, the response carries the cursor for the next
+    page in X-Next-Cursor and a Link rel="next" header.
+    """
+    cache_key = (language_code, after, limit, level, category, lesson_type)
+    cached = lesson_catalog_cache.get(cache_key)
+    if cached is not None:
+        body, etag, next_cursor = cached
+        return conditional_json_response(
+            body, etag, if_none_match, "GET, POST, PUT, DELETE, OPTIONS", pagination_headers(request, next_cursor)
+        )
+
+    try:
         # First verify the language exists
-        logger.debug("Querying database for language")
         try:
-            language = db.query(models.Language).filter(models.Language.code == language_code).first()
-            if language:
-                logger.debug(f"Found language: ID={language.id}, name={language.name}")
-            else:
-                logger.debug(f"No language found with code: {language_code}")
+            language = await crud.get_language_by_code(db, language_code)
         except Exception as e:
-            logger.error(f"Error querying language: {str(e)}")
+            logger.error("Error querying language: %s", e)
             raise HTTPException(status_code=500, detail="Error querying language")
         
         if not language:
-            logger.error(f"Language not found: {language_code}")
+            logger.info("Language not found: %s", language_code)
             raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
         
-        # Get all lessons for this language
-        logger.debug(f"Querying lessons for language_id: {language.id}")
+        # One row past the page tells whether there is a next page
         try:
-            lessons = db.query(models.Lesson).filter(models.Lesson.language_id == language.id).all()
-            logger.debug(f"Found {len(lessons)} lessons")
-            
-            # Debug: Print each lesson's details
-            for lesson in lessons:
-                logger.debug(f"Lesson ID: {lesson.id}")
-                logger.debug(f"Title: {lesson.title}")
-                logger.debug(f"Level: {lesson.level}")
-                logger.debug(f"Category: {lesson.category}")
+            lessons = await crud.list_lesson_summaries(
+                db, language.id, limit + 1, after=after, level=level, category=category, lesson_type=lesson_type
+            )
         except Exception as e:
-            logger.error(f"Error querying lessons: {str(e)}")
+            logger.error("Error querying lessons: %s", e)
             raise HTTPException(status_code=500, detail="Error querying lessons")
+        next_cursor = lessons[limit - 1].id if len(lessons) > limit else None
+        lessons = lessons[:limit]
+        logger.debug("Loaded %d lessons for language %s", len(lessons), language_code)
         
-        # Add CORS headers to the response
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept"
-        
-        logger.debug("=== Completed get_lessons_by_language successfully ===")
-        return lessons
-    except HTTPException as he:
-        logger.error(f"HTTP Exception in get_lessons_by_language: {str(he)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        # Serialize once and keep the bytes for subsequent requests
+        body = lesson_summary_adapter.dump_json(
+            lesson_summary_adapter.validate_python(lessons, from_attributes=True)
+        )
+        etag = compute_etag(body)
+        lesson_catalog_cache.set(cache_key, (body, etag, next_cursor))
+        return conditional_json_response(
+            body, etag, if_none_match, "GET, POST, PUT, DELETE, OPTIONS", pagination_headers(request, next_cursor)
+        )
+    except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_lessons_by_language: {str(e)}")
-        logger.error(f"Error type: {type(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Unexpected error in get_lessons_by_language")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.get("/{language_code}/export")
+async def export_lessons(language_code: str, db: AsyncSession = Depends(get_async_db)):
+    """Stream the language's lessons and phrases as NDJSON (see app/transfer.py for the format)"""
+    language = await crud.get_language_by_code(db, language_code)
+    if not language:
+        raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
+    return StreamingResponse(
+        export_ndjson(AsyncSessionLocal, language, settings.catalog_transfer_batch_size),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="lessons-{language.code}.ndjson"'}
+    )
+
+@router.post("/{language_code}/import", response_model=schemas.CatalogImportResult)
+async def import_lessons(
+    language_code: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Upsert lessons and phrases from an NDJSON request body, as written by the export.
+
+    The body is parsed as it arrives and written in batches within one
+    transaction, so a malformed line rolls the whole import back.
+    """
+    language = await crud.get_language_by_code(db, language_code)
+    if not language:
+        raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
+
+    importer = CatalogImporter(db, language, settings.catalog_transfer_batch_size)
+    try:
+        async for line_number, record in ndjson_records(request.stream(), settings.catalog_import_max_line_bytes):
+            await importer.add(line_number, record)
+        counts = await importer.finish()
+        await db.commit()
+    except ImportFormatError as e:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception:
+        await db.rollback()
+        logger.exception("Error importing lessons for %s", language_code)
+        raise HTTPException(status_code=500, detail="Error importing lessons")
+
+    invalidate_lesson_catalog(language_code)
+    # Imports can touch any number of rows; re-read the index rather than tracking them
+    background_tasks.add_task(content_search.rebuild)
+    logger.info("Imported lessons for %s: %s", language_code, counts)
+    return schemas.CatalogImportResult(**vars(counts))
+
 @router.get("/{language_code}/{lesson_id}", response_model=schemas.LessonDetail)
-def get_lesson_detail(response: Response, language_code: str, lesson_id: int, db: Session = Depends(get_db)):
+async def get_lesson_detail(
+    language_code: str,
+    lesson_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get detailed information for a specific lesson"""
     try:
-        logger.debug("=== Starting get_lesson_detail ===")
-        logger.debug(f"Parameters: language_code={language_code}, lesson_id={lesson_id}")
-        
-        # First verify the language exists
-        language = db.query(models.Language).filter(models.Language.code == language_code).first()
-        if not language:
-            raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
-        
-        # Get the specific lesson with phrases
-        lesson = db.query(models.Lesson).filter(
-            models.Lesson.language_id == language.id,
-            models.Lesson.id == lesson_id
-        ).first()
+        # Revalidation is answered from one aggregate query, before the lesson
+        # and its phrases are loaded or serialized
+        version = await crud.get_lesson_version(db, language_code, lesson_id)
+        if version is None:
+            if not await crud.get_language_by_code(db, language_code):
+                raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
+            raise HTTPException(status_code=404, detail=f"Lesson with ID {lesson_id} not found")
+        etag = lesson_detail_etag(lesson_id, version)
+        if etag_matches(if_none_match, etag):
+            return conditional_json_response(b"", etag, if_none_match, "GET, POST, OPTIONS")
+
+        # Get the specific lesson with phrases (joined eager load, reused below)
+        lesson = await crud.get_lesson(db, version.language_id, lesson_id)
         
         if not lesson:
             raise HTTPException(status_code=404, detail=f"Lesson with ID {lesson_id} not found")
         
-        logger.debug(f"Found lesson: {lesson.title}")
-        logger.debug(f"Lesson content type: {type(lesson.content)}")
-        logger.debug(f"Lesson content: {lesson.content}")
-        
-        # Ensure content has the required structure
-        content = lesson.content
-        if isinstance(content, str):
-            try:
-                import json
-                content = json.loads(content)
-            except json.JSONDecodeError:
-                logger.error("Failed to parse lesson content as JSON")
-                content = {
-                    "introduction": "",
-                    "description": "",
-                    "activities": [],
-                    "words": [],
-                    "example_situations": []
-                }
-        
-        # Ensure activities is a list
-        if "activities" not in content or not isinstance(content["activities"], list):
-            content["activities"] = []
-            
-        # For mnemonics lesson, fetch words from phrases table
-        if lesson.lesson_type == "mnemonics":
-            logger.debug("Found mnemonics lesson")
-            phrases = db.query(models.Phrase).filter(
-                models.Phrase.lesson_id == lesson.id
-            ).all()
-            
-            # Convert phrases to practice_words format
-            content["practice_words"] = [
-                {
-                    "word": phrase.text,
-                    "translation": phrase.translation,
-                    "transliteration": phrase.transliteration,
-                    "mnemonic": phrase.extra_data.get("mnemonic", "") if phrase.extra_data else ""
-                }
-                for phrase in phrases
-            ]
-            logger.debug(f"Found {len(content['practice_words'])} practice words")
-            logger.debug(f"Practice words: {content['practice_words']}")
-        else:
-            # Convert practice_words to words if needed
-            if "practice_words" in content and not content.get("words"):
-                content["words"] = content["practice_words"]
-                
-            # Ensure words is a list and preserve mnemonic/context fields
-            if "words" not in content or not isinstance(content["words"], list):
-                if isinstance(content.get("words"), str) and content["words"]:
-                    content["words"] = [
-                        {"word": w.split(":")[0], "explanation": w.split(":")[1] if ":" in w else ""}
-                        for w in content["words"].split(";")
-                        if w.strip()
-                    ]
-                else:
-                    content["words"] = []
-            else:
-                # Ensure each word has the required fields
-                processed_words = []
-                for word in content["words"]:
-                    if isinstance(word, dict):
-                        processed_word = {
-                            "word": word.get("word", ""),
-                            "translation": word.get("translation", ""),
-                            "transliteration": word.get("transliteration", ""),
-                        }
-                        if "mnemonic" in word:
-                            processed_word["mnemonic"] = word["mnemonic"]
-                        if "context" in word:
-                            processed_word["context"] = word["context"]
-                        processed_words.append(processed_word)
-                    else:
-                        processed_words.append({"word": str(word), "translation": "", "transliteration": ""})
-                content["words"] = processed_words
+        if settings.log_payloads and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Lesson %d content: %s", lesson.id, lesson.content)
         
-        logger.debug(f"Processed content: {content}")
+        # Content is normalized when the lesson is written; only rows written before
+        # that existed still need to be compiled here
+        content = lesson.compiled_content
+        if content is None:
+            logger.debug("Lesson %d has no compiled content, normalizing on read", lesson.id)
+            content = normalize_lesson_content(lesson.content, lesson.lesson_type, lesson.phrases)
         
         # Return the lesson detail with the content from the database
         lesson_detail = schemas.LessonDetail(
@@ -479,348 +233,95 @@ def get_lesson_detail(response: Response, language_code: str, lesson_id: int, db
             phrases=lesson.phrases  # Include phrases in response
         )
         
-        # Add CORS headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        body = lesson_detail.model_dump_json().encode("utf-8")
+        return conditional_json_response(body, etag, None, "GET, POST, OPTIONS")
         
-        return lesson_detail
-        
-    except HTTPException as he:
-        raise he
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_lesson_detail: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Unexpected error in get_lesson_detail")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{language_code}/initialize", response_model=List[schemas.Lesson])
-def initialize_lessons(response: Response, language_code: str, db: Session = Depends(get_db)):
+def initialize_lessons(language_code: str, db: Session = Depends(get_db)):
     """Initialize lessons for a language"""
     try:
-        logger.debug("=== Starting initialize_lessons ===")
-        logger.debug(f"Parameters: language_code={language_code}")
-        
         # Verify the language exists
         language = db.query(models.Language).filter(models.Language.code == language_code).first()
         if not language:
             raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
         
-        # Define lesson types and their configurations
-        lesson_configs = [
-            {
-                "title": "Greek Alphabet",
-                "description": "Learn the Greek alphabet and pronunciation",
-                "level": "A1",
-                "category": "Fundamentals",
-                "lesson_type": "alphabet"
-            },
-            {
-                "title": "Basic Greetings",
-                "description": "Essential Greek greetings and farewells",
-                "level": "A1",
-                "category": "Conversation",
-                "lesson_type": "greetings"
-            },
-            {
-                "title": "Spaced Repetition Practice",
-                "description": "Review and reinforce vocabulary using scientifically-proven spaced repetition techniques",
-                "level": "A1",
-                "category": "Memory Techniques",
-                "lesson_type": "spaced_repetition"
-            },
-            {
-                "title": "Mnemonic Devices for Greek",
-                "description": "Learn to create memorable associations for Greek vocabulary using mnemonic devices",
-                "level": "A1",
-                "category": "Memory Techniques",
-                "lesson_type": "mnemonics"
-            },
-            {
-                "title": "Contextual Learning",
-                "description": "Master Greek vocabulary by learning words in real-life situations",
-                "level": "A1",
-                "category": "Vocabulary",
-                "lesson_type": "contextual"
-            },
-            {
-                "title": "Visual Association Learning",
-                "description": "Master Greek vocabulary through powerful visual associations and memory techniques",
-                "level": "A1",
-                "category": "Memory Techniques",
-                "lesson_type": "visual",
-                "visualization_description": "In this lesson, you will learn Greek vocabulary by associating words with vivid and memorable visual images. Each word is paired with a descriptive hint to help you create a mental picture, enhancing your ability to remember and recall the word's meaning and pronunciation."
+        # The language's content pack lists its lessons; existing ones are kept and
+        # missing ones are inserted in a single statement
+        lessons = seed_pack_lessons(db, language.id, language_code)
+        # Serialize before committing so the RETURNING rows are not expired and reloaded
+        body = lesson_list_adapter.dump_json(lesson_list_adapter.validate_python(lessons, from_attributes=True))
+        documents = [document for lesson in lessons for document in lesson_documents(lesson)]
+        db.commit()
+        invalidate_lesson_catalog(language_code)
+        content_search.add(documents)
+        
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+                "Access-Control-Allow-Headers": "Content-Type, Authorization, Accept",
             }
-        ]
-        
-        # Create lessons
-        created_lessons = []
-        for config in lesson_configs:
-            # Check if lesson already exists
-            existing_lesson = db.query(models.Lesson).filter(
-                models.Lesson.language_id == language.id,
-                models.Lesson.title == config["title"]
-            ).first()
-            
-            if not existing_lesson:
-                # Select words based on lesson type
-                if config["lesson_type"] == "alphabet":
-                    words = greek_alphabet
-                elif config["lesson_type"] == "greetings":
-                    words = [w for w in popularGreekWords[25:50] if w["word"] in [
-                        "γεια", "καλημέρα", "καληνύχτα", "ευχαριστώ", "παρακαλώ", "συγγνώμη"
-                    ]]
-                elif config["lesson_type"] == "spaced_repetition":
-                    words = popularGreekWords[:25]
-                elif config["lesson_type"] == "mnemonics":
-                    words = popularGreekWords[25:50]
-                    logger.debug(f"Mnemonic words selected: {words}")  # Log selected words
-                elif config["lesson_type"] == "contextual":
-                    words = popularGreekWords[50:75]
-                elif config["lesson_type"] == "visual":
-                    # Create visual lesson words with their hints
-                    visual_words = []
-                    for word in popularGreekWords[75:100]:
-                        visual_word = word.copy()  # Create a copy of the word dictionary
-                        if visual_word["word"] in visual_hints:
-                            visual_word["visual_hint"] = visual_hints[visual_word["word"]]
-                        visual_words.append(visual_word)
-                    words = visual_words
-                else:
-                    words = []
-                
-                # Create new lesson
-                lesson = models.Lesson(
-                    title=config["title"],
-                    description=config["description"],
-                    level=config["level"],
-                    category=config["category"],
-                    lesson_type=config["lesson_type"],
-                    language_id=language.id,
-                    content=generate_lesson_content(config["lesson_type"], words, config["level"])
-                )
-                db.add(lesson)
-                db.commit()
-                db.refresh(lesson)
-                created_lessons.append(lesson)
-                logger.debug(f"Created lesson: {lesson.title} with {len(words)} words")
-            else:
-                logger.debug(f"Lesson already exists: {config['title']}")
-                created_lessons.append(existing_lesson)
-        
-        # Add CORS headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept"
-        
-        logger.debug("=== Completed initialize_lessons successfully ===")
-        return created_lessons
+        )
         
     except HTTPException as he:
-        logger.error(f"HTTP Exception in initialize_lessons: {str(he)}")
+        logger.info("HTTP Exception in initialize_lessons: %s", he)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in initialize_lessons: {str(e)}")
+        db.rollback()
+        logger.exception("Unexpected error in initialize_lessons")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/lessons/initialize-greek")
-def initialize_greek_lessons(response: Response, db: Session = Depends(get_db)):
-    """Initialize Greek language lessons with rate limit handling"""
-    try:
-        with handle_rate_limit():
-            # Check if lessons already exist
-            existing_lessons = db.query(models.Lesson).filter(
-                models.Lesson.language_code == "el"
-            ).count()
-            
-            if existing_lessons > 0:
-                return {"message": "Greek lessons already initialized"}
-            
-            # Initialize lessons with rate limit handling
-            lessons = []
-            
-            # Add each lesson type with rate limit handling
-            lesson_types = ["alphabet", "greetings", "visual", "mnemonics"]
-            
-            for lesson_type in lesson_types:
-                with handle_rate_limit():
-                    lesson_content = generate_lesson_content(lesson_type, [], "A1")
-                    lesson = models.Lesson(
-                        title=f"Greek {lesson_type.capitalize()} Lesson",
-                        description=f"Learn Greek through {lesson_type}",
-                        language_code="el",
-                        lesson_type=lesson_type,
-                        level="A1",
-                        content=lesson_content
-                    )
-                    lessons.append(lesson)
-            
-            # Add all lessons to database
-            db.add_all(lessons)
-            db.commit()
-            
-            return {"message": "Greek lessons initialized successfully"}
-            
-    except RateLimitError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"Error initializing Greek lessons: {str(e)}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error initializing lessons: {str(e)}"
-        )
-
 @router.post("/initialize-greek", response_model=List[schemas.Lesson])
-def initialize_greek_lessons(response: Response, db: Session = Depends(get_db)):
+def initialize_greek_lessons(db: Session = Depends(get_db)):
     """Initialize Greek language and lessons"""
     try:
-        logger.debug("=== Starting initialize_greek_lessons ===")
-        
         # First check if Greek language exists
         greek = db.query(models.Language).filter(models.Language.code == "el").first()
         if not greek:
             # Create Greek language
-            greek = models.Language(
-                code="el",
-                name="Greek",
-                native_name="Ελληνικά",
-                flag="🇬🇷",
-                rtl=False
-            )
+            greek = models.Language(**language_row("el"))
             db.add(greek)
-            db.commit()
-            db.refresh(greek)
+            db.flush()
             logger.debug("Created Greek language entry")
             
-        # Clean up existing lessons
-        existing_lessons = db.query(models.Lesson).filter(models.Lesson.language_id == greek.id).all()
-        for lesson in existing_lessons:
-            db.delete(lesson)
+        # Replace existing lessons; the deletes and the bulk insert share one transaction
+        greek_lesson_ids = select(models.Lesson.id).where(models.Lesson.language_id == greek.id)
+        db.execute(delete(models.Phrase).where(models.Phrase.lesson_id.in_(greek_lesson_ids)))
+        db.execute(delete(models.Lesson).where(models.Lesson.language_id == greek.id))
+        
+        lessons = seed_pack_lessons(db, greek.id, greek.code)
+        body = lesson_list_adapter.dump_json(lesson_list_adapter.validate_python(lessons, from_attributes=True))
+        documents = [document for lesson in lessons for document in lesson_documents(lesson)]
         db.commit()
-        logger.debug("Cleaned up existing lessons")
-        
-        # Define lesson types and their configurations
-        lesson_configs = [
-            {
-                "title": "Greek Alphabet",
-                "description": "Learn the Greek alphabet and pronunciation",
-                "level": "A1",
-                "category": "Fundamentals",
-                "lesson_type": "alphabet"
-            },
-            {
-                "title": "Basic Greetings",
-                "description": "Learn essential Greek greetings and farewells, from formal situations to casual conversations",
-                "level": "A1",
-                "category": "Conversation",
-                "lesson_type": "greetings"
-            },
-            {
-                "title": "Spaced Repetition Practice",
-                "description": "Review and reinforce vocabulary using scientifically-proven spaced repetition techniques",
-                "level": "A1",
-                "category": "Memory Techniques",
-                "lesson_type": "spaced_repetition"
-            },
-            {
-                "title": "Mnemonic Devices for Greek",
-                "description": "Learn to create memorable associations for Greek vocabulary using mnemonic devices",
-                "level": "A1",
-                "category": "Memory Techniques",
-                "lesson_type": "mnemonics"
-            },
-            {
-                "title": "Contextual Learning",
-                "description": "Master Greek vocabulary by learning words in real-life situations",
-                "level": "A1",
-                "category": "Vocabulary",
-                "lesson_type": "contextual"
-            },
-            {
-                "title": "Visual Association Learning",
-                "description": "Master Greek vocabulary through powerful visual associations and memory techniques",
-                "level": "A1",
-                "category": "Memory Techniques",
-                "lesson_type": "visual",
-                "visualization_description": "In this lesson, you will learn Greek vocabulary by associating words with vivid and memorable visual images. Each word is paired with a descriptive hint to help you create a mental picture, enhancing your ability to remember and recall the word's meaning and pronunciation."
+        invalidate_lesson_catalog(greek.code)
+        content_search.remove_language_lessons(greek.id)
+        content_search.add(documents)
+        
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+                "Access-Control-Allow-Headers": "Content-Type",
             }
-        ]
-        
-        # Create lessons
-        created_lessons = []
-        for config in lesson_configs:
-            # Check if lesson already exists
-            existing_lesson = db.query(models.Lesson).filter(
-                models.Lesson.language_id == greek.id,
-                models.Lesson.title == config["title"]
-            ).first()
-            
-            if not existing_lesson:
-                # Select words based on lesson type
-                if config["lesson_type"] == "alphabet":
-                    words = greek_alphabet
-                elif config["lesson_type"] == "greetings":
-                    words = greek_greetings
-                elif config["lesson_type"] == "spaced_repetition":
-                    words = popularGreekWords[:25]
-                elif config["lesson_type"] == "mnemonics":
-                    words = popularGreekWords[25:50]
-                    logger.debug(f"Mnemonic words selected: {words}")  # Log selected words
-                elif config["lesson_type"] == "contextual":
-                    words = popularGreekWords[50:75]
-                elif config["lesson_type"] == "visual":
-                    # Create visual lesson words with their hints
-                    visual_words = []
-                    for word in popularGreekWords[75:100]:
-                        visual_word = word.copy()  # Create a copy of the word dictionary
-                        if visual_word["word"] in visual_hints:
-                            visual_word["visual_hint"] = visual_hints[visual_word["word"]]
-                        visual_words.append(visual_word)
-                    words = visual_words
-                else:
-                    words = []
-                
-                # Generate content for the lesson
-                content = generate_lesson_content(config["lesson_type"], words, config["level"])
-                logger.debug(f"Generated content for {config['title']}: {content}")
-                
-                # Create new lesson
-                lesson = models.Lesson(
-                    title=config["title"],
-                    description=config["description"],
-                    level=config["level"],
-                    category=config["category"],
-                    lesson_type=config["lesson_type"],
-                    content=content,  # Use the generated content from generate_lesson_content
-                    language_id=greek.id
-                )
-                db.add(lesson)
-                created_lessons.append(lesson)
-                logger.debug(f"Created lesson: {lesson.title}")
-        
-        if created_lessons:
-            db.commit()
-            for lesson in created_lessons:
-                db.refresh(lesson)
-        
-        # Add CORS headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-        
-        # Return all lessons for the language
-        all_lessons = db.query(models.Lesson).filter(models.Lesson.language_id == greek.id).all()
-        return all_lessons
+        )
         
     except Exception as e:
-        logger.error(f"Error in initialize_greek_lessons: {str(e)}")
+        db.rollback()
+        logger.exception("Error in initialize_greek_lessons")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/cleanup-duplicates", response_model=List[schemas.Lesson])
-def cleanup_duplicate_lessons(response: Response, db: Session = Depends(get_db)):
+def cleanup_duplicate_lessons(db: Session = Depends(get_db)):
     """Remove duplicate lessons while keeping only the specified ones with their content"""
     try:
         # Get Greek language
@@ -839,10 +340,14 @@ def cleanup_duplicate_lessons(response: Response, db: Session = Depends(get_db))
         }
 
         # Get all lessons for Greek
-        all_lessons = db.query(models.Lesson).filter(models.Lesson.language_id == greek.id).all()
+        # Phrases are loaded up front so the delete cascade doesn't load them per lesson
+        all_lessons = db.query(models.Lesson).filter(
+            models.Lesson.language_id == greek.id
+        ).options(selectinload(models.Lesson.phrases)).all()
         
         # Keep track of which lessons we want to keep
         kept_lessons = []
+        deleted_ids = []
         seen_titles = set()
 
         # First pass: find lessons with exact titles and keep them
@@ -850,22 +355,29 @@ def cleanup_duplicate_lessons(response: Response, db: Session = Depends(get_db))
             if lesson.title in lessons_to_keep and lesson.title not in seen_titles:
                 kept_lessons.append(lesson)
                 seen_titles.add(lesson.title)
-                logger.debug(f"Keeping lesson: {lesson.title}")
+                logger.debug("Keeping lesson: %s", lesson.title)
             else:
                 # Delete lesson if it's not in our keep list
-                logger.debug(f"Deleting lesson: {lesson.title}")
+                logger.debug("Deleting lesson: %s", lesson.title)
+                deleted_ids.append(lesson.id)
                 db.delete(lesson)
 
+        # Serialize the lessons we kept before the commit expires them
+        body = lesson_list_adapter.dump_json(lesson_list_adapter.validate_python(kept_lessons, from_attributes=True))
         db.commit()
+        invalidate_lesson_catalog("el")
+        content_search.remove_lessons(deleted_ids)
 
-        # Add CORS headers
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "DELETE, OPTIONS"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-
-        # Return the lessons we kept
-        return kept_lessons
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={
+                "Access-Control-Allow-Origin": "*",
+                "Access-Control-Allow-Methods": "DELETE, OPTIONS",
+                "Access-Control-Allow-Headers": "Content-Type",
+            }
+        )
 
     except Exception as e:
-        logger.error(f"Error in cleanup_duplicate_lessons: {str(e)}")
+        logger.exception("Error in cleanup_duplicate_lessons")
         raise HTTPException(status_code=500, detail=str(e))
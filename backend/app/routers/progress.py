@@ -0,0 +1,61 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from .. import crud, models, schemas
+from ..database import get_async_db
+from ..progress import ProgressEvent, points_for, progress_writer
+from ..security import get_current_active_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/lessons",
+    tags=["progress"]
+)
+
+@router.post("/{lesson_id}/start", response_model=schemas.Lesson)
+async def start_lesson(
+    lesson_id: int,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mark a lesson as started; the progress row is written by the next buffer flush"""
+    lesson = await crud.get_lesson_by_id(db, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail=f"Lesson with ID {lesson_id} not found")
+    progress_writer.record(ProgressEvent(
+        user_id=current_user.id, lesson_id=lesson_id, language_id=lesson.language_id, completed=False, score=None, at=datetime.utcnow()
+    ))
+    return lesson
+
+@router.post("/{lesson_id}/complete", response_model=schemas.LessonCompletionResult)
+async def complete_lesson(
+    lesson_id: int,
+    completion: Optional[schemas.LessonCompletion] = None,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Record a lesson completion; progress, points and streak are written in the next batch.
+
+    Points are only awarded for the first completion of a lesson.
+    """
+    lesson = await crud.get_lesson_by_id(db, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail=f"Lesson with ID {lesson_id} not found")
+    event = ProgressEvent(
+        user_id=current_user.id,
+        lesson_id=lesson_id,
+        language_id=lesson.language_id,
+        completed=True,
+        score=completion.score if completion else None,
+        at=datetime.utcnow()
+    )
+    progress_writer.record(event)
+    # A completion still in the buffer is not seen here; the flush awards its points only once regardless
+    completed_before = await crud.has_completed_lesson(db, current_user.id, lesson_id)
+    return schemas.LessonCompletionResult(
+        lesson_id=lesson_id, completed=True, score=event.score,
+        points_awarded=0 if completed_before else points_for(event)
+    )
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import numpy as np
+from .. import crud, models, schemas
+from ..database import get_async_db
+from ..security import get_current_active_user
+from ..events import REVIEWS_RECORDED, event_hub
+from ..srs import ReviewEvent, schedule_reviews
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/reviews",
+    tags=["reviews"]
+)
+
+MAX_REVIEWS_PER_REQUEST = 500
+
+@router.get("/{language_code}/due", response_model=List[schemas.VocabularyItem])
+async def get_due_reviews(
+    language_code: str,
+    limit: int = Query(20, ge=1, le=200),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the user's next cards due for review, most overdue first"""
+    language = await crud.get_language_by_code(db, language_code)
+    if not language:
+        raise HTTPException(status_code=404, detail=f"Language '{language_code}' not found")
+    return await crud.get_due_items(db, current_user.id, language.id, datetime.utcnow(), limit)
+
+def naive_utc(value: datetime) -> datetime:
+    """Clients may send any UTC offset; review times are stored as naive UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+async def record_reviews(
+    db: AsyncSession, user_id: int, reviews: List[schemas.ReviewSubmission]
+) -> List[schemas.ReviewResult]:
+    """Reschedule every reviewed card with vectorized SM-2 and persist them in one bulk UPDATE.
+
+    Reviews of the same card are applied in submission order: the batch is
+    split into rounds where round k holds the k-th review of each card, and
+    each round is one schedule_reviews call.
+    """
+    if len(reviews) > MAX_REVIEWS_PER_REQUEST:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_REVIEWS_PER_REQUEST} reviews per request")
+    if not reviews:
+        return []
+
+    VocabularyItem = models.VocabularyItem
+    result = await db.execute(
+        select(
+            VocabularyItem.id, VocabularyItem.ease_factor, VocabularyItem.interval_days,
+            VocabularyItem.repetitions, VocabularyItem.lapses
+        ).where(
+            VocabularyItem.user_id == user_id,
+            VocabularyItem.id.in_({review.item_id for review in reviews})
+        )
+    )
+    rows = result.all()
+    position = {row.id: i for i, row in enumerate(rows)}
+    missing = sorted({review.item_id for review in reviews} - position.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Vocabulary items not found: {missing}")
+
+    # Current state of every card, updated in place round by round
+    ease = np.array([row.ease_factor for row in rows], dtype=np.float64)
+    interval = np.array([row.interval_days for row in rows], dtype=np.float64)
+    repetitions = np.array([row.repetitions for row in rows], dtype=np.int64)
+    lapses = np.array([row.lapses for row in rows], dtype=np.int64)
+    mastery = np.zeros(len(rows), dtype=np.int64)
+    due_at = np.empty(len(rows), dtype="datetime64[us]")
+    last_reviewed = np.empty(len(rows), dtype="datetime64[us]")
+
+    now = datetime.utcnow()
+    rounds = defaultdict(list)
+    seen = defaultdict(int)
+    for index, review in enumerate(reviews):
+        rounds[seen[review.item_id]].append(index)
+        seen[review.item_id] += 1
+
+    grades = np.array([review.grade for review in reviews], dtype=np.int64)
+    reviewed_times = [naive_utc(review.reviewed_at) if review.reviewed_at else now for review in reviews]
+    reviewed_at = np.array(reviewed_times, dtype="datetime64[us]")
+    cards = np.array([position[review.item_id] for review in reviews], dtype=np.int64)
+    out = {}
+    for k in sorted(rounds):
+        batch = np.array(rounds[k], dtype=np.int64)
+        card = cards[batch]
+        scheduled = schedule_reviews(
+            ease[card], interval[card], repetitions[card], lapses[card], grades[batch], reviewed_at[batch]
+        )
+        ease[card] = scheduled.ease_factor
+        interval[card] = scheduled.interval_days
+        repetitions[card] = scheduled.repetitions
+        lapses[card] = scheduled.lapses
+        mastery[card] = scheduled.mastery_level
+        due_at[card] = scheduled.due_at
+        last_reviewed[card] = reviewed_at[batch]
+        for j, index in enumerate(batch.tolist()):
+            out[index] = schemas.ReviewResult(
+                item_id=reviews[index].item_id,
+                due_at=scheduled.due_at[j].item(),
+                interval_days=float(scheduled.interval_days[j]),
+                ease_factor=float(scheduled.ease_factor[j]),
+                mastery_level=int(scheduled.mastery_level[j])
+            )
+
+    touched = sorted(set(cards.tolist()))
+    await db.execute(
+        update(VocabularyItem),
+        [
+            {
+                "id": rows[i].id,
+                "ease_factor": float(ease[i]),
+                "interval_days": float(interval[i]),
+                "repetitions": int(repetitions[i]),
+                "lapses": int(lapses[i]),
+                "mastery_level": int(mastery[i]),
+                "due_at": due_at[i].item(),
+                "last_reviewed": last_reviewed[i].item(),
+            }
+            for i in touched
+        ]
+    )
+    await db.commit()
+    logger.debug("Recorded %d reviews of %d cards for user %d", len(reviews), len(touched), user_id)
+    results = [out[index] for index in range(len(reviews))]
+    event_hub.publish(REVIEWS_RECORDED, [
+        ReviewEvent(user_id, result.item_id, review.grade, result.mastery_level, at)
+        for review, result, at in zip(reviews, results, reviewed_times)
+    ])
+    return results
+
+@router.post("/batch", response_model=schemas.ReviewBatchResult)
+async def submit_review_batch(
+    batch: schemas.ReviewBatch,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Record a whole practice session: one SELECT, one vectorized scheduling pass, one bulk UPDATE"""
+    results = await record_reviews(db, current_user.id, batch.reviews)
+    return schemas.ReviewBatchResult(reviewed=len(results), results=results)
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from .. import crud, models, schemas
+from ..database import get_async_db
+from ..search import LESSON_WORD, PHRASE, VOCABULARY, Hit, content_search
+from ..security import get_current_active_user
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+async def resolve_language_id(db: AsyncSession, language: Optional[str]) -> Optional[int]:
+    if not language:
+        return None
+    found = await crud.get_language_by_code(db, language)
+    if not found:
+        raise HTTPException(status_code=404, detail=f"Language '{language}' not found")
+    return found.id
+
+def to_results(hits: List[Hit]) -> List[schemas.SearchResult]:
+    return [
+        schemas.SearchResult(
+            kind=document.kind,
+            id=document.id,
+            language_id=document.language_id,
+            lesson_id=document.lesson_id,
+            text=document.text,
+            transliteration=document.transliteration,
+            translation=document.translation,
+            score=round(score, 3)
+        )
+        for score, document in hits
+    ]
+
+@router.get("/", response_model=List[schemas.SearchResult])
+async def search_content(
+    q: str = Query(..., min_length=1, max_length=200, description="Greek word, transliteration or translation"),
+    language: Optional[str] = Query(None, description="Language code; all languages when omitted"),
+    kind: List[str] = Query([PHRASE, LESSON_WORD], description="phrase and/or lesson_word"),
+    fuzzy: bool = Query(True, description="Also match prefixes and misspellings"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search phrases and lesson words; accents and case are ignored"""
+    if not set(kind) <= {PHRASE, LESSON_WORD}:
+        raise HTTPException(status_code=422, detail="kind must be 'phrase' or 'lesson_word'")
+    language_id = await resolve_language_id(db, language)
+    hits = content_search.search(q, language_id=language_id, kinds=kind, limit=limit, fuzzy=fuzzy)
+    logger.debug("Search %r returned %d results", q, len(hits))
+    return to_results(hits)
+
+@router.get("/vocabulary", response_model=List[schemas.SearchResult])
+async def search_my_vocabulary(
+    q: str = Query(..., min_length=1, max_length=200),
+    language: Optional[str] = Query(None, description="Language code; all languages when omitted"),
+    fuzzy: bool = Query(True, description="Also match prefixes and misspellings"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search the current user's vocabulary"""
+    language_id = await resolve_language_id(db, language)
+    hits = content_search.search(
+        q, language_id=language_id, kinds=[VOCABULARY], user_id=current_user.id, limit=limit, fuzzy=fuzzy
+    )
+    return to_results(hits)
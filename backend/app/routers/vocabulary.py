@@ -0,0 +1,26 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models, schemas
+from ..database import get_async_db
+from ..search import content_search, vocabulary_document
+from ..security import get_current_active_user
+
+router = APIRouter(
+    prefix="/vocabulary",
+    tags=["vocabulary"]
+)
+
+@router.post("/", response_model=schemas.VocabularyItem, status_code=201)
+async def add_vocabulary_item(
+    item: schemas.VocabularyItemCreate,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Add a word to the user's vocabulary; it is due for its first review immediately"""
+    db_item = models.VocabularyItem(**item.model_dump(), user_id=current_user.id, due_at=datetime.utcnow())
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    content_search.add([vocabulary_document(db_item)])
+    return db_item
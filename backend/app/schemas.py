@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -55,6 +55,10 @@ class PhraseCreate(PhraseBase):
     lesson_id: Optional[int] = None
 
 class Phrase(PhraseBase):
+    # Nullable columns: content packs and catalog imports may leave them empty
+    transliteration: Optional[str] = None
+    level: Optional[str] = None
+    category: Optional[str] = None
     id: int
     language_id: int
     lesson_id: Optional[int] = None
@@ -84,6 +88,21 @@ class Lesson(LessonBase):
     class Config:
         from_attributes = True
 
+class LessonSummary(BaseModel):
+    """What a lesson card needs; lists never load the content column"""
+    id: int
+    title: str
+    description: str
+    level: Optional[str]
+    category: Optional[str]
+    lesson_type: Optional[str]
+    language_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class LessonDetail(LessonBase):
     id: int
     language_id: int
@@ -95,6 +114,53 @@ class LessonDetail(LessonBase):
     class Config:
         from_attributes = True
 
+class LessonImport(BaseModel):
+    """A lesson line of an NDJSON catalog import; matched to existing lessons by title"""
+    title: str
+    description: str = ""
+    level: Optional[str] = None
+    category: Optional[str] = None
+    lesson_type: Optional[str] = None
+    content: Optional[Dict[str, Any]] = None
+
+class PhraseImport(BaseModel):
+    """A phrase line of an NDJSON catalog import; `lesson` is the lesson's title"""
+    lesson: Optional[str] = None
+    text: str
+    transliteration: Optional[str] = None
+    translation: Optional[str] = None
+    level: Optional[str] = None
+    category: Optional[str] = None
+    audio_url: Optional[str] = None
+    extra_data: Optional[Dict[str, Any]] = None
+
+class CatalogImportResult(BaseModel):
+    lessons_created: int
+    lessons_updated: int
+    phrases_created: int
+    phrases_updated: int
+
+class BundleSection(BaseModel):
+    file: str
+    sha256: str
+    size: int
+    records: int
+
+class BundleArchive(BaseModel):
+    file: str
+    compression: str
+    size: int
+    sha256: str
+
+class BundleManifest(BaseModel):
+    """An offline bundle's manifest.json, plus the size and hash of the archive itself"""
+    format: int
+    type: str
+    version: str
+    language: Dict[str, Any]
+    sections: Dict[str, BundleSection]
+    archive: BundleArchive
+
 class ProgressBase(BaseModel):
     lesson_id: int
     completed: bool
@@ -111,10 +177,54 @@ class Progress(ProgressBase):
     class Config:
         from_attributes = True
 
+class LessonCompletion(BaseModel):
+    score: Optional[int] = Field(None, ge=0, le=100)
+
+class LessonCompletionResult(BaseModel):
+    lesson_id: int
+    completed: bool
+    score: Optional[int] = None
+    points_awarded: int
+
+class AchievementInfo(BaseModel):
+    name: str
+    description: str
+    badge_image_url: Optional[str] = None
+
+class Achievement(AchievementInfo):
+    id: int
+    user_id: int
+    earned_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    points: int
+
+class LeaderboardStanding(BaseModel):
+    rank: Optional[int] = None
+    points: int
+    total: int
+    neighbors: List[LeaderboardEntry]
+
+class SearchResult(BaseModel):
+    kind: str  # phrase, lesson_word or vocabulary
+    id: int  # phrase, lesson or vocabulary item id
+    language_id: int
+    lesson_id: Optional[int] = None
+    text: str
+    transliteration: Optional[str] = None
+    translation: Optional[str] = None
+    score: float
+
 class VocabularyItemBase(BaseModel):
     word: str
     translation: str
-    context: Optional[str]
+    context: Optional[str] = None
     category: str
 
 class VocabularyItemCreate(VocabularyItemBase):
@@ -123,12 +233,37 @@ class VocabularyItemCreate(VocabularyItemBase):
 class VocabularyItem(VocabularyItemBase):
     id: int
     user_id: int
+    language_id: int
     mastery_level: int
     last_reviewed: Optional[datetime]
+    due_at: datetime
+    ease_factor: float
+    interval_days: float
+    repetitions: int
 
     class Config:
         from_attributes = True
 
+class ReviewSubmission(BaseModel):
+    item_id: int
+    grade: int = Field(..., ge=0, le=5)  # SM-2 recall quality, below 3 is a failed recall
+    reviewed_at: Optional[datetime] = None
+
+class ReviewResult(BaseModel):
+    item_id: int
+    due_at: datetime
+    interval_days: float
+    ease_factor: float
+    mastery_level: int
+
+class ReviewBatch(BaseModel):
+    """All review results of one practice session"""
+    reviews: List[ReviewSubmission]
+
+class ReviewBatchResult(BaseModel):
+    reviewed: int
+    results: List[ReviewResult]
+
 class Language(BaseModel):
     id: int
     code: str
@@ -0,0 +1,428 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sortedcontainers import SortedList
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .database import AsyncSessionLocal
+from .lesson_content import normalize_lesson_content
+
+logger = logging.getLogger(__name__)
+
+# In-memory search over phrases, the words in lesson content and users'
+# vocabulary. Text is folded (lowercased, accents and diacritics stripped, so
+# "Καλά" and "καλα" are the same token) and split into words. An inverted
+# index maps each token to the documents containing it. Prefix queries walk a
+# sorted list of the tokens, and misspelled ones go through a trigram index
+# from each trigram to the tokens containing it; neither scans the documents.
+# Phrases and lesson words share one catalog index, while each user's
+# vocabulary has an index of its own, so a query never expands, scores or
+# ranks another user's items.
+#
+# Writes made by this process update the index as soon as they commit; the
+# whole index is rebuilt from the database at startup and every
+# SEARCH_REFRESH_SECONDS, which also picks up writes from other processes.
+
+PHRASE = "phrase"
+LESSON_WORD = "lesson_word"
+VOCABULARY = "vocabulary"
+
+# Score of a query term matching a token exactly, as the prefix of a token,
+# or approximately (scaled by trigram similarity, which must reach FUZZY_THRESHOLD)
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+FUZZY_THRESHOLD = 0.3
+# Most tokens a single query term expands to through prefix or fuzzy matching
+MAX_EXPANSIONS = 50
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents and diacritics: 'Καλά' -> 'καλα', 'ς' -> 'σ'"""
+    decomposed = unicodedata.normalize("NFD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(fold(text)) if text else []
+
+def trigrams(token: str) -> Set[str]:
+    # Padded like pg_trgm, so the start of a word carries extra weight
+    padded = "  " + token + " "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+@dataclass(frozen=True)
+class SearchDocument:
+    kind: str
+    id: int  # phrase, lesson or vocabulary item id
+    language_id: int
+    text: str
+    transliteration: Optional[str] = None
+    translation: Optional[str] = None
+    lesson_id: Optional[int] = None
+    user_id: Optional[int] = None  # vocabulary items are only visible to their owner
+    position: int = 0  # index of a lesson word within its lesson
+
+    @property
+    def key(self) -> Tuple[str, int, int]:
+        return (self.kind, self.id, self.position)
+
+def phrase_document(phrase: models.Phrase) -> SearchDocument:
+    return SearchDocument(
+        kind=PHRASE,
+        id=phrase.id,
+        language_id=phrase.language_id,
+        text=phrase.text or "",
+        transliteration=phrase.transliteration,
+        translation=phrase.translation,
+        lesson_id=phrase.lesson_id
+    )
+
+def lesson_word_documents(lesson_id: int, language_id: int, compiled_content: Optional[dict]) -> List[SearchDocument]:
+    words = (compiled_content or {}).get("words") or []
+    return [
+        SearchDocument(
+            kind=LESSON_WORD,
+            id=lesson_id,
+            language_id=language_id,
+            text=word.get("word") or "",
+            transliteration=word.get("transliteration"),
+            translation=word.get("translation"),
+            lesson_id=lesson_id,
+            position=position
+        )
+        for position, word in enumerate(words)
+        if isinstance(word, dict) and word.get("word")
+    ]
+
+def lesson_documents(lesson: models.Lesson) -> List[SearchDocument]:
+    """Documents for the words of a loaded lesson; build them before the commit expires it"""
+    compiled = lesson.compiled_content
+    if compiled is None:
+        compiled = normalize_lesson_content(lesson.content, lesson.lesson_type)
+    return lesson_word_documents(lesson.id, lesson.language_id, compiled)
+
+def vocabulary_document(item: models.VocabularyItem) -> SearchDocument:
+    return SearchDocument(
+        kind=VOCABULARY,
+        id=item.id,
+        language_id=item.language_id,
+        text=item.word or "",
+        translation=item.translation,
+        user_id=item.user_id
+    )
+
+DocumentKey = Tuple[str, int, int]
+Hit = Tuple[float, SearchDocument]
+
+def hit_order(hit: Hit) -> Tuple[float, DocumentKey]:
+    """Best score first, ties broken by document key"""
+    return (-hit[0], hit[1].key)
+
+class SearchIndex:
+    """Inverted index from folded tokens to documents, plus a trigram index over the tokens"""
+
+    def __init__(self, documents: Iterable[SearchDocument] = ()):
+        self._documents: Dict[DocumentKey, SearchDocument] = {}
+        self._document_tokens: Dict[DocumentKey, Set[str]] = {}
+        self._postings: Dict[str, Set[DocumentKey]] = defaultdict(set)
+        self._tokens = SortedList()
+        self._token_trigrams: Dict[str, int] = {}  # token -> number of its trigrams
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        # Lesson id -> its words and phrases, language id -> its lessons, for deletes
+        self._by_lesson: Dict[int, Set[DocumentKey]] = defaultdict(set)
+        self._lessons_by_language: Dict[int, Set[int]] = defaultdict(set)
+        for document in documents:
+            self.add(document)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, document: SearchDocument):
+        """Index a document, replacing any earlier version with the same key"""
+        key = document.key
+        if key in self._documents:
+            self.remove(key)
+        tokens = set(tokenize(document.text))
+        tokens.update(tokenize(document.transliteration))
+        tokens.update(tokenize(document.translation))
+        self._documents[key] = document
+        self._document_tokens[key] = tokens
+        for token in tokens:
+            postings = self._postings[token]
+            if not postings:
+                self._tokens.add(token)
+                grams = trigrams(token)
+                self._token_trigrams[token] = len(grams)
+                for gram in grams:
+                    self._trigrams[gram].add(token)
+            postings.add(key)
+        if document.lesson_id is not None and document.kind != VOCABULARY:
+            self._by_lesson[document.lesson_id].add(key)
+            self._lessons_by_language[document.language_id].add(document.lesson_id)
+
+    def remove(self, key: DocumentKey):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for token in self._document_tokens.pop(key):
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                del self._token_trigrams[token]
+                self._tokens.remove(token)
+                for gram in trigrams(token):
+                    tokens = self._trigrams[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[gram]
+        if document.lesson_id is not None:
+            lesson_keys = self._by_lesson.get(document.lesson_id)
+            if lesson_keys is not None:
+                lesson_keys.discard(key)
+
+    def remove_lessons(self, lesson_ids: Iterable[int]):
+        """Remove the words of these lessons and the phrases attached to them"""
+        for lesson_id in lesson_ids:
+            for key in list(self._by_lesson.pop(lesson_id, ())):
+                self.remove(key)
+            for lessons in self._lessons_by_language.values():
+                lessons.discard(lesson_id)
+
+    def remove_language_lessons(self, language_id: int):
+        self.remove_lessons(self._lessons_by_language.pop(language_id, set()))
+
+    def _expand(self, term: str, fuzzy: bool) -> Dict[str, float]:
+        """Tokens matching one query term, with their weights"""
+        matches = {}
+        if term in self._postings:
+            matches[term] = EXACT_WEIGHT
+        if not fuzzy:
+            return matches
+
+        for token in self._tokens.irange(term, term + "\U0010ffff", inclusive=(False, False)):
+            if len(matches) > MAX_EXPANSIONS:
+                break
+            matches[token] = PREFIX_WEIGHT
+
+        # A token at or above FUZZY_THRESHOLD (Jaccard over trigrams) shares at least
+        # `required` trigrams with the term, so it contains one of the
+        # len(grams) - required + 1 rarest ones; only those are used to find candidates
+        grams = sorted(trigrams(term), key=lambda gram: len(self._trigrams.get(gram, ())))
+        required = max(1, math.ceil(FUZZY_THRESHOLD * len(grams)))
+        rare, common = grams[:len(grams) - required + 1], grams[len(grams) - required + 1:]
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in rare:
+            for token in self._trigrams.get(gram, ()):
+                shared[token] += 1
+        similar = []
+        for token, count in shared.items():
+            if token in matches:
+                continue
+            count += sum(1 for gram in common if token in self._trigrams.get(gram, ()))
+            similarity = count / (len(grams) + self._token_trigrams[token] - count)
+            if similarity >= FUZZY_THRESHOLD:
+                similar.append((similarity, token))
+        for similarity, token in heapq.nlargest(MAX_EXPANSIONS, similar):
+            matches[token] = FUZZY_WEIGHT * similarity
+        return matches
+
+    def search(
+        self,
+        query: str,
+        language_id: Optional[int] = None,
+        kinds: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        fuzzy: bool = True
+    ) -> List[Hit]:
+        """Documents of `kinds` matching every term of the query, best first"""
+        kinds = set(kinds or (PHRASE, LESSON_WORD))
+        scores: Optional[Dict[DocumentKey, float]] = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores: Dict[DocumentKey, float] = {}
+            for token, weight in self._expand(term, fuzzy).items():
+                for key in self._postings[token]:
+                    if term_scores.get(key, 0.0) < weight:
+                        term_scores[key] = weight
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+
+        hits = []
+        for key, score in scores.items():
+            document = self._documents[key]
+            if document.kind not in kinds:
+                continue
+            if language_id is not None and document.language_id != language_id:
+                continue
+            hits.append((score, document))
+        return heapq.nsmallest(limit, hits, key=hit_order)
+
+class ContentIndex:
+    """The catalog index plus one SearchIndex per user for their vocabulary items"""
+
+    def __init__(self, documents: Iterable[SearchDocument] = ()):
+        self._catalog = SearchIndex()
+        self._vocabulary: Dict[int, SearchIndex] = {}
+        for document in documents:
+            self.add(document)
+
+    def __len__(self) -> int:
+        return len(self._catalog) + sum(len(index) for index in self._vocabulary.values())
+
+    def add(self, document: SearchDocument):
+        if document.kind != VOCABULARY:
+            self._catalog.add(document)
+            return
+        index = self._vocabulary.get(document.user_id)
+        if index is None:
+            index = self._vocabulary[document.user_id] = SearchIndex()
+        index.add(document)
+
+    def remove_lessons(self, lesson_ids: Iterable[int]):
+        self._catalog.remove_lessons(lesson_ids)
+
+    def remove_language_lessons(self, language_id: int):
+        self._catalog.remove_language_lessons(language_id)
+
+    def search(
+        self,
+        query: str,
+        language_id: Optional[int] = None,
+        kinds: Optional[Sequence[str]] = None,
+        user_id: Optional[int] = None,
+        limit: int = 20,
+        fuzzy: bool = True
+    ) -> List[Hit]:
+        """Documents matching every term of the query, best first.
+
+        Vocabulary items are only searched in `user_id`'s own index, and only
+        when VOCABULARY is among `kinds`.
+        """
+        kinds = set(kinds or (PHRASE, LESSON_WORD))
+        hits = []
+        if kinds - {VOCABULARY}:
+            hits.extend(self._catalog.search(query, language_id, kinds, limit, fuzzy))
+        vocabulary = self._vocabulary.get(user_id) if user_id is not None else None
+        if VOCABULARY in kinds and vocabulary is not None:
+            hits.extend(vocabulary.search(query, language_id, kinds, limit, fuzzy))
+        return heapq.nsmallest(limit, hits, key=hit_order)
+
+async def load_documents(db: AsyncSession) -> List[SearchDocument]:
+    documents = []
+    phrases = await db.execute(select(
+        models.Phrase.id, models.Phrase.language_id, models.Phrase.lesson_id,
+        models.Phrase.text, models.Phrase.transliteration, models.Phrase.translation
+    ))
+    documents.extend(phrase_document(row) for row in phrases)
+    lessons = await db.execute(select(
+        models.Lesson.id, models.Lesson.language_id, models.Lesson.lesson_type,
+        models.Lesson.compiled_content, models.Lesson.content
+    ))
+    for row in lessons:
+        compiled = row.compiled_content
+        if compiled is None:
+            compiled = normalize_lesson_content(row.content, row.lesson_type)
+        documents.extend(lesson_word_documents(row.id, row.language_id, compiled))
+    items = await db.execute(select(
+        models.VocabularyItem.id, models.VocabularyItem.user_id, models.VocabularyItem.language_id,
+        models.VocabularyItem.word, models.VocabularyItem.translation
+    ))
+    documents.extend(vocabulary_document(row) for row in items)
+    return documents
+
+class SearchService:
+    """Holds the index, applies this process's writes to it and rebuilds it periodically"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self._session_factory = session_factory
+        self._index = ContentIndex()
+        # Sync endpoints update the index from threadpool workers
+        self._lock = threading.Lock()
+        # Updates made while a rebuild is reading the database, replayed onto the new index
+        self._pending: Optional[List[Tuple[str, tuple]]] = None
+        self._rebuilding: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def search(self, query: str, **options) -> List[Hit]:
+        with self._lock:
+            return self._index.search(query, **options)
+
+    def _apply(self, method: str, *args):
+        with self._lock:
+            getattr(self._index, method)(*args)
+            if self._pending is not None:
+                self._pending.append((method, args))
+
+    def add(self, documents: Iterable[SearchDocument]):
+        """Index committed documents; call after the commit"""
+        for document in documents:
+            self._apply("add", document)
+
+    def remove_lessons(self, lesson_ids: Iterable[int]):
+        self._apply("remove_lessons", list(lesson_ids))
+
+    def remove_language_lessons(self, language_id: int):
+        self._apply("remove_language_lessons", language_id)
+
+    async def rebuild(self):
+        if self._rebuilding is None:
+            self._rebuilding = asyncio.Lock()
+        async with self._rebuilding:
+            await self._rebuild()
+
+    async def _rebuild(self):
+        with self._lock:
+            self._pending = []
+        try:
+            async with self._session_factory() as db:
+                documents = await load_documents(db)
+            # Tokenizing every document is CPU-bound; keep it off the event loop
+            index = await asyncio.get_running_loop().run_in_executor(None, ContentIndex, documents)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for method, args in self._pending:
+                getattr(index, method)(*args)
+            self._index, self._pending = index, None
+        logger.info("Rebuilt search index (%d documents)", len(index))
+
+    async def start(self, refresh_seconds: float):
+        await self.rebuild()
+        if refresh_seconds > 0:
+            self._task = asyncio.create_task(self._refresh(refresh_seconds))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Search index rebuild failed, keeping the current index")
+
+content_search = SearchService(AsyncSessionLocal)
@@ -1,12 +1,18 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import time
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .database import get_db
-from . import models, schemas
+from .cache import LRUCache
+from .config import settings
+from .database import get_async_db
+from .password_hashing import PasswordHasher, PasswordHasherBusy
+from . import crud, models, schemas
 
 # to get a string like this run:
 # openssl rand -hex 32
@@ -14,14 +20,85 @@ SECRET_KEY = "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    rounds=settings.bcrypt_rounds,
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Authenticated requests skip the HMAC check for tokens seen before (claims are
+# kept until the token's exp) and the user query for recently loaded users.
+# Cached users are detached instances: read their columns, never add them to a
+# session. Any committed change to a user evicts them from this process's cache;
+# other workers pick the change up within AUTH_USER_CACHE_TTL_SECONDS.
+token_claims_cache = LRUCache(maxsize=settings.auth_token_cache_size)
+user_cache = LRUCache(maxsize=settings.auth_user_cache_size, ttl=settings.auth_user_cache_ttl_seconds)
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def decode_token(token: str) -> dict:
+    """Verify a JWT and return its claims, from the cache when the token was seen before"""
+    key = token_key(token)
+    claims = token_claims_cache.get(key)
+    if claims is not None:
+        return claims
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = claims.get("exp")
+    if exp is not None:
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_claims_cache.set(key, claims, ttl=remaining)
+    return claims
+
+def invalidate_user(username: str):
+    user_cache.pop(username)
+
+@event.listens_for(Session, "after_flush")
+def collect_changed_users(session: Session, flush_context):
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.User):
+            history = inspect(obj).attrs.username.history
+            names = session.info.setdefault("changed_usernames", set())
+            names.update(name for name in (obj.username, *history.deleted) if name)
+
+@event.listens_for(Session, "after_commit")
+def evict_changed_users(session: Session):
+    for username in session.info.pop("changed_usernames", ()):
+        invalidate_user(username)
+
+@event.listens_for(Session, "after_rollback")
+def forget_changed_users(session: Session):
+    session.info.pop("changed_usernames", None)
+
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+async def hash_password(password: str) -> str:
+    """Hash a password in the hashing pool; 503 when it is saturated"""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool; 503 when it is saturated"""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+
+async def check_unknown_user_password(plain_password: str) -> bool:
+    """Cost a login for an unknown user the same bcrypt round as a wrong password; always False"""
+    try:
+        return await password_hasher.verify_dummy(plain_password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -35,7 +112,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,16 +120,19 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
         token_data = schemas.TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.username == token_data.username).first()
+    user = user_cache.get(token_data.username)
     if user is None:
-        raise credentials_exception
+        user = await crud.get_user_by_username(db, token_data.username)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(token_data.username, user)
     return user
 
 async def get_current_active_user(
@@ -0,0 +1,169 @@
+import argparse
+import logging
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, selectinload
+from . import models
+from .config import settings
+from .content import content
+from .lesson_content import bump_lesson_versions, compile_lesson, normalize_lesson_content
+
+logger = logging.getLogger(__name__)
+
+LANGUAGE_FIELDS = ("code", "name", "native_name", "flag", "rtl")
+LESSON_FIELDS = ("title", "description", "level", "category", "lesson_type")
+PHRASE_FIELDS = ("text", "transliteration", "translation", "level", "category", "extra_data")
+
+def seed_lessons(
+    db: Session,
+    language_id: int,
+    configs: Sequence[dict],
+    build_content: Callable[[dict], dict]
+) -> List[models.Lesson]:
+    """Insert the lessons from `configs` that the language does not have yet.
+
+    One SELECT finds the titles that already exist, then all missing lessons
+    are written with a single multi-row INSERT ... RETURNING. Content is only
+    generated for missing lessons. The caller owns the transaction; the
+    returned list holds existing and new lessons in `configs` order.
+    """
+    titles = [config["title"] for config in configs]
+    existing = {
+        lesson.title: lesson
+        for lesson in db.scalars(
+            select(models.Lesson).where(
+                models.Lesson.language_id == language_id,
+                models.Lesson.title.in_(titles)
+            )
+        )
+    }
+
+    rows = []
+    for config in configs:
+        if config["title"] in existing:
+            continue
+        content = build_content(config)
+        row = {field: config.get(field) for field in LESSON_FIELDS}
+        row.update(
+            content=content,
+            compiled_content=normalize_lesson_content(content, config.get("lesson_type")),
+            language_id=language_id
+        )
+        rows.append(row)
+
+    created = {}
+    if rows:
+        result = db.scalars(
+            insert(models.Lesson).returning(models.Lesson),
+            rows
+        )
+        created = {lesson.title: lesson for lesson in result}
+    logger.debug("Seeded %d new lessons for language %d (%d already present)", len(created), language_id, len(existing))
+
+    return [existing.get(title) or created[title] for title in titles]
+
+def seed_pack_lessons(db: Session, language_id: int, code: str) -> List[models.Lesson]:
+    """seed_lessons with the lessons of a content pack, in file order"""
+    return seed_lessons(db, language_id, list(content.iter_lessons(code)), lambda config: config.get("content", {}))
+
+def language_row(code: str) -> dict:
+    """Column values for the languages table from a content pack"""
+    language = content.language(code)
+    return {field: language.get(field) for field in LANGUAGE_FIELDS if field in language}
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def vocabulary_phrase(entry: dict) -> dict:
+    """Phrase row for a vocabulary entry; the optional fields are kept in extra_data"""
+    extra = {key: entry[key] for key in ("context", "mnemonic") if entry.get(key)}
+    return {
+        "text": entry["word"],
+        "transliteration": entry.get("transliteration"),
+        "translation": entry.get("translation"),
+        "level": entry.get("level"),
+        "category": entry.get("category") or "Vocabulary",
+        "extra_data": extra or None
+    }
+
+def pack_phrases(code: str, language_id: int, lesson_ids: Dict[str, int]) -> Iterator[dict]:
+    """The pack's phrases followed by its vocabulary, as phrase rows"""
+    for phrase in content.iter_phrases(code):
+        row = {field: phrase.get(field) for field in PHRASE_FIELDS}
+        row.update(language_id=language_id, lesson_id=lesson_ids.get(phrase.get("category")))
+        yield row
+    for entry in content.iter_vocabulary(code):
+        row = vocabulary_phrase(entry)
+        row.update(language_id=language_id, lesson_id=None)
+        yield row
+
+def load_content_pack(db: Session, code: str, batch_size: Optional[int] = None) -> models.Language:
+    """Create a language from its content pack.
+
+    Lessons missing from the database are added with seed_lessons. Phrases and
+    vocabulary are streamed from the pack's .jsonl files into multi-row
+    INSERTs of `batch_size` rows, so only one batch is in memory at a time;
+    they are skipped for a language that already has phrases, which makes
+    loading a pack twice a no-op. Mnemonics lessons take their practice words
+    from the phrases, so they are compiled again once the phrases are in. The
+    caller owns the transaction.
+    """
+    batch_size = batch_size or settings.content_pack_batch_size
+    language = db.scalars(select(models.Language).where(models.Language.code == code)).first()
+    if language is None:
+        language = models.Language(**language_row(code))
+        db.add(language)
+        db.flush()
+
+    lessons = seed_pack_lessons(db, language.id, code)
+    # Phrases attach to the lesson of the same category (the last one, if several share it)
+    lesson_ids = {lesson.category: lesson.id for lesson in lessons}
+
+    has_phrases = db.scalar(select(models.Phrase.id).where(models.Phrase.language_id == language.id).limit(1))
+    if has_phrases is not None:
+        logger.info("Language %s already has phrases, not loading them again", code)
+        return language
+    inserted = 0
+    touched = set()
+    for batch in batched(pack_phrases(code, language.id, lesson_ids), batch_size):
+        db.execute(insert(models.Phrase), batch)
+        inserted += len(batch)
+        touched.update(row["lesson_id"] for row in batch if row["lesson_id"] is not None)
+    if touched:
+        db.execute(bump_lesson_versions(touched))
+
+    mnemonics_ids = [lesson.id for lesson in lessons if lesson.lesson_type == "mnemonics"]
+    if inserted and mnemonics_ids:
+        for lesson in db.scalars(
+            select(models.Lesson).where(models.Lesson.id.in_(mnemonics_ids)).options(selectinload(models.Lesson.phrases))
+        ):
+            compile_lesson(lesson)
+        db.flush()
+    logger.info("Loaded content pack %s: %d lessons, %d phrases", code, len(lessons), inserted)
+    return language
+
+def main():
+    from .database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Load content packs into the configured database")
+    parser.add_argument("codes", nargs="*", help="language codes (default: every available pack)")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per INSERT")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=settings.log_format)
+    db = SessionLocal()
+    try:
+        for code in args.codes or content.codes():
+            load_content_pack(db, code, args.batch_size)
+            db.commit()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import NamedTuple
+import numpy as np
+
+# SM-2 spaced-repetition scheduling. Grades follow SuperMemo: 0-5, where
+# anything below 3 is a failed recall and resets the card.
+
+MIN_EASE_FACTOR = 1.3
+DEFAULT_EASE_FACTOR = 2.5
+PASSING_GRADE = 3
+MAX_MASTERY_LEVEL = 5
+# Failed cards come back within the same session rather than tomorrow
+RELEARN_DELAY = timedelta(minutes=10)
+
+@dataclass
+class ReviewEvent:
+    """A committed review, published to the event hub"""
+    user_id: int
+    item_id: int
+    grade: int
+    mastery_level: int
+    at: datetime
+
+class BatchSchedule(NamedTuple):
+    """Column-wise result of schedule_reviews; element i belongs to review i"""
+    ease_factor: np.ndarray
+    interval_days: np.ndarray
+    repetitions: np.ndarray
+    lapses: np.ndarray
+    mastery_level: np.ndarray
+    due_at: np.ndarray  # datetime64[us]
+
+def schedule_reviews(
+    ease_factor: np.ndarray,
+    interval_days: np.ndarray,
+    repetitions: np.ndarray,
+    lapses: np.ndarray,
+    grades: np.ndarray,
+    reviewed_at: np.ndarray
+) -> BatchSchedule:
+    """Apply one graded review to each card and return the new states and due dates.
+
+    Inputs are parallel arrays, one element per card. Each element must be a
+    different card; repeated reviews of one card have to be applied in
+    successive calls.
+    """
+    grades = np.asarray(grades, dtype=np.int64)
+    if ((grades < 0) | (grades > 5)).any():
+        raise ValueError("grade must be between 0 and 5")
+    ease_factor = np.asarray(ease_factor, dtype=np.float64)
+    interval_days = np.asarray(interval_days, dtype=np.float64)
+    repetitions = np.asarray(repetitions, dtype=np.int64)
+    lapses = np.asarray(lapses, dtype=np.int64)
+    reviewed_at = np.asarray(reviewed_at, dtype="datetime64[us]")
+
+    miss = 5 - grades
+    new_ease = np.maximum(MIN_EASE_FACTOR, ease_factor + 0.1 - miss * (0.08 + miss * 0.02))
+    passed = grades >= PASSING_GRADE
+
+    grown = np.round(interval_days * ease_factor)
+    next_interval = np.where(repetitions == 0, 1.0, np.where(repetitions == 1, 6.0, grown))
+    new_interval = np.where(passed, next_interval, 0.0)
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+    new_lapses = np.where(passed, lapses, lapses + 1)
+
+    delay_us = np.where(passed, new_interval * 86_400e6, RELEARN_DELAY.total_seconds() * 1e6)
+    due_at = reviewed_at + np.rint(delay_us).astype("timedelta64[us]")
+
+    return BatchSchedule(
+        ease_factor=new_ease,
+        interval_days=new_interval,
+        repetitions=new_repetitions,
+        lapses=new_lapses,
+        mastery_level=np.minimum(new_repetitions, MAX_MASTERY_LEVEL),
+        due_at=due_at
+    )
@@ -0,0 +1,150 @@
+import logging
+import os
+from contextlib import contextmanager
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from . import models
+from .content import content
+from .seeding import language_row
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_advisory_lock
+STARTUP_LOCK_KEY = 712_004_005
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Databases created with metadata.create_all before startup ran migrations have
+# tables but no migration history. They are stamped with the last revision of
+# the unbroken run from 0001 whose objects they already have, and upgraded
+# from there. Oldest first.
+LEGACY_REVISIONS = [
+    ("0001", lambda inspector: inspector.has_table("lessons")),
+    ("0001a", lambda inspector: "compiled_content" in column_names(inspector, "lessons")),
+    ("0002", lambda inspector: "ix_lessons_language_id_id" in index_names(inspector, "lessons")),
+    ("0003", lambda inspector: "ease_factor" in column_names(inspector, "vocabulary_items")),
+    ("0004", lambda inspector: "ix_progress_user_id_lesson_id" in index_names(inspector, "progress")),
+    ("0005", lambda inspector: inspector.has_table("points_entries")),
+    ("0006", lambda inspector: "ix_achievements_user_id_name" in index_names(inspector, "achievements")),
+]
+
+@contextmanager
+def startup_lock(engine: Engine):
+    """Serialize startup work across worker processes.
+
+    PostgreSQL uses a session-level advisory lock; SQLite uses an flock on a file
+    next to the database, since all workers share the same host.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": STARTUP_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": STARTUP_LOCK_KEY})
+        return
+
+    database = engine.url.database
+    if fcntl is None or engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        yield
+        return
+    with open(os.path.abspath(database) + ".startup.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def index_names(inspector, table: str) -> set:
+    return {index["name"] for index in inspector.get_indexes(table)} if inspector.has_table(table) else set()
+
+def column_names(inspector, table: str) -> set:
+    return {column["name"] for column in inspector.get_columns(table)} if inspector.has_table(table) else set()
+
+def alembic_config(connection=None) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+def schema_is_current(engine: Engine) -> bool:
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision() == head
+
+def legacy_revision(connection) -> Optional[str]:
+    inspector = inspect(connection)
+    stamped = None
+    for revision, present in LEGACY_REVISIONS:
+        if not present(inspector):
+            break
+        stamped = revision
+    return stamped
+
+def migrate_schema(engine: Engine):
+    """Apply every pending Alembic migration; the migrations are the only way the schema is created"""
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        if MigrationContext.configure(connection).get_current_revision() is None:
+            revision = legacy_revision(connection)
+            if revision is not None:
+                logger.warning("Database has tables but no migration history, stamping it at revision %s", revision)
+                command.stamp(config, revision)
+        command.upgrade(config, "head")
+
+def default_languages() -> list:
+    """One languages row per available content pack"""
+    return [language_row(code) for code in content.codes()]
+
+def seed_languages(db: Session):
+    """Insert the default languages that are not present yet"""
+    existing = {code for (code,) in db.query(models.Language.code)}
+    for language in default_languages():
+        if language["code"] in existing:
+            continue
+        db.add(models.Language(**language))
+        try:
+            db.commit()
+            logger.info("Created %s language entry", language["name"])
+        except IntegrityError:
+            # Another process seeded it first
+            db.rollback()
+
+def initialize_database(engine: Engine, session_factory, migrate: bool = True, seed: bool = True):
+    """Idempotent startup: apply pending migrations and seed reference data.
+
+    The common case (schema at the newest revision, data seeded) is one
+    revision query and one SELECT, without taking the lock or issuing DDL,
+    so any number of workers can boot in parallel.
+    """
+    if migrate and not schema_is_current(engine):
+        with startup_lock(engine):
+            # Re-check: another worker may have migrated while we waited
+            if not schema_is_current(engine):
+                logger.info("Applying database migrations")
+                migrate_schema(engine)
+
+    if not seed:
+        return
+    db = session_factory()
+    try:
+        present = {code for (code,) in db.query(models.Language.code)}
+        if all(code in present for code in content.codes()):
+            return
+        with startup_lock(engine):
+            seed_languages(db)
+    finally:
+        db.close()
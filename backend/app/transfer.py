@@ -0,0 +1,218 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Set, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from . import models, schemas
+from .lesson_content import bump_lesson_versions, compile_lesson, normalize_lesson_content
+
+logger = logging.getLogger(__name__)
+
+# NDJSON export and import of a language's lessons and phrases. Both directions
+# stream: the export reads through server-side cursors (yield_per) and writes
+# one partition at a time, the import parses the request body as it arrives
+# and upserts every `batch_size` records. Neither ever holds the catalog.
+#
+# Every line is an object with a "type": one "language" header, then
+# "lesson" records, then "phrase" records. Phrases name their lesson by title,
+# since ids differ between databases; lessons are matched by (language, title)
+# and phrases by (lesson, text) when importing.
+
+LANGUAGE_RECORD = "language"
+LESSON_RECORD = "lesson"
+PHRASE_RECORD = "phrase"
+
+LESSON_COLUMNS = ("title", "description", "level", "category", "lesson_type", "content")
+PHRASE_COLUMNS = ("text", "transliteration", "translation", "level", "category", "audio_url", "extra_data")
+
+class ImportFormatError(ValueError):
+    def __init__(self, line_number: int, message: str):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+def ndjson_line(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+async def export_ndjson(
+    session_factory: Callable[[], AsyncSession], language: models.Language, batch_size: int
+) -> AsyncIterator[bytes]:
+    """Yield the language's catalog as NDJSON, one chunk per fetched partition"""
+    yield ndjson_line({
+        "type": LANGUAGE_RECORD, "code": language.code, "name": language.name,
+        "native_name": language.native_name, "flag": language.flag, "rtl": language.rtl
+    })
+    lessons, phrases = models.Lesson, models.Phrase
+    async with session_factory() as db:
+        result = await db.stream(
+            select(*(getattr(lessons, column) for column in LESSON_COLUMNS))
+            .where(lessons.language_id == language.id)
+            .order_by(lessons.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield b"".join(ndjson_line({"type": LESSON_RECORD, **row._asdict()}) for row in rows)
+
+        result = await db.stream(
+            select(lessons.title.label("lesson"), *(getattr(phrases, column) for column in PHRASE_COLUMNS))
+            .outerjoin(lessons, phrases.lesson_id == lessons.id)
+            .where(phrases.language_id == language.id)
+            .order_by(phrases.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield b"".join(ndjson_line({"type": PHRASE_RECORD, **row._asdict()}) for row in rows)
+
+async def ndjson_records(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, dict]]:
+    """Parse an NDJSON byte stream into (line number, object) without reading it all"""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise ImportFormatError(line_number + len(lines) + 1, f"line longer than {max_line_bytes} bytes")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, parse_line(line_number, line)
+    if buffer.strip():
+        yield line_number + 1, parse_line(line_number + 1, buffer)
+
+def parse_line(line_number: int, line: bytes) -> dict:
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ImportFormatError(line_number, f"invalid JSON ({e})") from None
+    if not isinstance(record, dict) or record.get("type") not in (LANGUAGE_RECORD, LESSON_RECORD, PHRASE_RECORD):
+        raise ImportFormatError(line_number, "expected an object with type language, lesson or phrase")
+    return record
+
+@dataclass
+class ImportCounts:
+    lessons_created: int = 0
+    lessons_updated: int = 0
+    phrases_created: int = 0
+    phrases_updated: int = 0
+
+class CatalogImporter:
+    """Upserts lesson and phrase records in batches; the caller commits"""
+
+    def __init__(self, db: AsyncSession, language: models.Language, batch_size: int):
+        self.db = db
+        self.language = language
+        self.batch_size = batch_size
+        self.counts = ImportCounts()
+        self._lessons: Dict[str, Tuple[int, schemas.LessonImport]] = {}
+        self._phrases: List[Tuple[int, schemas.PhraseImport]] = []
+        # Mnemonics lessons render their phrases, so they are recompiled at the end
+        self._mnemonics_lessons: Set[int] = set()
+
+    async def add(self, line_number: int, record: dict):
+        kind = record.pop("type")
+        if kind == LANGUAGE_RECORD:
+            if record.get("code") not in (None, self.language.code):
+                raise ImportFormatError(line_number, f"export is for language '{record['code']}'")
+            return
+        try:
+            if kind == LESSON_RECORD:
+                lesson = schemas.LessonImport.model_validate(record)
+                self._lessons[lesson.title] = (line_number, lesson)
+            else:
+                self._phrases.append((line_number, schemas.PhraseImport.model_validate(record)))
+        except ValidationError as e:
+            raise ImportFormatError(line_number, str(e).replace("\n", " ")) from None
+        if len(self._lessons) >= self.batch_size:
+            await self._flush_lessons()
+        if len(self._phrases) >= self.batch_size:
+            # Phrases may refer to lessons that are still buffered
+            await self._flush_lessons()
+            await self._flush_phrases()
+
+    async def finish(self) -> ImportCounts:
+        await self._flush_lessons()
+        await self._flush_phrases()
+        if self._mnemonics_lessons:
+            result = await self.db.execute(
+                select(models.Lesson)
+                .where(models.Lesson.id.in_(self._mnemonics_lessons))
+                .options(selectinload(models.Lesson.phrases))
+            )
+            for lesson in result.scalars():
+                compile_lesson(lesson)
+            await self.db.flush()
+        return self.counts
+
+    async def _lesson_ids(self, titles) -> Dict[str, Tuple[int, str]]:
+        """title -> (id, lesson_type) of existing lessons, the oldest one for duplicated titles"""
+        result = await self.db.execute(
+            select(models.Lesson.id, models.Lesson.title, models.Lesson.lesson_type)
+            .where(models.Lesson.language_id == self.language.id, models.Lesson.title.in_(titles))
+            .order_by(models.Lesson.id.desc())
+        )
+        return {title: (lesson_id, lesson_type) for lesson_id, title, lesson_type in result}
+
+    async def _flush_lessons(self):
+        if not self._lessons:
+            return
+        batch, self._lessons = self._lessons, {}
+        existing = await self._lesson_ids(list(batch))
+        updates, inserts = [], []
+        for title, (_, lesson) in batch.items():
+            row = lesson.model_dump()
+            row["compiled_content"] = normalize_lesson_content(row["content"], row["lesson_type"])
+            if title in existing:
+                updates.append({"id": existing[title][0], **row})
+                if lesson.lesson_type == "mnemonics":
+                    self._mnemonics_lessons.add(existing[title][0])
+            else:
+                inserts.append({"language_id": self.language.id, **row})
+        if updates:
+            await self.db.execute(update(models.Lesson), updates)
+            await self.db.execute(bump_lesson_versions(row["id"] for row in updates))
+        if inserts:
+            result = await self.db.execute(
+                insert(models.Lesson).returning(models.Lesson.id, models.Lesson.lesson_type), inserts
+            )
+            self._mnemonics_lessons.update(lesson_id for lesson_id, lesson_type in result if lesson_type == "mnemonics")
+        self.counts.lessons_updated += len(updates)
+        self.counts.lessons_created += len(inserts)
+
+    async def _flush_phrases(self):
+        if not self._phrases:
+            return
+        batch, self._phrases = self._phrases, []
+        lessons = await self._lesson_ids({phrase.lesson for _, phrase in batch if phrase.lesson})
+
+        rows: Dict[Tuple[int, str], dict] = {}
+        for line_number, phrase in batch:
+            lesson_id = None
+            if phrase.lesson:
+                if phrase.lesson not in lessons:
+                    raise ImportFormatError(line_number, f"unknown lesson '{phrase.lesson}'")
+                lesson_id, lesson_type = lessons[phrase.lesson]
+                if lesson_type == "mnemonics":
+                    self._mnemonics_lessons.add(lesson_id)
+            row = phrase.model_dump(exclude={"lesson"})
+            rows[(lesson_id, phrase.text)] = dict(row, lesson_id=lesson_id, language_id=self.language.id)
+
+        phrases = models.Phrase
+        result = await self.db.execute(
+            select(phrases.id, phrases.lesson_id, phrases.text)
+            .where(phrases.language_id == self.language.id, phrases.text.in_({text for _, text in rows}))
+            .order_by(phrases.id.desc())
+        )
+        existing = {(lesson_id, text): phrase_id for phrase_id, lesson_id, text in result}
+        updates = [dict(row, id=existing[key]) for key, row in rows.items() if key in existing]
+        inserts = [row for key, row in rows.items() if key not in existing]
+        if updates:
+            await self.db.execute(update(phrases), updates)
+        if inserts:
+            await self.db.execute(insert(phrases), inserts)
+        touched = {row["lesson_id"] for row in rows.values() if row["lesson_id"] is not None}
+        if touched:
+            await self.db.execute(bump_lesson_versions(touched))
+        self.counts.phrases_updated += len(updates)
+        self.counts.phrases_created += len(inserts)
@@ -0,0 +1,97 @@
+"""Measure password verification throughput and event-loop stalls under concurrent logins.
+
+For each concurrency level, runs that many simulated logins at once and
+reports verifications per second, how many were rejected by admission
+control, and how late a 10 ms heartbeat task on the same event loop woke up
+(a stand-in for lesson requests served next to the login storm). Compares
+calling bcrypt inline, as the login path originally did, with the process pool.
+
+    python -m benchmarks.login_throughput
+    python -m benchmarks.login_throughput --rounds 12 --workers 4 --max-pending 64 --concurrency 1 16 128
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.password_hashing import PasswordHasher, PasswordHasherBusy, hash_password_sync, verify_password_sync
+
+PASSWORD = "correct horse battery staple"
+HEARTBEAT = 0.01
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT)
+        lags.append(time.perf_counter() - start - HEARTBEAT)
+
+
+async def run(verify, concurrency: int, total: int) -> dict:
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    rejected = 0
+    remaining = total
+
+    async def login():
+        nonlocal rejected, remaining
+        while remaining > 0:
+            remaining -= 1
+            try:
+                assert await verify()
+            except PasswordHasherBusy:
+                rejected += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    lags.sort()
+    return {
+        "per_second": (total - rejected) / elapsed,
+        "rejected": rejected,
+        "lag_p50": statistics.median(lags) * 1000 if lags else float("nan"),
+        "lag_max": lags[-1] * 1000 if lags else float("nan"),
+    }
+
+
+async def main_async(args):
+    hashed = hash_password_sync(PASSWORD, args.rounds)
+    hasher = PasswordHasher(rounds=args.rounds, workers=args.workers, max_pending=args.max_pending)
+    await hasher.verify(PASSWORD, hashed)  # start the workers outside the measurement
+
+    async def inline():
+        return verify_password_sync(PASSWORD, hashed)
+
+    async def pooled():
+        return await hasher.verify(PASSWORD, hashed)
+
+    print("bcrypt cost %d, %d hashing processes, max %d pending" % (args.rounds, hasher.workers, args.max_pending))
+    print("%-7s %11s %10s %9s %14s %14s" % ("mode", "concurrency", "logins/s", "rejected", "loop lag p50", "loop lag max"))
+    try:
+        for concurrency in args.concurrency:
+            for name, verify in (("inline", inline), ("pool", pooled)):
+                result = await run(verify, concurrency, max(args.requests, concurrency))
+                print("%-7s %11d %10.1f %9d %11.1f ms %11.1f ms" % (
+                    name, concurrency, result["per_second"], result["rejected"], result["lag_p50"], result["lag_max"]))
+    finally:
+        hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: up to 4)")
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=32, help="logins per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 128])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
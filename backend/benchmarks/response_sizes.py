@@ -0,0 +1,124 @@
+"""Compare bytes on the wire and serialization time per endpoint.
+
+Runs the app against a scratch SQLite database with the Greek lessons and a
+mnemonics lesson padded with phrases, and fetches each endpoint uncompressed,
+gzip-compressed and (with the brotli package installed) Brotli-compressed
+through CompressionMiddleware. Each JSON payload is then rendered with the
+standard library (FastAPI's JSONResponse) and with orjson (ORJSONResponse),
+and compressed at the configured levels, reporting the median of --repeat runs.
+
+The lesson list and detail build their bodies with pydantic, not the response
+class; their render columns show what the response class would cost them.
+
+    python -m benchmarks.response_sizes
+    python -m benchmarks.response_sizes --repeat 200 --phrases 1000
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "response_sizes.db")
+os.environ["OFFLINE_BUNDLE_DIR"] = tempfile.mkdtemp()
+os.environ.setdefault("REQUEST_LOG_SAMPLE_RATE", "0")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.responses import brotli, orjson
+
+ENDPOINTS = [
+    "/languages/",
+    "/lessons/el",
+    "/lessons/el/{alphabet_id}",
+    "/lessons/el/{visual_id}",
+    "/lessons/el/{mnemonics_id}",
+    "/search/?q=kalimera&language=el",
+    "/bundles/el/manifest",
+]
+
+
+def add_phrases(language_id: int, lesson_id: int, count: int):
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.Phrase), [
+            {"text": "φράση %d" % n, "transliteration": "frasi %d" % n, "translation": "phrase %d" % n,
+             "level": "A1", "category": "Mnemonics", "language_id": language_id, "lesson_id": lesson_id,
+             "extra_data": {"mnemonic": "Picture a phrase number %d written on a wall" % n}}
+            for n in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per measurement")
+    parser.add_argument("--phrases", type=int, default=200, help="phrases added to the mnemonics lesson")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    print("JSON renderer: %s, compression: %s (minimum %d bytes)" % (
+        app.router.default_response_class.__name__, ", ".join(encodings[1:]), settings.compression_minimum_size))
+    if orjson is None:
+        print("orjson is not installed; its column is skipped")
+
+    with TestClient(app) as client:
+        created = client.post("/lessons/el/initialize").json()
+        lessons = {lesson["lesson_type"]: lesson["id"] for lesson in created}
+        add_phrases(created[0]["language_id"], lessons["mnemonics"], args.phrases)
+        ids = {"%s_id" % lesson_type: lesson_id for lesson_type, lesson_id in lessons.items()}
+
+        print()
+        print("%-34s %9s %9s %9s %9s %9s %9s %9s" % (
+            "endpoint", *("%s B" % encoding[:4] for encoding in ("identity", "gzip", "br")),
+            "json ms", "orjson ms", "gzip ms", "br ms"))
+        for path in ENDPOINTS:
+            url = path.format(**ids)
+            sizes = {}
+            for encoding in encodings:
+                response = client.get(url, headers={"Accept-Encoding": encoding})
+                response.raise_for_status()
+                sizes[encoding] = response.num_bytes_downloaded
+            payload = response.json()
+            body = JSONResponse(payload).body
+
+            timings = {
+                "json": median_ms(lambda: JSONResponse(payload), args.repeat),
+                "orjson": median_ms(lambda: ORJSONResponse(payload), args.repeat) if orjson is not None else None,
+                "gzip": median_ms(
+                    lambda: zlib.compress(body, settings.compression_gzip_level), args.repeat),
+                "br": median_ms(
+                    lambda: brotli.compress(body, quality=settings.compression_brotli_quality), args.repeat
+                ) if brotli is not None else None,
+            }
+            print("%-34s %9s %9s %9s %9s %9s %9s %9s" % (
+                url[:34],
+                *(sizes.get(encoding, "-") for encoding in ("identity", "gzip", "br")),
+                *("-" if timing is None else "%.3f" % timing for timing in timings.values())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
-from app.database import Base, engine
+from app.database import engine
+from app.startup import migrate_schema
 
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    migrate_schema(engine)
 
 if __name__ == "__main__":
     create_tables()
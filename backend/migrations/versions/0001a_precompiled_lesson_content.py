@@ -0,0 +1,28 @@
+"""precompiled lesson content
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18 18:48:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lessons written before this revision have no compiled document; the
+    # detail endpoint normalizes those on read
+    op.add_column('lessons', sa.Column('compiled_content', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('lessons', 'compiled_content')
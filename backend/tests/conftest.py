@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+# The app reads its settings at import time, so the scratch database and
+# test-friendly limits are set before anything from app is imported
+_scratch = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_scratch, "test.db")
+os.environ["OFFLINE_BUNDLE_DIR"] = os.path.join(_scratch, "bundles")
+os.environ["REQUEST_LOG_SAMPLE_RATE"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+# Background refreshes would add statements to the counted ones
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+os.environ["SEARCH_REFRESH_SECONDS"] = "0"
+# The whole session shares one client address; only the auth limits stay at their defaults
+os.environ["RATE_LIMIT_IP_PER_MINUTE"] = "1000000"
+os.environ["RATE_LIMIT_IP_BURST"] = "1000000"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from app import models
+from app.database import SessionLocal
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def lesson_ids(client):
+    """lesson_type -> id of the Greek lessons; the mnemonics lesson holds 200 extra phrases"""
+    created = client.post("/lessons/el/initialize").json()
+    lessons = {lesson["lesson_type"]: lesson["id"] for lesson in created}
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.Phrase), [
+            {"text": "φράση %d" % n, "transliteration": "frasi", "translation": "phrase",
+             "level": "A1", "category": "Mnemonics", "language_id": created[0]["language_id"],
+             "lesson_id": lessons["mnemonics"], "extra_data": {"mnemonic": "m"}}
+            for n in range(200)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return lessons
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    """Bearer token of a freshly registered user"""
+    credentials = {"username": "learner", "password": "correct horse battery staple"}
+    client.post("/auth/register", json={**credentials, "email": "learner@example.com"}).raise_for_status()
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": "Bearer %s" % token}
@@ -0,0 +1,22 @@
+from app.config import settings
+from app.security import password_hasher
+
+
+def test_unknown_user_is_checked_against_a_hash_at_the_configured_cost(client):
+    assert password_hasher.dummy_hash.startswith("$2b$%02d$" % settings.bcrypt_rounds)
+
+    response = client.post("/auth/login", json={"username": "nobody", "password": "guess"})
+
+    assert response.status_code == 401
+
+
+def test_wrong_password_is_rejected(client, auth_headers):
+    response = client.post("/auth/login", json={"username": "learner", "password": "guess"})
+
+    assert response.status_code == 401
+
+
+def test_authenticated_auth_routes_skip_the_login_bucket(client, auth_headers):
+    for _ in range(int(settings.rate_limit_auth_burst) + 5):
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 200, response.text
@@ -0,0 +1,48 @@
+import json
+
+from app import models
+from app.database import SessionLocal
+
+
+def detail_etag(client, lesson_id: int) -> str:
+    response = client.get("/lessons/el/%d" % lesson_id)
+    assert response.status_code == 200, response.text
+    return response.headers["ETag"]
+
+
+def test_phrase_edits_within_one_second_change_the_etag(client, lesson_ids):
+    lesson_id = lesson_ids["visual"]
+    db = SessionLocal()
+    try:
+        language_id = db.get(models.Lesson, lesson_id).language_id
+        phrase = models.Phrase(text="νερό", translation="water", lesson_id=lesson_id, language_id=language_id)
+        db.add(phrase)
+        db.commit()
+        etags = [detail_etag(client, lesson_id)]
+        for text in ("νερό!", "νερό?"):
+            phrase.text = text
+            db.commit()
+            etags.append(detail_etag(client, lesson_id))
+    finally:
+        db.close()
+
+    assert len(set(etags)) == 3
+    response = client.get("/lessons/el/%d" % lesson_id, headers={"If-None-Match": etags[1]})
+    assert response.status_code == 200
+    assert response.json()["phrases"][-1]["text"] == "νερό?"
+
+
+def test_imported_phrases_change_the_etag(client, lesson_ids):
+    lesson = client.get("/lessons/el/%d" % lesson_ids["alphabet"]).json()
+    before = detail_etag(client, lesson["id"])
+    body = "".join(json.dumps(record) + "\n" for record in [
+        {"type": "lesson", "title": lesson["title"], "description": lesson["description"],
+         "level": lesson["level"], "category": lesson["category"], "lesson_type": lesson["lesson_type"],
+         "content": lesson["content"]},
+        {"type": "phrase", "lesson": lesson["title"], "text": "άλφα", "translation": "alpha"},
+    ])
+
+    response = client.post("/lessons/el/import", content=body.encode("utf-8"))
+
+    assert response.status_code == 200, response.text
+    assert detail_etag(client, lesson["id"]) != before
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app import models, progress
+from app.database import AsyncSessionLocal, SessionLocal
+from app.progress import ProgressEvent, ProgressWriter, progress_writer
+
+
+def learner_points(user_id: int):
+    db = SessionLocal()
+    try:
+        profile = db.scalar(select(models.UserProfile.points).where(models.UserProfile.user_id == user_id))
+        ledger = db.scalar(select(func.sum(models.PointsEntry.points)).where(models.PointsEntry.user_id == user_id))
+        return profile, ledger
+    finally:
+        db.close()
+
+
+def test_repeat_completions_award_points_once(client, auth_headers, lesson_ids):
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    url = "/lessons/%d/complete" % lesson_ids["visual"]
+    before = learner_points(user_id)
+
+    # Two completions in one batch, then one more after the first is written
+    first = client.post(url, headers=auth_headers, json={"score": 80}).json()
+    client.post(url, headers=auth_headers, json={"score": 90})
+    client.portal.call(progress_writer.flush)
+    replay = client.post(url, headers=auth_headers, json={"score": 100}).json()
+    client.portal.call(progress_writer.flush)
+
+    assert first["points_awarded"] == 18
+    assert replay["points_awarded"] == 0
+    profile, ledger = learner_points(user_id)
+    assert profile - (before[0] or 0) == 18
+    assert ledger - (before[1] or 0) == 18
+
+
+def test_a_failing_event_does_not_hold_back_the_batch(client, auth_headers, lesson_ids, monkeypatch):
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    apply = progress.apply_progress_events
+
+    async def apply_rejecting_lesson_zero(db, events):
+        if any(event.lesson_id == 0 for event in events):
+            raise ValueError("bad event")
+        await apply(db, events)
+
+    monkeypatch.setattr(progress, "apply_progress_events", apply_rejecting_lesson_zero)
+    writer = ProgressWriter(AsyncSessionLocal, interval=60, batch_size=100)
+    good = ProgressEvent(user_id, lesson_ids["alphabet"], 1, completed=False, score=None, at=datetime.utcnow())
+    bad = ProgressEvent(user_id, 0, 1, completed=False, score=None, at=datetime.utcnow())
+    writer.record(good)
+    writer.record(bad)
+
+    assert client.portal.call(writer.flush) == 1
+    assert len(writer.buffer) == 1
+    for _ in range(progress.MAX_FLUSH_ATTEMPTS - 1):
+        assert client.portal.call(writer.flush) == 0
+    assert len(writer.buffer) == 0
@@ -0,0 +1,57 @@
+"""Statement budgets per endpoint.
+
+Counts must not depend on the number of lessons or phrases, so the detail
+checks run against a lesson with many phrases. A failure lists the
+statements the endpoint issued.
+"""
+import pytest
+from app.database import async_engine, engine
+from app.query_counter import QueryCounter
+from app.routers.lessons import invalidate_lesson_catalog
+
+# (method, path, statements)
+BUDGETS = [
+    ("GET", "/languages/", 1),
+    ("GET", "/lessons/el", 2),                       # language, lessons
+    ("GET", "/lessons/el?lesson_type=visual&limit=1", 2),
+    ("GET", "/lessons/el?after={alphabet_id}&limit=2", 2),
+    ("GET", "/lessons/el/{mnemonics_id}", 2),        # lesson version, lesson JOIN phrases
+    ("GET", "/lessons/el/{alphabet_id}", 2),
+    ("POST", "/lessons/el/initialize", 2),           # language, existing titles; nothing to insert
+    ("DELETE", "/lessons/cleanup-duplicates", 3),    # language, lessons, phrases (selectin)
+]
+
+
+def count_statements(client, method: str, url: str, **kwargs):
+    with QueryCounter(engine, async_engine.sync_engine) as counter:
+        response = client.request(method, url, **kwargs)
+    return response, counter
+
+
+def budget_id(budget) -> str:
+    return "%s %s" % budget[:2]
+
+
+@pytest.mark.parametrize("method, path, budget", BUDGETS, ids=[budget_id(budget) for budget in BUDGETS])
+def test_statement_budget(client, lesson_ids, method, path, budget):
+    # Lesson pages are cached; start every check from a cold catalog cache
+    invalidate_lesson_catalog()
+    url = path.format(**{"%s_id" % lesson_type: lesson_id for lesson_type, lesson_id in lesson_ids.items()})
+    response, counter = count_statements(client, method, url)
+    assert response.status_code < 400, response.text
+    assert counter.count == budget, "\n".join(counter.statements)
+
+
+def test_cached_lesson_list_issues_no_statements(client, lesson_ids):
+    client.get("/lessons/el")
+    response, counter = count_statements(client, "GET", "/lessons/el")
+    assert response.status_code == 200
+    assert counter.count == 0, "\n".join(counter.statements)
+
+
+def test_lesson_detail_revalidation_issues_one_statement(client, lesson_ids):
+    url = "/lessons/el/%d" % lesson_ids["mnemonics"]
+    etag = client.get(url).headers["etag"]
+    response, counter = count_statements(client, "GET", url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert counter.count == 1, "\n".join(counter.statements)
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.rate_limit import Limit, ShardedTokenBucketStore
+from app.routers.auth import authenticate_user
+
+PASSWORD = "correct horse battery staple"
+
+
+def test_rejected_requests_spend_no_tokens():
+    store = ShardedTokenBucketStore(timer=lambda: 0.0)
+    ip, user = ("ip:a", Limit(rate=1.0, capacity=5)), ("user:a", Limit(rate=1.0, capacity=1))
+
+    assert store.consume_many_sync([ip, user]) == (True, 0.0)
+    allowed, retry_after = store.consume_many_sync([ip, user])
+
+    assert not allowed and retry_after == pytest.approx(1.0)
+    assert store.consume_many_sync([ip], cost=4) == (True, 0.0)
+
+
+def authenticate(client, username: str, password: str, address: str):
+    async def attempt():
+        async with AsyncSessionLocal() as db:
+            return await authenticate_user(db, username, password, address)
+    return client.portal.call(attempt)
+
+
+def test_failed_logins_only_throttle_their_own_address(client, auth_headers):
+    for _ in range(int(settings.rate_limit_auth_burst)):
+        assert authenticate(client, "learner", "guess", "203.0.113.1") is None
+    with pytest.raises(HTTPException) as raised:
+        authenticate(client, "learner", PASSWORD, "203.0.113.1")
+    assert raised.value.status_code == 429
+
+    assert authenticate(client, "learner", PASSWORD, "203.0.113.2").username == "learner"
+
+
+def test_successful_logins_spend_no_login_tokens(client, auth_headers):
+    for _ in range(int(settings.rate_limit_auth_burst) + 5):
+        assert authenticate(client, "learner", PASSWORD, "203.0.113.3").username == "learner"
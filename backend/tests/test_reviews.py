@@ -0,0 +1,28 @@
+import warnings
+from datetime import datetime
+
+from app import models
+from app.database import SessionLocal
+
+
+def test_reviewed_at_with_offset_is_stored_as_utc(client, auth_headers, lesson_ids):
+    language_id = next(language["id"] for language in client.get("/languages/").json() if language["code"] == "el")
+    item = client.post("/vocabulary/", headers=auth_headers, json={
+        "word": "καλημέρα", "translation": "good morning", "category": "Greetings", "language_id": language_id
+    }).json()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        response = client.post("/reviews/batch", headers=auth_headers, json={
+            "reviews": [{"item_id": item["id"], "grade": 5, "reviewed_at": "2024-01-01T14:00:00+02:00"}]
+        })
+
+    assert response.status_code == 200, response.text
+    assert response.json()["results"][0]["due_at"] == "2024-01-02T12:00:00"
+    db = SessionLocal()
+    try:
+        stored = db.get(models.VocabularyItem, item["id"])
+        assert stored.last_reviewed == datetime(2024, 1, 1, 12, 0)
+        assert stored.due_at == datetime(2024, 1, 2, 12, 0)
+    finally:
+        db.close()
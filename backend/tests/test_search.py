@@ -0,0 +1,17 @@
+from app.search import VOCABULARY, ContentIndex, SearchDocument
+
+
+def vocabulary_item(item_id, user_id, word):
+    return SearchDocument(kind=VOCABULARY, id=item_id, language_id=1, text=word, user_id=user_id)
+
+
+def test_vocabulary_search_only_sees_the_callers_items():
+    # Another user's words sort ahead of ours and would use up every prefix expansion
+    others = [vocabulary_item(n, 2, "abc%03d" % n) for n in range(60)]
+    index = ContentIndex(others + [vocabulary_item(100, 1, "abczzz")])
+
+    hits = index.search("abc", kinds=[VOCABULARY], user_id=1)
+
+    assert [document.id for _, document in hits] == [100]
+    assert index.search("abc001", kinds=[VOCABULARY], user_id=1) == []
+    assert index.search("abc", kinds=[VOCABULARY]) == []
@@ -0,0 +1,59 @@
+import json
+
+from app import models, seeding
+from app.content import ContentRegistry
+from app.database import SessionLocal
+
+
+def write_pack(packs_dir, code):
+    pack = packs_dir / code
+    pack.mkdir()
+    (pack / "language.json").write_text(json.dumps({"code": code, "name": "Testish"}))
+    (pack / "lessons.jsonl").write_text(json.dumps({
+        "title": "Memory Hooks", "description": "Mnemonics", "level": "A1",
+        "category": "Mnemonics", "lesson_type": "mnemonics", "content": {"introduction": "Remember"}
+    }) + "\n")
+    (pack / "phrases.jsonl").write_text("".join(json.dumps({
+        "text": text, "transliteration": text, "translation": translation, "level": "A1",
+        "category": "Mnemonics", "extra_data": {"mnemonic": mnemonic}
+    }) + "\n" for text, translation, mnemonic in [
+        ("gata", "cat", "A cat sits on a gate"),
+        ("skilos", "dog", "A dog skis downhill"),
+    ]))
+
+
+def test_mnemonics_lessons_include_the_pack_phrases(client, tmp_path, monkeypatch):
+    write_pack(tmp_path, "tt")
+    monkeypatch.setattr(seeding, "content", ContentRegistry(str(tmp_path)))
+
+    db = SessionLocal()
+    try:
+        language = seeding.load_content_pack(db, "tt")
+        db.commit()
+        lesson = db.query(models.Lesson).filter_by(language_id=language.id, lesson_type="mnemonics").one()
+        practice_words = lesson.compiled_content["practice_words"]
+    finally:
+        db.close()
+
+    assert practice_words == [
+        {"word": "gata", "translation": "cat", "transliteration": "gata", "mnemonic": "A cat sits on a gate"},
+        {"word": "skilos", "translation": "dog", "transliteration": "skilos", "mnemonic": "A dog skis downhill"},
+    ]
+
+
+def test_initialize_seeds_the_languages_own_pack(client, tmp_path, monkeypatch):
+    write_pack(tmp_path, "ts")
+    monkeypatch.setattr(seeding, "content", ContentRegistry(str(tmp_path)))
+    db = SessionLocal()
+    try:
+        db.add(models.Language(**seeding.language_row("ts")))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/lessons/ts/initialize")
+
+    assert response.status_code == 200
+    assert [(lesson["title"], lesson["content"]) for lesson in response.json()] == [
+        ("Memory Hooks", {"introduction": "Remember"})
+    ]
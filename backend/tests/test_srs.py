@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.srs import MIN_EASE_FACTOR, RELEARN_DELAY, schedule_reviews
+
+REVIEWED_AT = datetime(2024, 1, 1, 12, 0)
+
+
+def schedule(ease_factor, interval_days, repetitions, lapses, grades):
+    return schedule_reviews(
+        np.array(ease_factor), np.array(interval_days), np.array(repetitions), np.array(lapses),
+        np.array(grades), np.array([REVIEWED_AT] * len(grades), dtype="datetime64[us]")
+    )
+
+
+def test_passing_reviews_follow_sm2_intervals():
+    # A new card, a card seen once, and a mature card with a 10 day interval
+    result = schedule([2.5, 2.5, 2.0], [0.0, 1.0, 10.0], [0, 1, 4], [0, 0, 2], [5, 4, 3])
+
+    assert result.interval_days.tolist() == [1.0, 6.0, 20.0]
+    assert result.repetitions.tolist() == [1, 2, 5]
+    assert result.lapses.tolist() == [0, 0, 2]
+    assert result.mastery_level.tolist() == [1, 2, 5]
+    assert result.ease_factor == pytest.approx([2.6, 2.5, 1.86])
+    assert result.due_at.astype(datetime).tolist() == [
+        datetime(2024, 1, 2, 12, 0), datetime(2024, 1, 7, 12, 0), datetime(2024, 1, 21, 12, 0)
+    ]
+
+
+def test_failed_review_resets_the_card():
+    result = schedule([1.4], [20.0], [5], [1], [0])
+
+    assert result.interval_days.tolist() == [0.0]
+    assert result.repetitions.tolist() == [0]
+    assert result.lapses.tolist() == [2]
+    assert result.mastery_level.tolist() == [0]
+    assert result.ease_factor.tolist() == [MIN_EASE_FACTOR]
+    assert result.due_at.astype(datetime).tolist() == [REVIEWED_AT + RELEARN_DELAY]
+
+
+def test_grades_outside_range_are_rejected():
+    with pytest.raises(ValueError):
+        schedule([2.5], [0.0], [0], [0], [6])
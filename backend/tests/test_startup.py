@@ -0,0 +1,35 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.startup import alembic_config, initialize_database
+
+
+def legacy_database(path, revision: str):
+    """A database with the schema of `revision` but no migration history, as create_all left it"""
+    engine = create_engine("sqlite:///" + os.path.join(path, "legacy.db"))
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), revision)
+        connection.execute(text("DROP TABLE alembic_version"))
+    return engine
+
+
+# 0001 is the baseline schema; 0001a adds what user-003 created with create_all
+@pytest.mark.parametrize("revision", ["0001", "0001a", "0003", "0006"])
+def test_legacy_database_is_upgraded_to_head(tmp_path, revision):
+    engine = legacy_database(str(tmp_path), revision)
+
+    initialize_database(engine, sessionmaker(bind=engine), seed=False)
+
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as connection:
+        assert MigrationContext.configure(connection).get_current_revision() == head
+        assert compare_metadata(MigrationContext.configure(connection), models.Base.metadata) == []
+        assert connection.execute(select(models.Lesson)).all() == []